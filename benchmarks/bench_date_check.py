@@ -0,0 +1,103 @@
+"""
+Benchmark del procesador date_check (src/processors.py).
+Compara el método original (strong:contains('Plazo:') por fila, dos
+strptime y un datetime.now() por oferta, parando en la primera abierta)
+con el plan compilado: una expresión regular precompilada sobre el texto de
+todas las filas y una sola referencia temporal. Comprueba además que ambos
+dan el mismo status.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_date_check.py [--offers 2000] [--repeat 5] [--parser html.parser]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import os  # Para localizar el directorio src
+import sys  # Para añadir src al path de importación
+import time  # Para medir tiempos
+from datetime import datetime  # Para el método original
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import parsers  # noqa: E402  Motores de parseo del scraper
+from processors import get_plan  # noqa: E402  Planes compilados por URL
+
+CONFIG = {
+    'name': 'UVigo Profesor',
+    'url': 'https://ejemplo.com/uvigo',
+    'type': 'date_check',
+    'selectors': {
+        'rows': 'div.row.uvigo-row-nopadding',
+        'card_summary': 'div.uvigo-card-summary',
+        'plazo': "strong:contains('Plazo:')",
+    },
+}
+
+
+def build_page(offers):
+    """
+    Genera un listado de ofertas cerradas; solo la última tiene el plazo abierto
+    (el peor caso para el método original, que recorre todas las filas).
+    """
+    rows = []
+    for i in range(offers):
+        end = '31/12/2099' if i == offers - 1 else f"{i % 28 + 1:02d}/0{i % 9 + 1}/2019"
+        rows.append(f"""
+    <div class="row uvigo-row-nopadding">
+      <h3>Profesor/a {i}</h3>
+      <div class="uvigo-card-summary"><strong>Área:</strong> Psicología <strong>Plazo:</strong> 01/01/2019 – {end}</div>
+    </div>""")
+    return f"<html><body>{''.join(rows)}</body></html>"
+
+
+def legacy_check(soup):
+    """
+    Método original: :contains() por fila, strptime y datetime.now() por oferta.
+    """
+    for row in soup.select("div.row.uvigo-row-nopadding"):
+        plazo_text = row.select_one("div.uvigo-card-summary strong:-soup-contains('Plazo:')")
+        if plazo_text:
+            dates_text = plazo_text.find_next_sibling(string=True)
+            if dates_text:
+                start_date, end_date = [datetime.strptime(d.strip(), '%d/%m/%Y') for d in dates_text.split('–')]
+                if start_date <= datetime.now() <= end_date:
+                    return "YES"
+    return "NO"
+
+
+def timed(function, repeat):
+    """
+    Devuelve el mejor tiempo de varias ejecuciones y el último resultado.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--offers', type=int, default=2000, help='Ofertas en la página')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (se toma la mejor)')
+    arg_parser.add_argument('--parser', default='html.parser', help='Motor de parseo')
+    args = arg_parser.parse_args()
+
+    soup = parsers.parse(build_page(args.offers), args.parser)
+    plan = get_plan(CONFIG)
+
+    legacy_time, legacy_status = timed(lambda: legacy_check(soup), args.repeat)
+    plan_time, result = timed(lambda: plan.finalize(plan.run(soup)), args.repeat)
+    result = {key: value for key, value in result.items() if not key.startswith('_')}
+
+    print(f"date_check sobre {args.offers} ofertas ({args.parser}):")
+    print(f"  :contains + strptime por fila:  {legacy_time * 1000:9.1f} ms")
+    print(f"  regex precompilada:             {plan_time * 1000:9.1f} ms  (x{legacy_time / plan_time:.1f})")
+    print(f"  {result}")
+
+    if legacy_status != result['status']:
+        raise SystemExit(f"❌ Status distinto: {legacy_status} frente a {result['status']}")
+    print("  ✓ Mismo status con ambos métodos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de la escritura de resultados en Excel (src/excel_handler.py).
+Mide cuánto cuesta añadir las filas de una ejecución a un Excel con un
+historial grande (un único archivo, EXCEL_ROTATION='none') frente a la
+rotación mensual (EXCEL_ROTATION='monthly'), donde solo se abre el
+archivo del mes en curso.
+
+El historial se genera en un directorio temporal con un Workbook en modo
+write_only (no se toca data/).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_excel.py [--history 100000] [--month-rows 500] [--rows 10] [--columns 12]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import contextlib  # Para silenciar los mensajes del manejador
+import io  # Para silenciar los mensajes del manejador
+import os  # Para localizar el directorio src
+import sys  # Para añadir src al path de importación
+import tempfile  # Para generar los Excel de prueba fuera de data/
+import time  # Para medir tiempos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from openpyxl import Workbook  # noqa: E402  Para generar el historial en streaming
+from excel_handler import excel_path_for, update_excel_with_results  # noqa: E402
+
+TIMESTAMP = '2025-01-15 20:00:00'  # Timestamp de la ejecución simulada
+
+
+def build_rows(count, columns):
+    """
+    Genera filas de resultados con el formato del scraper.
+    """
+    keywords = [f"area_keyword{i}" for i in range(columns - 3)]
+    return [
+        {'timestamp': TIMESTAMP, 'url': f"https://ejemplo.com/{i}", 'name': f"Sitio {i % 20}",
+         **{keyword: i % 7 for keyword in keywords}}
+        for i in range(count)
+    ]
+
+
+def write_history(filepath, rows):
+    """
+    Escribe un Excel con filas ya existentes, en modo write_only (streaming).
+    """
+    headers = sorted(rows[0].keys())
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Resultados Scraper")
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([row[header] for header in headers])
+    workbook.save(filepath)
+
+
+def timed_update(filepath, rows):
+    """
+    Añade filas a un Excel y devuelve (segundos, tamaño del archivo en MB).
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        update_excel_with_results(rows, filepath)
+    elapsed = time.perf_counter() - start
+    return elapsed, os.path.getsize(filepath) / 1024 / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--history', type=int, default=100000, help='Filas ya existentes en el historial')
+    arg_parser.add_argument('--month-rows', type=int, default=500, help='Filas ya existentes en el archivo del mes')
+    arg_parser.add_argument('--rows', type=int, default=10, help='Filas que añade la ejecución')
+    arg_parser.add_argument('--columns', type=int, default=12, help='Columnas por fila')
+    args = arg_parser.parse_args()
+
+    new_rows = build_rows(args.rows, args.columns)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base = os.path.join(tmp, 'scraper_estudios.xlsx')
+        monthly = excel_path_for(TIMESTAMP, base, 'monthly')
+
+        print(f"Generando historial de {args.history} filas y mes de {args.month_rows} filas...")
+        write_history(base, build_rows(args.history, args.columns))
+        write_history(monthly, build_rows(args.month_rows, args.columns))
+
+        single_time, single_size = timed_update(base, new_rows)
+        monthly_time, monthly_size = timed_update(monthly, new_rows)
+
+    print(f"Añadir {args.rows} filas de {args.columns} columnas:")
+    print(f"  un único archivo ({args.history} filas): {single_time * 1000:9.1f} ms  ({single_size:.1f} MB)")
+    print(f"  rotación mensual ({args.month_rows} filas):  {monthly_time * 1000:9.1f} ms  ({monthly_size:.2f} MB)"
+          f"  (x{single_time / monthly_time:.0f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Microbenchmark de ExcelHandler.append_results con muchas columnas y filas.
+Compara el método original (lista de encabezados leída celda a celda,
+búsquedas lineales y sheet.cell() por valor recalculando max_row en cada
+fila) con el índice encabezado -> columna y la escritura de filas completas
+con sheet.append(). Comprueba además que ambos dejan las mismas celdas.
+
+Trabaja en memoria (no guarda ningún archivo).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_excel_headers.py [--columns 1000] [--rows 1000] [--existing 100]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import contextlib  # Para silenciar los mensajes del manejador
+import io  # Para silenciar los mensajes del manejador
+import os  # Para localizar el directorio src
+import sys  # Para añadir src al path de importación
+import time  # Para medir tiempos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from openpyxl import Workbook  # noqa: E402  Libro en memoria
+from excel_handler import ExcelHandler  # noqa: E402  Manejador del Excel
+
+
+def build_results(rows, columns, offset=0):
+    """
+    Genera resultados con columnas de keyword por área, como el scraper.
+    """
+    return [
+        {'timestamp': '2025-01-15 20:00:00', 'url': f"https://ejemplo.com/{i}", 'name': f"Sitio {i}",
+         **{f"area{c % 50}_keyword{c}": (i * c) % 7 for c in range(offset, offset + columns)}}
+        for i in range(rows)
+    ]
+
+
+def legacy_append(sheet, results):
+    """
+    Método original de append_results.
+    """
+    headers = sorted({key for result in results for key in result})
+    if sheet.max_row == 1 and sheet.cell(1, 1).value is None:
+        for col, header in enumerate(headers, start=1):
+            sheet.cell(1, col, header)
+
+    current_headers = []
+    for col in range(1, sheet.max_column + 1):
+        header = sheet.cell(1, col).value
+        if header:
+            current_headers.append(header)
+
+    for header in headers:
+        if header not in current_headers:
+            sheet.cell(1, len(current_headers) + 1, header)
+            current_headers.append(header)
+
+    for result in results:
+        row_num = sheet.max_row + 1
+        for col, header in enumerate(current_headers, start=1):
+            sheet.cell(row_num, col, result.get(header, ''))
+
+
+def new_handler():
+    """
+    Crea un manejador con un libro vacío en memoria.
+    """
+    handler = ExcelHandler('benchmark.xlsx')
+    handler.workbook = Workbook()
+    handler.sheet = handler.workbook.active
+    return handler
+
+
+def run(function):
+    """
+    Ejecuta una función sin mensajes por consola y devuelve su duración.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    return time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--columns', type=int, default=1000, help='Columnas de keywords por fila')
+    arg_parser.add_argument('--rows', type=int, default=1000, help='Filas que se añaden')
+    arg_parser.add_argument('--existing', type=int, default=100, help='Filas ya existentes en la hoja')
+    args = arg_parser.parse_args()
+
+    # La hoja ya tiene historial; las filas nuevas traen 10 columnas que no existían
+    existing = build_results(args.existing, args.columns)
+    new_rows = build_results(args.rows, args.columns, offset=10)
+
+    legacy = new_handler()
+    legacy_append(legacy.sheet, existing)
+    legacy_time = run(lambda: legacy_append(legacy.sheet, new_rows))
+
+    indexed = new_handler()
+    run(lambda: indexed.append_results(existing))
+    indexed.header_index = None  # Como al abrir el archivo: el índice se reconstruye
+    indexed_time = run(lambda: indexed.append_results(new_rows))
+
+    print(f"Añadir {args.rows} filas de {args.columns + 3} columnas a una hoja con {args.existing} filas:")
+    print(f"  búsqueda lineal + sheet.cell():  {legacy_time * 1000:9.1f} ms")
+    print(f"  índice + sheet.append():         {indexed_time * 1000:9.1f} ms  (x{legacy_time / indexed_time:.1f})")
+
+    legacy_cells = [row for row in legacy.sheet.iter_rows(values_only=True)]
+    indexed_cells = [row for row in indexed.sheet.iter_rows(values_only=True)]
+    if legacy_cells != indexed_cells:
+        raise SystemExit("❌ El índice de encabezados no produce las mismas celdas que el método original")
+    print("  ✓ Mismas celdas con ambos métodos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark del plan de extracción por áreas (src/extraction.py).
+Compara el método original (soup.select + get_text por cada área) con el
+plan compilado que recorre el DOM una vez y comparte el texto de los nodos
+que se solapan entre áreas. Comprueba además que ambos dan el mismo texto.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_extraction.py [--jobs 500] [--repeat 5] [--parser html.parser]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import os  # Para localizar el directorio src
+import sys  # Para añadir src al path de importación
+import time  # Para medir tiempos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import parsers  # noqa: E402  Motores de parseo del scraper
+from extraction import AreaPlan  # noqa: E402  Plan de extracción por áreas
+
+# Áreas típicas de un portal de empleo, con selectores repetidos y anidados
+SEARCH_AREAS = {
+    'titulo': 'h1, h2',
+    'titulos': 'h1, h2, h3',
+    'cabeceras': 'h2, h3',
+    'contenido': 'article',
+    'descripcion': 'article, .job-description',
+    'texto': '.job-description',
+    'requisitos': '.requirements',
+    'items': '.requirements li',
+    'meta': '.tags, .categories',
+    'principal': 'main',
+}
+
+
+def build_page(jobs):
+    """
+    Genera una página de listado con el número de ofertas indicado.
+    """
+    cards = []
+    for i in range(jobs):
+        cards.append(f"""
+    <article class="job">
+      <h2>Oferta {i}: contrato predoctoral en psicología</h2>
+      <h3>Departamento de Neurociencia {i % 7}</h3>
+      <div class="job-description">
+        <p>Buscamos investigador/a con formación en <b>psicología</b> o neurociencia.</p>
+        <p>Se valorará experiencia en <em>Python</em> y análisis de datos. Ref {i}.</p>
+      </div>
+      <ul class="requirements"><li>Grado en Psicología</li><li>Máster en neurociencia</li></ul>
+      <div class="tags"><span>beca</span><span>doctorado</span></div>
+      <div class="categories">investigación</div>
+    </article>""")
+    return f"<html><head><title>Ofertas</title></head><body><h1>Listado</h1><main>{''.join(cards)}</main></body></html>"
+
+
+def per_area_texts(soup, search_areas):
+    """
+    Método original: un select() y un get_text() por cada área.
+    """
+    return {
+        area_name: ' '.join(elem.get_text().lower() for elem in soup.select(selector))
+        for area_name, selector in search_areas.items()
+    }
+
+
+def timed(function, repeat):
+    """
+    Ejecuta una función varias veces y devuelve el mejor tiempo y su resultado.
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--jobs', type=int, default=500, help='Ofertas en la página sintética')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (se toma la mejor)')
+    arg_parser.add_argument('--parser', default='html.parser', help='Motor de parseo')
+    args = arg_parser.parse_args()
+
+    html = build_page(args.jobs)
+    soup = parsers.parse(html, args.parser)
+    plan = AreaPlan(SEARCH_AREAS)
+
+    old_time, old_texts = timed(lambda: per_area_texts(soup, SEARCH_AREAS), args.repeat)
+    new_time, new_texts = timed(lambda: plan.extract_texts(soup), args.repeat)
+
+    print(f"Página: {len(html) / 1024:.0f} KB, {args.jobs} ofertas, {len(SEARCH_AREAS)} áreas "
+          f"({len(plan.selectors)} selectores únicos), motor {parsers.resolve_backend(args.parser)}")
+    print(f"  select + get_text por área: {old_time * 1000:8.1f} ms")
+    print(f"  plan de extracción:         {new_time * 1000:8.1f} ms  (x{old_time / new_time:.2f})")
+
+    if old_texts != new_texts:
+        raise SystemExit("❌ El plan de extracción no produce el mismo texto que el método original")
+    print("  ✓ Mismo texto por área con ambos métodos")
+
+
+if __name__ == "__main__":
+    main()
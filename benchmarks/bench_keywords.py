@@ -0,0 +1,92 @@
+"""
+Benchmark del conteo de keywords (src/keyword_matcher.py).
+Compara, para listas de keywords de distinto tamaño, str.count() por
+keyword (una pasada del texto por keyword, en C) con el autómata
+multi-patrón (una sola pasada del texto para todas), comprueba que dan los
+mismos conteos e indica a partir de cuántas keywords gana el autómata.
+Es la medida con la que se fija KEYWORD_AUTOMATON_THRESHOLD en config.py.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_keywords.py [--kb 150] [--repeat 5]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import os  # Para localizar el directorio src
+import random  # Para generar texto y keywords reproducibles
+import sys  # Para añadir src al path de importación
+import time  # Para medir tiempos
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import keyword_matcher  # noqa: E402  Conteo de keywords del scraper
+
+# Tamaños de lista de keywords que se comparan
+KEYWORD_COUNTS = [5, 10, 20, 50, 100, 150, 200, 300, 500]
+
+# Letras del texto sintético (con tildes, como las páginas reales)
+LETTERS = 'abcdefghijklmnñopqrstuvwxyzáéíóú'
+
+
+def build_text(size_kb, vocabulary):
+    """
+    Genera un texto en minúsculas de unos size_kb kilobytes con palabras del vocabulario.
+    """
+    words = []
+    size = 0
+    while size < size_kb * 1024:
+        word = random.choice(vocabulary)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def best_time(function, repeat):
+    """
+    Devuelve el mejor tiempo de varias ejecuciones y el último resultado.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--kb', type=int, default=150, help='Tamaño del texto en KB')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Repeticiones (se toma la mejor)')
+    args = arg_parser.parse_args()
+
+    random.seed(1)
+    vocabulary = [''.join(random.choices(LETTERS, k=random.randint(4, 10))) for _ in range(5000)]
+    text = build_text(args.kb, vocabulary)
+
+    print(f"Conteo de keywords sobre {len(text) / 1024:.0f} KB de texto "
+          f"(umbral actual: {keyword_matcher.KEYWORD_AUTOMATON_THRESHOLD})")
+    print(f"  {'keywords':>8}  {'str.count':>10}  {'autómata':>10}")
+    crossover = None
+    for count in KEYWORD_COUNTS:
+        keywords = random.sample(vocabulary, count)
+        timings = []
+        results = []
+        # Umbral muy alto = siempre str.count; 0 = siempre el autómata
+        for threshold in (float('inf'), 0):
+            keyword_matcher.KEYWORD_AUTOMATON_THRESHOLD = threshold
+            matcher = keyword_matcher.KeywordMatcher(keywords)
+            elapsed, result = best_time(lambda: matcher.count(text), args.repeat)
+            timings.append(elapsed)
+            results.append(result)
+        if results[0] != results[1]:
+            raise SystemExit(f"❌ Conteos distintos con {count} keywords")
+        if crossover is None and timings[1] < timings[0]:
+            crossover = count
+        print(f"  {count:>8}  {timings[0] * 1000:>8.2f}ms  {timings[1] * 1000:>8.2f}ms")
+
+    if crossover is None:
+        print(f"  str.count es más rápido en todos los tamaños medidos (hasta {KEYWORD_COUNTS[-1]})")
+    else:
+        print(f"  El autómata es más rápido a partir de unas {crossover} keywords")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Benchmark de extremo a extremo de main.main contra un servidor local.
+Cada escenario arranca main.main en un proceso propio (para medir su pico de
+memoria por separado), en un directorio temporal con su urls_config.json,
+contra benchmarks/fixture_server.py con latencia y errores simulados:
+
+- fixtures: páginas grabadas de data/fixtures (todos los tipos de página)
+- many: miles de URLs con páginas pequeñas (20 KB)
+- 1mb / 10mb: pocas URLs con páginas sintéticas grandes
+
+De cada escenario se obtiene el rendimiento (URLs/s y MB/s), la latencia
+por etapa (p50/p95 de las métricas de la ejecución) y el pico de memoria.
+Los resultados se pueden guardar como referencia (--save-baseline) y
+comparar con ella en ejecuciones posteriores: si algún valor empeora más
+que la tolerancia, el benchmark termina con código de error.
+
+La referencia depende de la máquina, por eso no se versiona: se genera en
+la máquina donde se van a comparar las ejecuciones.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_pipeline.py --save-baseline
+    python benchmarks/bench_pipeline.py [--scenarios fixtures,many] [--latency-ms 20] [--error-rate 0.01]
+"""
+import argparse  # Para leer los parámetros del benchmark
+import contextlib  # Para redirigir la salida de main.main
+import json  # Para la configuración de URLs, las métricas y la referencia
+import os  # Para rutas y variables de entorno
+import shutil  # Para borrar el directorio temporal de cada escenario
+import subprocess  # Cada escenario se ejecuta en su propio proceso
+import sys  # Para añadir src al path de importación
+import tempfile  # Directorio de trabajo de cada escenario
+import time  # Para medir tiempos
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# Escenarios: número de URLs y tamaño de página en KB (None = fixtures grabados),
+# o número de páginas de cada listado paginado
+SCENARIOS = {
+    'fixtures': {'urls': 200, 'kb': None},
+    'many': {'urls': 2000, 'kb': 20},
+    '1mb': {'urls': 20, 'kb': 1000},
+    '10mb': {'urls': 3, 'kb': 10000},
+    'paged': {'urls': 40, 'kb': None, 'pages': 5},
+}
+
+# Etapas por URL cuya latencia se compara con la referencia
+URL_STAGES = ('request', 'download', 'parse', 'extract')
+
+# Etapas de la ejecución cuyo tiempo total se compara con la referencia
+RUN_STAGES = ('changes', 'store_excel', 'store_sqlite', 'notify')
+
+
+def percentile(values, fraction):
+    """
+    Percentil (interpolación al más cercano) de una lista de valores.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarize(records, seconds, urls):
+    """
+    Resume las métricas de main.main (registros de metrics.jsonl).
+
+    Returns:
+        dict: Rendimiento, latencia por etapa, errores y pico de memoria.
+    """
+    stages = {}
+    for record in records:
+        stages.setdefault(record['stage'], []).append(record['seconds'])
+
+    total_bytes = sum(record.get('bytes') or 0 for record in records if record['stage'] == 'download')
+    errors = sum(1 for record in records if record['stage'] == 'request' and record.get('status') is None)
+    peaks = [record['peak_rss_mb'] for record in records if record.get('peak_rss_mb')]
+
+    return {
+        'urls': urls,
+        'seconds': round(seconds, 3),
+        'urls_per_s': round(urls / seconds, 2),
+        'mb_per_s': round(total_bytes / 1024 / 1024 / seconds, 2),
+        'errors': errors,
+        'peak_rss_mb': max(peaks) if peaks else None,
+        'stages': {
+            stage: {
+                'p50_ms': round(percentile(values, 0.5) * 1000, 2),
+                'p95_ms': round(percentile(values, 0.95) * 1000, 2),
+                'total_s': round(sum(values), 3),
+            }
+            for stage, values in stages.items()
+        },
+    }
+
+
+def run_child(args):
+    """
+    Ejecuta main.main para un escenario dentro de este proceso (modo --child)
+    y escribe el resumen en args.output.
+    """
+    sys.path.insert(0, SRC_DIR)
+    from fixture_server import fixtures_config, synthetic_config, paged_config
+
+    scenario = SCENARIOS[args.child]
+    urls = args.urls or scenario['urls']
+    if scenario.get('pages'):
+        urls_config = paged_config(args.base_url, urls, scenario['pages'])
+    elif scenario['kb'] is None:
+        urls_config = fixtures_config(args.base_url, urls)
+    else:
+        urls_config = synthetic_config(args.base_url, urls, scenario['kb'])
+
+    # Directorio de trabajo propio: las rutas de config (data/...) son relativas
+    workdir = tempfile.mkdtemp(prefix=f"bench_{args.child}_")
+    try:
+        os.makedirs(os.path.join(workdir, 'data'))
+        with open(os.path.join(workdir, 'data', 'urls_config.json'), 'w', encoding='utf-8') as f:
+            json.dump(urls_config, f, ensure_ascii=False)
+        os.chdir(workdir)
+
+        import main  # Import diferido: config lee las variables de entorno al importarse
+        from config import METRICS_FILE
+
+        with open('main.log', 'w', encoding='utf-8') as log, contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            main.main()
+            seconds = time.perf_counter() - start
+
+        with open(METRICS_FILE, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+    finally:
+        os.chdir(BENCH_DIR)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"Directorio del escenario {args.child}: {workdir}")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(summarize(records, seconds, urls), f)
+
+
+def run_scenario(name, args, base_url):
+    """
+    Lanza un escenario en un proceso nuevo y devuelve su resumen.
+    """
+    env = dict(os.environ)
+    env.update({
+        'SCRAPER_RATE_LIMIT_DELAY': '0',  # Todas las URLs van al mismo host local
+        'SCRAPER_HTTP_CACHE': '0',  # Cada ejecución descarga y parsea todo
+        'SCRAPER_MAX_WORKERS': str(args.workers),
+        'SCRAPER_PARSE_WORKERS': str(args.parse_workers),
+        'SCRAPER_PARSER': args.parser,
+        'SCRAPER_RESULTS_STORE': args.store,
+        'SCRAPER_PROFILE': '',
+        'SCRAPER_METRICS_FILE': 'data/.cache/metrics.jsonl',
+    })
+    # Sin Telegram: el benchmark no envía mensajes reales
+    env.pop('TELEGRAM_BOT_TOKEN', None)
+    env.pop('TELEGRAM_CHAT_ID', None)
+
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as output:
+        output_path = output.name
+    try:
+        command = [sys.executable, os.path.abspath(__file__), '--child', name,
+                   '--base-url', base_url, '--output', output_path]
+        if args.urls:
+            command += ['--urls', str(args.urls)]
+        if args.keep:
+            command.append('--keep')
+        subprocess.run(command, env=env, check=True)
+        with open(output_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    finally:
+        os.remove(output_path)
+
+
+def compare(name, result, reference, tolerance):
+    """
+    Compara un escenario con su referencia.
+
+    Returns:
+        list: Descripción de cada valor que empeora más que la tolerancia.
+    """
+    regressions = []
+
+    def check(label, current, previous, higher_is_better=False, floor=0.0):
+        # floor: diferencia absoluta por debajo de la cual se considera ruido
+        if not current or not previous or abs(current - previous) <= floor:
+            return
+        change = current / previous - 1
+        worse = -change if higher_is_better else change
+        if worse > tolerance:
+            regressions.append(f"{name}: {label} {previous} -> {current} ({change:+.0%})")
+
+    check('URLs/s', result['urls_per_s'], reference.get('urls_per_s'), higher_is_better=True)
+    check('pico RSS (MB)', result['peak_rss_mb'], reference.get('peak_rss_mb'), floor=5)
+    for stage in URL_STAGES:
+        check(f"{stage} p50 (ms)", result['stages'].get(stage, {}).get('p50_ms'),
+              reference.get('stages', {}).get(stage, {}).get('p50_ms'), floor=10)
+    for stage in RUN_STAGES:
+        check(f"{stage} (s)", result['stages'].get(stage, {}).get('total_s'),
+              reference.get('stages', {}).get(stage, {}).get('total_s'), floor=0.05)
+    return regressions
+
+
+def print_table(results):
+    """
+    Muestra una fila por escenario.
+    """
+    print(f"{'Escenario':<10}{'URLs':>7}{'Total (s)':>11}{'URLs/s':>9}{'MB/s':>8}{'Errores':>9}"
+          f"{'request p95':>13}{'parse p95':>11}{'extract p95':>13}{'RSS (MB)':>10}")
+    for name, result in results.items():
+        stages = result['stages']
+        p95 = [stages.get(stage, {}).get('p95_ms', 0) for stage in ('request', 'parse', 'extract')]
+        print(f"{name:<10}{result['urls']:>7}{result['seconds']:>11.2f}{result['urls_per_s']:>9.1f}"
+              f"{result['mb_per_s']:>8.2f}{result['errors']:>9}{p95[0]:>11.1f}ms{p95[1]:>9.1f}ms"
+              f"{p95[2]:>11.1f}ms{result['peak_rss_mb'] or 0:>10.1f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Escenarios separados por comas')
+    arg_parser.add_argument('--urls', type=int, default=0, help='URLs por escenario (0 = las del escenario)')
+    arg_parser.add_argument('--latency-ms', type=float, default=20, help='Latencia media del servidor')
+    arg_parser.add_argument('--jitter-ms', type=float, default=10, help='Variación de la latencia (±)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.01, help='Fracción de URLs que fallan')
+    arg_parser.add_argument('--workers', type=int, default=4, help='Hilos de descarga (SCRAPER_MAX_WORKERS)')
+    arg_parser.add_argument('--parse-workers', type=int, default=0, help='Procesos de parseo (SCRAPER_PARSE_WORKERS)')
+    arg_parser.add_argument('--parser', default='html.parser', help='Motor de parseo (SCRAPER_PARSER)')
+    arg_parser.add_argument('--store', default='excel', help='Almacén de resultados (SCRAPER_RESULTS_STORE)')
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Archivo de referencia')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='Guarda los resultados como referencia')
+    arg_parser.add_argument('--tolerance', type=float, default=0.25, help='Empeoramiento admitido (0.25 = 25%%)')
+    arg_parser.add_argument('--keep', action='store_true', help='Conserva el directorio de cada escenario')
+    # Uso interno: ejecución de un escenario en el proceso hijo
+    arg_parser.add_argument('--child', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    arg_parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        arg_parser.error(f"escenarios desconocidos: {', '.join(unknown)} (disponibles: {', '.join(SCENARIOS)})")
+
+    from fixture_server import FixtureServer
+
+    results = {}
+    with FixtureServer(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate) as server:
+        print(f"Servidor de fixtures en {server.base_url} (latencia {args.latency_ms}±{args.jitter_ms} ms, "
+              f"errores {args.error_rate:.0%})")
+        for name in names:
+            print(f"Ejecutando escenario {name}...")
+            results[name] = run_scenario(name, args, server.base_url)
+        print(f"Peticiones servidas: {server.stats}\n")
+
+    print_table(results)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nReferencia guardada en {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nSin referencia ({args.baseline}); genérala con --save-baseline")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            regressions.extend(compare(name, result, baseline[name], args.tolerance))
+
+    if regressions:
+        print(f"\n❌ Empeoran más de un {args.tolerance:.0%} respecto a la referencia:")
+        for regression in regressions:
+            print(f"  {regression}")
+        raise SystemExit(1)
+    print(f"\n✓ Sin empeoramientos de más de un {args.tolerance:.0%} respecto a la referencia")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Comprobación del tiempo de arranque de main.py (python -X importtime).
+Importa main en un proceso nuevo varias veces, toma la mediana del tiempo
+acumulado de import y falla si:
+- supera el presupuesto (--budget-ms), o
+- se ha importado alguno de los módulos pesados que deben cargarse solo
+  cuando su fase se ejecuta (requests, bs4, openpyxl, telegram...).
+
+Mide además, en procesos nuevos y descontando el arranque del intérprete,
+el camino en frío completo: python src/main.py --help y la primera carga de
+urls_config.json (sin copia validada, como tras cambiar el archivo), junto
+con la carga que reutiliza la copia validada. Falla si --help supera
+--budget-help-ms o la primera carga --budget-config-ms.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/check_startup.py [--runs 5] [--budget-ms 60]
+"""
+import argparse  # Para leer los parámetros de la comprobación
+import os  # Para localizar src
+import shutil  # Para borrar el directorio temporal de la copia validada
+import statistics  # Para la mediana de las repeticiones
+import subprocess  # Cada medición en un intérprete nuevo
+import sys  # Intérprete actual y código de salida
+import tempfile  # Copia validada de urls_config.json fuera de data/.cache
+import time  # Para medir los procesos completos
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+# Primera carga de la configuración de URLs, con la copia validada indicada
+LOAD_URLS_CONFIG = "from urls_config import load_urls_config; load_urls_config(cache_path={cache_path!r})"
+
+# Módulos que no deben importarse al arrancar
+FORBIDDEN = ['requests', 'bs4', 'openpyxl', 'telegram', 'lxml', 'selectolax', 'soupsieve', 'chardet', 'dotenv']
+
+
+def measure(module='main'):
+    """
+    Importa un módulo con -X importtime en un proceso nuevo.
+
+    Args:
+        module (str): Módulo a importar (desde src). None = intérprete vacío.
+
+    Returns:
+        dict: Tiempo acumulado en microsegundos por módulo importado.
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}" if module else 'pass'],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"No se pudo importar {module}:\n{completed.stderr}")
+
+    # Formato: "import time: self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, timing = line.split(':', 1)
+        _, total, name = timing.split('|', 2)
+        cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def run_time(args, runs):
+    """
+    Ejecuta un comando de Python en procesos nuevos (desde la raíz del repositorio).
+
+    Args:
+        args (list): Argumentos del intérprete.
+        runs (int): Repeticiones (se usa la mediana).
+
+    Returns:
+        float: Mediana del tiempo del proceso completo en milisegundos.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get('PYTHONPATH')])))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, *args], cwd=ROOT_DIR, env=env, capture_output=True, text=True)
+        times.append((time.perf_counter() - start) * 1000)
+        if completed.returncode != 0:
+            raise SystemExit(f"Falló {' '.join(args)}:\n{completed.stderr}")
+    return statistics.median(times)
+
+
+def measure_cold_path(runs):
+    """
+    Tiempos del camino en frío, sin el arranque del intérprete vacío.
+
+    Returns:
+        dict: Milisegundos de 'help' (main.py --help), 'config_first'
+              (primera carga de urls_config.json) y 'config_cached' (carga
+              con la copia validada).
+    """
+    interpreter = run_time(['-c', 'pass'], runs)
+    cache_dir = tempfile.mkdtemp()
+    try:
+        cache_path = os.path.join(cache_dir, 'urls_config.checked.json')
+        first = []
+        for _ in range(runs):
+            # Cada repetición sin copia validada: se valida de nuevo
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            first.append(run_time(['-c', LOAD_URLS_CONFIG.format(cache_path=cache_path)], 1))
+        cached = run_time(['-c', LOAD_URLS_CONFIG.format(cache_path=cache_path)], runs)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return {
+        'help': max(run_time([os.path.join('src', 'main.py'), '--help'], runs) - interpreter, 0.0),
+        'config_first': max(statistics.median(first) - interpreter, 0.0),
+        'config_cached': max(cached - interpreter, 0.0),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Comprobación del tiempo de arranque de main.py")
+    arg_parser.add_argument('--runs', type=int, default=5, help="Repeticiones (se usa la mediana)")
+    arg_parser.add_argument('--budget-ms', type=float, default=60.0, help="Tiempo máximo de import de main")
+    arg_parser.add_argument('--module', default='main', help="Módulo a medir")
+    arg_parser.add_argument('--top', type=int, default=10, help="Módulos más lentos a mostrar")
+    arg_parser.add_argument('--budget-help-ms', type=float, default=100.0,
+                            help="Tiempo máximo de main.py --help (sin el arranque del intérprete)")
+    arg_parser.add_argument('--budget-config-ms', type=float, default=300.0,
+                            help="Tiempo máximo de la primera carga de urls_config.json (sin el arranque del intérprete)")
+    args = arg_parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    total_ms = statistics.median(run.get(args.module, 0) for run in runs) / 1000
+
+    # Módulos más lentos de la última medición: solo los de primer nivel y sin
+    # los que el intérprete importa siempre al arrancar (site, .pth...)
+    baseline = measure(None)
+    last = runs[-1]
+    top_level = {name: us for name, us in last.items()
+                 if '.' not in name and name != args.module and name not in baseline}
+    print(f"Import de {args.module}: {total_ms:.1f} ms (mediana de {args.runs}, presupuesto {args.budget_ms:.0f} ms)")
+    for name, us in sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<24} {us / 1000:8.1f} ms")
+
+    cold = measure_cold_path(args.runs)
+    print(f"main.py --help: {cold['help']:.1f} ms (presupuesto {args.budget_help_ms:.0f} ms)")
+    print(f"Primera carga de urls_config.json: {cold['config_first']:.1f} ms "
+          f"(presupuesto {args.budget_config_ms:.0f} ms); con la copia validada: {cold['config_cached']:.1f} ms")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"el arranque ({total_ms:.1f} ms) supera el presupuesto de {args.budget_ms:.0f} ms")
+    if cold['help'] > args.budget_help_ms:
+        failures.append(f"main.py --help ({cold['help']:.1f} ms) supera el presupuesto de {args.budget_help_ms:.0f} ms")
+    if cold['config_first'] > args.budget_config_ms:
+        failures.append(f"la primera carga de urls_config.json ({cold['config_first']:.1f} ms) "
+                        f"supera el presupuesto de {args.budget_config_ms:.0f} ms")
+    imported = sorted(name for name in FORBIDDEN if name in last)
+    if imported:
+        failures.append(f"se importan al arrancar: {', '.join(imported)}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Arranque dentro del presupuesto")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Servidor HTTP local para los benchmarks (sin acceso a Internet).
+Sirve:
+- /fixtures/<archivo>: páginas grabadas de data/fixtures
+- /synthetic/<KB>/<n>: listados de ofertas sintéticos de unos <KB> kilobytes
+  (p. ej. /synthetic/1024/7 es una página de 1 MB); n solo distingue URLs
+- /paged/<páginas>/<n>?page=<k>: listado paginado de <páginas> páginas con
+  10 ofertas cada una y un paginador con enlaces a todas las páginas (y uno
+  a otro sitio, que no se debe seguir)
+- /robots.txt: el texto indicado con robots (si no, 404)
+
+Puede inyectar latencia (con variación aleatoria) y errores: una fracción
+fija de las rutas responde siempre con error, de modo que las mismas URLs
+fallan en todas las ejecuciones y los resultados son comparables.
+
+Uso independiente (desde la raíz del repositorio):
+    python benchmarks/fixture_server.py [--port 8000] [--latency-ms 50] [--error-rate 0.05]
+"""
+import argparse  # Para leer los parámetros del servidor
+import functools  # Para cachear las páginas sintéticas generadas
+import http.server  # Servidor HTTP de la librería estándar
+import os  # Para localizar los fixtures
+import random  # Para la variación de la latencia
+import threading  # El servidor atiende en un hilo aparte
+import time  # Para simular la latencia
+import zlib  # Para decidir de forma determinista qué rutas fallan
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'fixtures')
+
+# Keywords que aparecen en las páginas sintéticas
+SYNTHETIC_KEYWORDS = ['psicología', 'neurociencia', 'python', 'doctorado', 'investigación']
+
+
+def job_card(i):
+    """
+    Genera la tarjeta HTML de una oferta (unos 600 bytes).
+    """
+    return f"""
+    <article class="job">
+      <h2>Oferta {i}: contrato predoctoral en psicología</h2>
+      <h3>Departamento de Neurociencia {i % 7}</h3>
+      <div class="job-description">
+        <p>Buscamos investigador/a con formación en <b>psicología</b> o neurociencia.</p>
+        <p>Se valorará experiencia en <em>Python</em> y análisis de datos. Ref {i}.</p>
+      </div>
+      <ul class="requirements"><li>Grado en Psicología</li><li>Doctorado en curso</li></ul>
+    </article>"""
+
+
+@functools.lru_cache(maxsize=8)
+def synthetic_page(size_kb):
+    """
+    Genera un listado de ofertas de aproximadamente size_kb kilobytes.
+
+    Args:
+        size_kb (int): Tamaño deseado en KB.
+
+    Returns:
+        bytes: Página HTML codificada en UTF-8.
+    """
+    head = "<html><head><title>Ofertas</title></head><body><h1>Listado de ofertas</h1><main>"
+    tail = "</main><footer>Investigación</footer></body></html>"
+    target = size_kb * 1024
+    cards = []
+    size = len(head) + len(tail)
+    while size < target:
+        card = job_card(len(cards))
+        cards.append(card)
+        size += len(card.encode('utf-8'))
+    return (head + ''.join(cards) + tail).encode('utf-8')
+
+
+@functools.lru_cache(maxsize=64)
+def paged_page(pages, page):
+    """
+    Genera la página k de un listado paginado. El paginador enlaza todas las
+    páginas (la primera sin ?page, como suelen hacer los sitios reales) y
+    una "siguiente" con fragmento, de modo que la misma página aparece
+    escrita de varias formas, además de un enlace a otro host.
+
+    Args:
+        pages (int): Número de páginas del listado.
+        page (int): Página a generar (desde 1).
+
+    Returns:
+        bytes: Página HTML codificada en UTF-8.
+    """
+    cards = ''.join(job_card((page - 1) * 10 + i) for i in range(10))
+    links = ''.join(
+        f'<a href="?page={k}">{k}</a>' if k > 1 else '<a href="?">1</a>' for k in range(1, pages + 1)
+    )
+    if page < pages:
+        links += f'<a class="next" href="?page={page + 1}#listado">Siguiente</a>'
+    links += f'<a href="https://otro-sitio.example/ofertas?page={page + 1}">Más ofertas</a>'
+    return (f"<html><head><title>Ofertas ({page}/{pages})</title></head><body><main>{cards}</main>"
+            f'<nav class="pager">{links}</nav></body></html>').encode('utf-8')
+
+
+def synthetic_config(base_url, count, size_kb):
+    """
+    Configuración de URLs (formato de urls_config.json) para count páginas
+    sintéticas: la mitad cuenta por áreas y la otra mitad en toda la página.
+    """
+    return [
+        {
+            'name': f"Sintética {i}",
+            'url': f"{base_url}/synthetic/{size_kb}/{i}",
+            'keywords': SYNTHETIC_KEYWORDS,
+            'search_areas': {
+                'titulo': 'h1, h2',
+                'descripcion': 'article, .job-description',
+                'requisitos': '.requirements',
+            } if i % 2 == 0 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def paged_config(base_url, count, pages):
+    """
+    Configuración de URLs para count listados paginados de pages páginas.
+    """
+    return [
+        {
+            'name': f"Paginada {i}",
+            'url': f"{base_url}/paged/{pages}/{i}",
+            'keywords': SYNTHETIC_KEYWORDS,
+            'pagination': {'next': 'nav.pager a', 'max_pages': pages, 'stop_if_missing': 'article.job'},
+        }
+        for i in range(count)
+    ]
+
+
+def fixtures_config(base_url, count):
+    """
+    Configuración de URLs para count páginas servidas desde data/fixtures,
+    repartidas entre los fixtures que tienen su configuración (.json) al lado.
+    """
+    import json
+
+    fixtures = []
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith('.html'):
+            config_path = os.path.join(FIXTURES_DIR, filename[:-5] + '.json')
+            with open(config_path, 'r', encoding='utf-8') as f:
+                fixtures.append((filename, json.load(f)))
+
+    config = []
+    for i in range(count):
+        filename, fixture_config = fixtures[i % len(fixtures)]
+        config.append(dict(fixture_config, name=f"{fixture_config['name']} {i}",
+                           url=f"{base_url}/fixtures/{filename}?n={i}"))
+    return config
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, como los servidores reales
+
+    def do_GET(self):
+        server = self.server
+        path, _, query = self.path.partition('?')
+
+        # Latencia simulada (antes de cualquier respuesta, también de los errores)
+        if server.latency_ms or server.jitter_ms:
+            time.sleep(max(0.0, server.latency_ms + random.uniform(-1, 1) * server.jitter_ms) / 1000)
+
+        # Las mismas rutas fallan siempre (incluidos los reintentos)
+        if server.error_rate and zlib.crc32(self.path.encode()) % 10000 < server.error_rate * 10000:
+            server.count('errors')
+            self._send(server.error_status, b'error simulado')
+            return
+
+        body = self._body(path, query)
+        if body is None:
+            server.count('not_found')
+            self._send(404, b'no encontrado')
+            return
+        server.count('ok')
+        self._send(200, body, 'text/html; charset=utf-8')
+
+    def _body(self, path, query=''):
+        """
+        Devuelve el cuerpo de una ruta, o None si no existe.
+        """
+        parts = path.strip('/').split('/')
+        if path == '/robots.txt':
+            return self.server.robots.encode('utf-8') if self.server.robots is not None else None
+        if len(parts) == 2 and parts[0] == 'fixtures':
+            filepath = os.path.join(FIXTURES_DIR, os.path.basename(parts[1]))
+            if os.path.isfile(filepath):
+                with open(filepath, 'rb') as f:
+                    return f.read()
+        if len(parts) == 3 and parts[0] == 'synthetic' and parts[1].isdigit():
+            return synthetic_page(int(parts[1]))
+        if len(parts) == 3 and parts[0] == 'paged' and parts[1].isdigit():
+            page = dict(pair.partition('=')[::2] for pair in query.split('&') if pair).get('page', '1')
+            if page.isdigit() and 1 <= int(page) <= int(parts[1]):
+                return paged_page(int(parts[1]), int(page))
+        return None
+
+    def _send(self, status, body, content_type='text/plain; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Sin una línea por petición
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency_ms=0, jitter_ms=0, error_rate=0.0, error_status=503, robots=None):
+        """
+        Constructor de la clase FixtureServer.
+
+        Args:
+            port (int): Puerto (0 = uno libre).
+            latency_ms (float): Latencia media por petición en milisegundos.
+            jitter_ms (float): Variación máxima de la latencia (±) en milisegundos.
+            error_rate (float): Fracción de rutas que responden con error (0-1).
+            error_status (int): Código HTTP de los errores simulados.
+            robots (str): Contenido de /robots.txt (None = 404).
+        """
+        super().__init__(('127.0.0.1', port), FixtureHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.robots = robots
+        self.stats = {'ok': 0, 'errors': 0, 'not_found': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        self.server_close()
+        return False
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--port', type=int, default=8000, help='Puerto')
+    arg_parser.add_argument('--latency-ms', type=float, default=0, help='Latencia media por petición')
+    arg_parser.add_argument('--jitter-ms', type=float, default=0, help='Variación de la latencia (±)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='Fracción de rutas con error')
+    arg_parser.add_argument('--error-status', type=int, default=503, help='Código HTTP de los errores')
+    args = arg_parser.parse_args()
+
+    server = FixtureServer(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.error_status)
+    print(f"Sirviendo en {server.base_url} (Ctrl+C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Peticiones: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
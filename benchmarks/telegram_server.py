@@ -0,0 +1,209 @@
+"""
+Servidor local que imita la API de bots de Telegram (sin acceso a Internet).
+Atiende las llamadas que hace el notificador (src/notifier.py) a través de
+python-telegram-bot:
+- /bot<token>/getMe: datos de un bot de prueba
+- /bot<token>/sendMessage: guarda el mensaje y responde como Telegram
+
+Como la API real, rechaza con 400 los mensajes de más de 4096 caracteres y
+los que tienen el HTML mal formado (etiquetas sin cerrar, cortadas o mal
+anidadas), y puede responder 429 con retry_after a los primeros mensajes
+para simular el límite de envío, o 401 a las primeras llamadas a getMe
+para simular un fallo al conectar.
+
+Uso independiente (desde la raíz del repositorio):
+    python benchmarks/telegram_server.py [--port 8081] [--throttle 2] [--retry-after 1]
+    TELEGRAM_API_URL=http://127.0.0.1:8081/bot TELEGRAM_BOT_TOKEN=x TELEGRAM_CHAT_ID=1 python src/notifier.py
+"""
+import argparse  # Para leer los parámetros del servidor
+import http.server  # Servidor HTTP de la librería estándar
+import json  # Las respuestas de la API son JSON
+import re  # Para localizar las etiquetas HTML de los mensajes
+import threading  # El servidor atiende en un hilo aparte
+import time  # Fecha de los mensajes
+from urllib.parse import parse_qsl  # python-telegram-bot envía los parámetros como formulario
+
+# Longitud máxima de un mensaje de Telegram
+MAX_LENGTH = 4096
+
+# Etiqueta HTML completa: (/ de cierre, nombre)
+_TAG = re.compile(r'<(/?)([a-zA-Z][\w-]*)[^<>]*>')
+
+
+def html_error(text):
+    """
+    Comprueba el formato HTML de un mensaje como lo hace Telegram.
+
+    Args:
+        text (str): Texto del mensaje.
+
+    Returns:
+        str: Descripción del error, o None si el HTML es válido.
+    """
+    open_tags = []
+    position = 0
+    for match in _TAG.finditer(text):
+        if '<' in text[position:match.start()]:
+            return f"can't parse entities: unexpected '<' at byte offset {text.index('<', position)}"
+        position = match.end()
+        closing, name = match.group(1), match.group(2).lower()
+        if not closing:
+            open_tags.append(name)
+        elif not open_tags or open_tags.pop() != name:
+            return f"can't parse entities: unmatched end tag </{name}>"
+    if '<' in text[position:]:
+        return f"can't parse entities: unexpected '<' at byte offset {text.index('<', position)}"
+    if open_tags:
+        return f"can't parse entities: unclosed start tag <{open_tags[-1]}>"
+    return None
+
+
+class TelegramHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, como la API real
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode('utf-8')
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            params = json.loads(body or '{}')
+        else:
+            params = dict(parse_qsl(body, keep_blank_values=True))
+        self._answer(params)
+
+    def do_GET(self):
+        _, _, query = self.path.partition('?')
+        self._answer(dict(parse_qsl(query, keep_blank_values=True)))
+
+    def _answer(self, params):
+        """
+        Responde a una llamada de la API según el método de la URL.
+        """
+        server = self.server
+        method = self.path.partition('?')[0].rstrip('/').rsplit('/', 1)[-1]
+        if method == 'getMe':
+            if server.reject_auth():
+                self._send(401, {'ok': False, 'error_code': 401, 'description': 'Unauthorized'})
+                return
+            self._send(200, {'ok': True, 'result': {
+                'id': 1, 'is_bot': True, 'first_name': 'Scraper', 'username': 'scraper_test_bot'
+            }})
+        elif method == 'sendMessage':
+            self._send(*server.send_message(params))
+        else:
+            self._send(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Sin una línea por petición
+
+
+class TelegramServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, throttle=0, retry_after=1, fail_auth=0):
+        """
+        Constructor de la clase TelegramServer.
+
+        Args:
+            port (int): Puerto (0 = uno libre).
+            throttle (int): Número de envíos iniciales que se responden con 429.
+            retry_after (int): Segundos de espera que se indican en cada 429.
+            fail_auth (int): Número de llamadas iniciales a getMe que se responden con 401.
+        """
+        super().__init__(('127.0.0.1', port), TelegramHandler)
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.fail_auth = fail_auth
+        self.messages = []  # Mensajes aceptados, en orden de llegada
+        self.stats = {'sent': 0, 'throttled': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        """
+        URL base para TelegramNotifier / TELEGRAM_API_URL (el token va a continuación).
+        """
+        return f"http://127.0.0.1:{self.server_port}/bot"
+
+    def reject_auth(self):
+        """
+        Indica si la llamada a getMe debe fallar (y descuenta una de fail_auth).
+        """
+        with self._lock:
+            if self.fail_auth > 0:
+                self.fail_auth -= 1
+                return True
+            return False
+
+    def send_message(self, params):
+        """
+        Procesa un sendMessage.
+
+        Returns:
+            tuple: (código HTTP, respuesta JSON de la API)
+        """
+        text = params.get('text', '')
+        with self._lock:
+            if self.throttle > 0:
+                self.throttle -= 1
+                self.stats['throttled'] += 1
+                return 429, {'ok': False, 'error_code': 429,
+                             'description': f"Too Many Requests: retry after {self.retry_after}",
+                             'parameters': {'retry_after': self.retry_after}}
+
+            error = 'message is too long' if len(text) > MAX_LENGTH else None
+            if error is None and params.get('parse_mode', '').upper() == 'HTML':
+                error = html_error(text)
+            if error:
+                self.stats['rejected'] += 1
+                return 400, {'ok': False, 'error_code': 400, 'description': f"Bad Request: {error}"}
+
+            self.stats['sent'] += 1
+            self.messages.append(params)
+            return 200, {'ok': True, 'result': {
+                'message_id': len(self.messages),
+                'date': int(time.time()),
+                'chat': {'id': int(params.get('chat_id') or 0), 'type': 'private'},
+                'text': text,
+            }}
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        self.server_close()
+        return False
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--port', type=int, default=8081, help='Puerto')
+    arg_parser.add_argument('--throttle', type=int, default=0, help='Envíos iniciales respondidos con 429')
+    arg_parser.add_argument('--retry-after', type=int, default=1, help='retry_after de los 429 (segundos)')
+    arg_parser.add_argument('--fail-auth', type=int, default=0, help='Llamadas iniciales a getMe respondidas con 401')
+    args = arg_parser.parse_args()
+
+    server = TelegramServer(args.port, args.throttle, args.retry_after, args.fail_auth)
+    print(f"API de Telegram simulada en {server.base_url} (Ctrl+C para parar)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Mensajes: {server.stats}")
+        for message in server.messages:
+            print(f"--- {len(message.get('text', ''))} caracteres ---\n{message.get('text', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Detección de cambios entre ejecuciones.
+Compara cada resultado con el último guardado para la misma fuente (clave
+"name") y emite solo lo que ha cambiado:
+- Fuentes nuevas (nunca vistas antes)
+- Cambios de status (p. ej. NO -> YES en los date_check / keyword_check)
+- Variaciones en los conteos de keywords (p. ej. psicolog: 2 -> 5)
+- Fuentes que empiezan a fallar o que se recuperan
+
+Para cada fuente se guarda una huella compacta (hash de sus métricas) y las
+últimas métricas correctas en data/.cache/last_results.json. Si la huella
+no cambia, la fuente no se almacena ni se notifica.
+"""
+import hashlib  # Para calcular la huella de cada resultado
+import json  # Para serializar el estado entre ejecuciones
+import os  # Para crear el directorio del estado
+from config import CHANGES_STATE_FILE  # Archivo con el último resultado de cada fuente
+
+# Claves que no forman parte de las métricas de un resultado
+_META_KEYS = frozenset({'timestamp', 'name', 'url'})
+
+
+def metrics_of(result):
+    """
+    Extrae las métricas de un resultado (todo salvo timestamp, name, url y error).
+
+    Args:
+        result (dict): Resultado devuelto por el scraper.
+
+    Returns:
+        dict: Métricas del resultado.
+    """
+    return {key: value for key, value in result.items() if key not in _META_KEYS and key != 'error'}
+
+
+def fingerprint(result):
+    """
+    Calcula la huella de un resultado: cambia si cambia cualquier métrica o
+    si la fuente pasa a fallar (o deja de hacerlo).
+
+    Args:
+        result (dict): Resultado devuelto por el scraper.
+
+    Returns:
+        str: Hash corto (16 caracteres hexadecimales).
+    """
+    payload = {'metrics': metrics_of(result), 'error': 'error' in result}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()[:16]
+
+
+class ChangeDetector:
+    def __init__(self, filepath=CHANGES_STATE_FILE):
+        """
+        Constructor de la clase ChangeDetector. Carga el estado anterior.
+
+        Args:
+            filepath (str): Archivo JSON con el último resultado de cada fuente.
+        """
+        self.filepath = filepath
+        self.state = {}  # name -> {'fingerprint', 'metrics', 'error'}
+        self._pending = {}  # Estado nuevo de las fuentes cambiadas (se aplica con save)
+
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError) as e:
+                # Un estado dañado equivale a no tener estado: todo se considera nuevo
+                print(f"Advertencia: no se pudo leer {filepath} ({e}); se parte de cero")
+
+    def diff(self, results):
+        """
+        Compara los resultados con el estado guardado. El estado nuevo de
+        las fuentes cambiadas queda pendiente: solo se aplica con save()
+        (y se descarta con discard() si el guardado de los resultados
+        falla), así un lote fallido se vuelve a detectar en el siguiente.
+
+        Args:
+            results (list): Resultados de la ejecución actual.
+
+        Returns:
+            tuple: (changed_results, changes)
+                - changed_results (list): Resultados cuya huella ha cambiado
+                - changes (list): Un diccionario por fuente cambiada con:
+                    name, url, kind ('nueva', 'error', 'recuperada' o 'cambios'),
+                    error (si falla) y deltas ({métrica: (antes, ahora)})
+        """
+        changed_results = []
+        changes = []
+
+        for result in results:
+            name = result.get('name')
+            current = fingerprint(result)
+            previous = self.state.get(name)
+
+            if previous is not None and previous['fingerprint'] == current:
+                continue  # Sin cambios: ni se almacena ni se notifica
+
+            failed = 'error' in result
+            change = {'name': name, 'url': result.get('url'), 'deltas': {}}
+
+            if failed:
+                change['kind'] = 'error'
+            elif previous is None:
+                change['kind'] = 'nueva'
+            elif previous.get('error'):
+                change['kind'] = 'recuperada'
+            else:
+                change['kind'] = 'cambios'
+
+            if failed:
+                change['error'] = result['error']
+                # Se conservan las últimas métricas correctas para comparar al recuperarse
+                metrics = previous['metrics'] if previous else {}
+            else:
+                metrics = metrics_of(result)
+                change['deltas'] = self._deltas(previous['metrics'] if previous else {}, metrics)
+
+            self._pending[name] = {'fingerprint': current, 'metrics': metrics, 'error': failed}
+            changed_results.append(result)
+            changes.append(change)
+
+        return changed_results, changes
+
+    @staticmethod
+    def _deltas(before, after):
+        """
+        Devuelve las métricas que han cambiado: {métrica: (antes, ahora)}.
+        Las métricas que aparecen o desaparecen se comparan con None.
+        """
+        return {
+            key: (before.get(key), after.get(key))
+            for key in sorted(before.keys() | after.keys())
+            if before.get(key) != after.get(key)
+        }
+
+    def save(self):
+        """
+        Aplica los cambios pendientes y guarda el estado (escritura atómica).
+        Se llama después de almacenar los resultados, para no perder cambios
+        si el guardado falla. Si la escritura falla, el estado en memoria
+        tampoco cambia.
+        """
+        state = {**self.state, **self._pending}
+        os.makedirs(os.path.dirname(self.filepath) or '.', exist_ok=True)
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.filepath)
+        self.state = state
+        self._pending = {}
+
+    def discard(self):
+        """
+        Descarta los cambios pendientes de diff() (p. ej. si el lote falla
+        antes de guardarse): se volverán a detectar en la próxima comparación.
+        """
+        self._pending = {}
+
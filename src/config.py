@@ -4,11 +4,28 @@ Este archivo contiene todas las configuraciones globales del proyecto,
 incluyendo credenciales, rutas de archivos y parámetros del scraper.
 """
 import os  # Para acceder a variables de entorno del sistema
-from dotenv import load_dotenv  # Para cargar variables desde archivo .env
+
+
+def _has_dotenv(directory):
+    """
+    Indica si hay un archivo .env en el directorio o en alguno superior
+    (los mismos sitios en los que lo busca load_dotenv).
+    """
+    while True:
+        if os.path.isfile(os.path.join(directory, '.env')):
+            return True
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return False
+        directory = parent
+
 
 # Carga las variables de entorno desde el archivo .env (si existe)
-# Esto permite configurar credenciales localmente sin exponerlas en el código
-load_dotenv()
+# Esto permite configurar credenciales localmente sin exponerlas en el código.
+# python-dotenv solo se importa si hay un .env (en GitHub Actions no lo hay)
+if _has_dotenv(os.path.dirname(os.path.abspath(__file__))):
+    from dotenv import load_dotenv  # Para cargar variables desde archivo .env
+    load_dotenv()
 
 # ============== Configuración de Telegram ==============
 # Token del bot de Telegram para enviar notificaciones
@@ -19,12 +36,71 @@ TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 # Se obtiene del bot @userinfobot en Telegram
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
+# URL de la API de Telegram (sin el token). Se puede apuntar a un servidor
+# Bot API local o a un servidor de pruebas
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org/bot')
+
+# Longitud máxima de un mensaje de Telegram (los más largos se trocean)
+TELEGRAM_MAX_LENGTH = 4096
+
+# Segundos mínimos entre dos mensajes al mismo chat (límite de Telegram: ~1 por segundo)
+TELEGRAM_MIN_INTERVAL = 1.0
+
+# Segundos que se espera para agrupar en un solo mensaje las alertas que llegan juntas
+TELEGRAM_COALESCE_DELAY = 0.5
+
+# Reintentos por mensaje ante errores de red o respuestas 429
+TELEGRAM_MAX_RETRIES = 3
+
+# Segundos máximos que se espera al final a que se entreguen los mensajes pendientes
+TELEGRAM_FLUSH_TIMEOUT = 60
+
 # ============== Rutas de archivos ==============
-# Ruta del archivo Excel donde se almacenan los resultados del scraping
+# Ruta base del Excel de resultados (con rotación mensual se le añade el mes, ver EXCEL_ROTATION)
 EXCEL_FILE = 'data/scraper_estudios.xlsx' 
 
+# Rotación del Excel: 'monthly' (un archivo por mes, p. ej.
+# data/scraper_estudios_2025-01.xlsx; es la disposición de los datos del
+# repositorio) o 'none' (un único archivo EXCEL_FILE con todo el historial).
+# Con rotación mensual el coste de cada ejecución no crece con el historial
+EXCEL_ROTATION = os.getenv('SCRAPER_EXCEL_ROTATION', 'monthly')
+
+# Directorio donde se guarda el índice encabezado -> columna de cada Excel
+# (evita recorrer la fila de encabezados en cada ejecución)
+EXCEL_INDEX_DIR = 'data/.cache'
+
+# Dónde se guardan los resultados de cada ejecución:
+# 'excel' (solo el Excel), 'sqlite' (solo la base de datos; el Excel se genera
+# bajo demanda con python src/results_store.py --export) o 'both'
+RESULTS_STORE = os.getenv('SCRAPER_RESULTS_STORE', 'excel')
+
+# Base de datos SQLite con el historial de resultados (una fila por métrica)
+RESULTS_DB = 'data/scraper_estudios.db'
+
+# Filas por lote al insertar en la base de datos
+RESULTS_BATCH_SIZE = 1000
+
+# Si es '1', solo se almacenan y notifican las fuentes que han cambiado
+# respecto a la ejecución anterior (nuevas, cambios de status o de conteos, errores)
+CHANGES_ONLY = os.getenv('SCRAPER_CHANGES_ONLY', '0') == '1'
+
+# Archivo con la huella y las últimas métricas de cada fuente (para detectar cambios)
+CHANGES_STATE_FILE = 'data/.cache/last_results.json'
+
+# Índice de ofertas ya vistas (hash por oferta; ver seen_offers.py)
+SEEN_OFFERS_DB = os.getenv('SCRAPER_SEEN_OFFERS_DB', 'data/.cache/seen_offers.db')
+
+# Días sin aparecer tras los que una oferta se olvida (si reaparece, vuelve a ser nueva)
+SEEN_OFFERS_TTL_DAYS = float(os.getenv('SCRAPER_SEEN_OFFERS_TTL', '90'))
+
 # Ruta del archivo JSON con la configuración de URLs a scrapear
-URLS_CONFIG = 'data/urls_config.json'
+URLS_CONFIG = os.getenv('SCRAPER_URLS_CONFIG', 'data/urls_config.json')
+
+# Copia validada de urls_config.json (solo se vuelve a validar si el archivo cambia)
+URLS_CONFIG_CACHE = 'data/.cache/urls_config.checked.json'
+
+# Directorio de los resultados parciales de cada shard (--shard i/N) hasta su combinación (--merge)
+SHARDS_DIR = os.getenv('SCRAPER_SHARDS_DIR', 'data/shards')
 
 # ============== Configuración del scraper ==============
 # Tiempo máximo de espera para cada petición HTTP (en segundos)
@@ -34,6 +110,143 @@ REQUEST_TIMEOUT = 10  # segundos
 # Esto ayuda a evitar bloqueos por parte de algunos sitios web
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 
-# Tiempo de espera entre peticiones HTTP (en segundos)
-# Implementa rate limiting para respetar robots.txt y evitar sobrecargar servidores
-RATE_LIMIT_DELAY = 1  # 1 segundo entre peticiones
\ No newline at end of file
+# Tiempo de espera entre peticiones HTTP al mismo host (en segundos) para los
+# hosts cuyo robots.txt no indica Crawl-delay (los que lo indican usan el suyo).
+# El retardo se aplica por host: peticiones a dominios distintos no se esperan entre sí
+RATE_LIMIT_DELAY = float(os.getenv('SCRAPER_RATE_LIMIT_DELAY', '1'))  # 1 segundo entre peticiones al mismo host
+
+# ============== robots.txt (ver robots.py) ==============
+# Si es '1', se lee el robots.txt de cada host: las URLs prohibidas no se
+# descargan y su Crawl-delay sustituye a RATE_LIMIT_DELAY para ese host
+ROBOTS_ENABLED = os.getenv('SCRAPER_ROBOTS', '1') == '1'
+
+# Archivo JSON donde se guardan los robots.txt descargados
+ROBOTS_CACHE_FILE = 'data/.cache/robots.json'
+
+# Segundos durante los que se reutiliza un robots.txt sin volver a pedirlo
+ROBOTS_TTL = int(os.getenv('SCRAPER_ROBOTS_TTL', '86400'))  # 1 día
+
+# Máximo de segundos entre peticiones que se acepta de un Crawl-delay
+ROBOTS_MAX_DELAY = float(os.getenv('SCRAPER_ROBOTS_MAX_DELAY', '30'))
+
+# Máximo de bytes que se leen de un robots.txt (el resto se ignora)
+ROBOTS_MAX_BYTES = 512 * 1024
+
+# Número de hilos que descargan URLs en paralelo durante scrape_all
+# Con 1 se recupera el comportamiento secuencial original
+MAX_WORKERS = int(os.getenv('SCRAPER_MAX_WORKERS', '4'))
+
+# Motor de parseo HTML por defecto: 'html.parser', 'lxml' o 'selectolax'
+# Se puede sobrescribir por URL con la clave "parser" en urls_config.json.
+# Si el motor elegido no está instalado se usa 'html.parser'
+PARSER_BACKEND = os.getenv('SCRAPER_PARSER', 'html.parser')
+
+# Número de keywords a partir del cual se cuentan todas en una sola pasada
+# con el autómata multi-patrón. Con listas cortas es más rápido str.count()
+# por keyword: cada pasada es un bucle en C, mientras que el autómata vuelve
+# a Python en cada coincidencia. Con benchmarks/bench_keywords.py (textos de
+# 20 KB a 1 MB) el autómata solo gana a partir de 200-300 keywords, y con las
+# 5-10 de una URL típica es unas 3 veces más lento. Las búsquedas de palabra
+# completa usan siempre el autómata
+KEYWORD_AUTOMATON_THRESHOLD = 200
+
+# ============== Parseo en procesos ==============
+# Número de procesos que parsean y extraen en paralelo a las descargas.
+# Con 0 se parsea en los propios hilos de descarga (un solo núcleo)
+PARSE_WORKERS = int(os.getenv('SCRAPER_PARSE_WORKERS', '0'))
+
+# Máximo de páginas descargadas pendientes de parsear. Si se alcanza, los
+# hilos de descarga esperan (contrapresión) y la memoria queda acotada
+PARSE_QUEUE_SIZE = int(os.getenv('SCRAPER_PARSE_QUEUE', '8'))
+
+# Segundos que se espera a los parseos pendientes al cerrar los workers;
+# los que no terminan a tiempo se cancelan
+PARSE_SHUTDOWN_TIMEOUT = int(os.getenv('SCRAPER_PARSE_SHUTDOWN_TIMEOUT', '30'))
+
+# ============== Listados paginados (bloque "pagination" de urls_config.json) ==============
+# Máximo de páginas por fuente (incluida la primera) si la URL no indica "max_pages"
+PAGINATION_MAX_PAGES = int(os.getenv('SCRAPER_PAGINATION_MAX_PAGES', '10'))
+
+# Páginas de una misma fuente que se descargan a la vez (siempre respetando
+# el retardo por host)
+PAGINATION_WORKERS = int(os.getenv('SCRAPER_PAGINATION_WORKERS', '4'))
+
+# ============== Modo residente (python src/daemon.py) ==============
+# Intervalo por defecto entre comprobaciones de cada URL. Cada URL puede
+# indicar el suyo con la clave "interval" (segundos o '30m', '6h', '2d'...)
+DAEMON_DEFAULT_INTERVAL = os.getenv('SCRAPER_DAEMON_INTERVAL', '12h')
+
+# URLs que vencen con menos de estos segundos de diferencia se procesan juntas
+DAEMON_BATCH_WINDOW = 5
+
+# Segundos entre comprobaciones de cambios en urls_config.json
+DAEMON_CONFIG_CHECK = 60
+
+# ============== Métricas ==============
+# Archivo JSON lines donde se añaden las métricas de cada ejecución
+# (tiempo por URL y etapa, bytes, nodos, pico de memoria). Vacío = no se guardan
+METRICS_FILE = os.getenv('SCRAPER_METRICS_FILE', 'data/.cache/metrics.jsonl')
+
+# Tamaño (bytes) a partir del que metrics.jsonl se rota a metrics.jsonl.1
+# (se conserva una sola generación anterior). 0 = sin límite
+METRICS_MAX_BYTES = int(os.getenv('SCRAPER_METRICS_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# Perfilado opcional de la ejecución completa: 'cprofile', 'tracemalloc' o
+# ambos separados por comas (p. ej. SCRAPER_PROFILE=cprofile,tracemalloc).
+# Se puede indicar también con python src/main.py --profile cprofile
+PROFILE = os.getenv('SCRAPER_PROFILE', '')
+
+# Archivo donde se guardan las estadísticas de cProfile
+PROFILE_FILE = 'data/.cache/profile.pstats'
+
+# ============== Descarga en streaming ==============
+# Tamaño máximo (en bytes) que se descarga por URL; el resto de la respuesta se descarta.
+# Se puede sobrescribir por URL con la clave "max_bytes" en urls_config.json
+MAX_RESPONSE_BYTES = int(os.getenv('SCRAPER_MAX_BYTES', str(10 * 1024 * 1024)))  # 10 MB
+
+# Tamaño de cada bloque leído de la respuesta (en bytes)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# ============== Sesión HTTP (pool de conexiones y reintentos) ==============
+# Número máximo de hosts con pool de conexiones abierto a la vez
+HTTP_POOL_CONNECTIONS = 50
+
+# Conexiones keep-alive que se conservan por host (una por hilo de descarga)
+HTTP_POOL_MAXSIZE = max(MAX_WORKERS, 1)
+
+# Reintentos ante errores de conexión o respuestas 429/5xx transitorias
+HTTP_RETRIES = int(os.getenv('SCRAPER_HTTP_RETRIES', '3'))
+
+# Factor de backoff exponencial: espera factor * 2^(intento - 1) segundos
+HTTP_BACKOFF_FACTOR = 0.5
+
+# Jitter aleatorio (en segundos) que se suma a cada espera de backoff
+HTTP_BACKOFF_JITTER = 0.5
+
+# Códigos HTTP que se consideran transitorios y se reintentan
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# Máximo de segundos que se respeta de una cabecera Retry-After
+HTTP_RETRY_AFTER_MAX = 60
+
+# ============== Archivo de páginas descargadas ==============
+# Si es '1', cada página descargada se guarda comprimida en SNAPSHOTS_DIR para
+# poder repetir la extracción sin red (python src/snapshots.py --replay)
+SNAPSHOTS_ENABLED = os.getenv('SCRAPER_SNAPSHOTS', '0') == '1'
+
+# Directorio del archivo: objects/ (páginas por hash) y runs/ (una lista por ejecución)
+SNAPSHOTS_DIR = os.getenv('SCRAPER_SNAPSHOTS_DIR', 'data/snapshots')
+
+# Compresión de las páginas: 'zstd' (requiere el paquete zstandard), 'gzip'
+# o 'auto' (zstd si está instalado, si no gzip)
+SNAPSHOTS_COMPRESSION = os.getenv('SCRAPER_SNAPSHOTS_COMPRESSION', 'auto')
+
+# ============== Caché de validación HTTP (ETag / Last-Modified) ==============
+# Activa la caché de peticiones condicionales entre ejecuciones
+HTTP_CACHE_ENABLED = os.getenv('SCRAPER_HTTP_CACHE', '1') == '1'
+
+# Archivo JSON donde se guardan validadores y resultados de la última extracción
+HTTP_CACHE_FILE = 'data/.cache/http_cache.json'
+
+# Número máximo de URLs en la caché (se descartan las usadas hace más tiempo)
+HTTP_CACHE_MAX_ENTRIES = 1000
@@ -0,0 +1,279 @@
+"""
+Modo residente: el scraper queda en ejecución y comprueba cada URL con su
+propia frecuencia, en lugar de procesarlas todas juntas en cada ejecución
+programada.
+
+- Cada URL de urls_config.json puede indicar su "interval" (segundos o
+  '30m', '6h', '2d'...); si no, se usa DAEMON_DEFAULT_INTERVAL.
+- Las próximas comprobaciones se guardan en una cola de prioridad (heapq)
+  ordenada por hora de vencimiento; el proceso duerme hasta la primera. Las
+  URLs que vencen casi a la vez (DAEMON_BATCH_WINDOW) se procesan juntas.
+- Entre comprobaciones se mantiene todo en memoria: sesión HTTP y
+  conexiones abiertas, planes compilados, caché de validación, detector de
+  cambios, base de datos y Excel cargado.
+- Los cambios en urls_config.json se aplican sin reiniciar.
+- Solo se notifican los cambios (como con SCRAPER_CHANGES_ONLY=1), para no
+  enviar un resumen completo en cada comprobación.
+
+Uso (desde la raíz del repositorio):
+    python src/daemon.py            # Hasta Ctrl+C o SIGTERM
+    python src/daemon.py --once     # Procesa lo pendiente una vez y termina
+"""
+import heapq  # Cola de prioridad con la próxima comprobación de cada URL
+import os  # Para detectar cambios en urls_config.json
+import signal  # Para parar de forma ordenada con Ctrl+C o SIGTERM
+import threading  # Evento de parada (permite interrumpir las esperas)
+import time  # Reloj monotónico para el calendario
+from contextlib import nullcontext  # Sin transacción cuando no hay base de datos
+from datetime import datetime  # Para los timestamps de cada lote
+from config import (  # Configuración del modo residente y de almacenamiento
+    DAEMON_DEFAULT_INTERVAL, DAEMON_BATCH_WINDOW, DAEMON_CONFIG_CHECK, URLS_CONFIG,
+    RESULTS_STORE, CHANGES_ONLY
+)
+from scraper import WebScraper  # Scraper compartido entre lotes
+from change_detector import ChangeDetector  # Detección de cambios por fuente
+from excel_handler import ExcelHandler, excel_path_for  # Excel que se mantiene cargado
+from results_store import ResultsStore  # Base de datos que se mantiene abierta
+from seen_offers import SeenOffersIndex  # Índice de ofertas vistas que se mantiene abierto
+from notifier import TelegramNotifier  # Notificaciones en segundo plano
+from metrics import RunMetrics  # Métricas de cada lote
+from urls_config import parse_interval  # Intervalos por URL ('30m', '6h'...)
+
+
+class Daemon:
+    def __init__(self, default_interval=DAEMON_DEFAULT_INTERVAL, batch_window=DAEMON_BATCH_WINDOW):
+        """
+        Constructor de la clase Daemon.
+
+        Args:
+            default_interval (int | str): Intervalo de las URLs sin "interval".
+            batch_window (float): Segundos de margen para agrupar URLs en un lote.
+        """
+        self.default_interval = parse_interval(default_interval)
+        self.batch_window = batch_window
+
+        # Recursos compartidos entre lotes
+        self.scraper = WebScraper(urls_config=[])
+        self.detector = ChangeDetector()
+        self.seen_index = SeenOffersIndex()
+        self.notifier = TelegramNotifier()
+        self.store = ResultsStore() if RESULTS_STORE in ('sqlite', 'both') else None
+        self.excel = None  # ExcelHandler cargado (se abre con el primer lote)
+
+        # Calendario: (vencimiento, orden, nombre) en una cola de prioridad
+        self.configs = {}  # nombre -> configuración
+        self.intervals = {}  # nombre -> intervalo en segundos
+        self.queue = []
+        self._sequence = 0  # Desempate estable entre URLs con el mismo vencimiento
+        self._config_mtime = None
+        self._config_checked = 0.0
+        self._stop = threading.Event()
+
+    # ============== Configuración y calendario ==============
+
+    def reload_config(self, force=False):
+        """
+        Recarga urls_config.json si ha cambiado. Las URLs nuevas se programan
+        de inmediato; las que desaparecen se descartan al vencer.
+
+        Args:
+            force (bool): Recarga aunque no haya pasado DAEMON_CONFIG_CHECK.
+        """
+        now = time.monotonic()
+        if not force and now - self._config_checked < DAEMON_CONFIG_CHECK:
+            return
+        self._config_checked = now
+
+        try:
+            mtime = os.stat(URLS_CONFIG).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._config_mtime:
+            return
+        self._config_mtime = mtime
+
+        configs = {}
+        intervals = {}
+        for config in self.scraper._load_config():
+            try:
+                intervals[config['name']] = parse_interval(config.get('interval'), self.default_interval)
+            except ValueError as e:
+                print(f"Advertencia: {config['name']}: {e}; se usa el intervalo por defecto")
+                intervals[config['name']] = self.default_interval
+            configs[config['name']] = config
+
+        # Las URLs que no estaban se comprueban ya
+        for name in configs.keys() - self.configs.keys():
+            self._schedule(name, now)
+
+        self.configs = configs
+        self.intervals = intervals
+
+    def _schedule(self, name, due):
+        """
+        Programa la próxima comprobación de una URL.
+        """
+        self._sequence += 1
+        heapq.heappush(self.queue, (due, self._sequence, name))
+
+    def pop_due(self, now):
+        """
+        Saca de la cola las URLs que vencen ahora (con el margen de batch_window).
+
+        Returns:
+            list: Lista de (vencimiento, nombre).
+        """
+        due = []
+        while self.queue and self.queue[0][0] <= now + self.batch_window:
+            when, _, name = heapq.heappop(self.queue)
+            if name in self.configs:  # Las URLs eliminadas de la configuración se descartan
+                due.append((when, name))
+        return due
+
+    # ============== Procesamiento de un lote ==============
+
+    def run_batch(self, names):
+        """
+        Procesa un lote de URLs: scraping, ofertas nuevas, detección de
+        cambios, guardado y notificación de los cambios y las ofertas nuevas.
+
+        Args:
+            names (list): Nombres de las URLs del lote.
+        """
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        metrics = RunMetrics(timestamp)
+
+        # El scraper conserva sesión, caché y planes; solo cambian las URLs y el timestamp
+        self.scraper.urls_config = [self.configs[name] for name in names]
+        self.scraper.timestamp = timestamp
+        self.scraper.metrics = metrics
+
+        try:
+            with metrics.stage('scrape'):
+                results = self.scraper.scrape_all()
+
+            with metrics.stage('offers'):
+                new_offers = self.seen_index.diff(results)
+            with metrics.stage('changes'):
+                changed_results, changes = self.detector.diff(results)
+            to_store = changed_results if CHANGES_ONLY else results
+
+            # Las filas de SQLite solo se confirman si el Excel y el estado también
+            # se guardan: si el lote falla se deshacen y, como el estado tampoco
+            # se actualiza, el lote siguiente las vuelve a insertar una sola vez
+            with self.store.transaction() if self.store is not None else nullcontext():
+                if (to_store or new_offers) and self.store is not None:
+                    with metrics.stage('store_sqlite'):
+                        self.store.insert_results(to_store)
+                        self.store.insert_offers(new_offers)
+                if to_store and RESULTS_STORE in ('excel', 'both'):
+                    with metrics.stage('store_excel'):
+                        self._save_excel(to_store, timestamp)
+
+                with metrics.stage('state'):
+                    self.detector.save()
+                    self.seen_index.save()
+
+            with metrics.stage('notify'):
+                self.notifier.send_changes(changes, results, timestamp)
+                self.notifier.send_new_offers(new_offers, timestamp)
+            print(f"Lote de {timestamp}: {len(results)} URL(s), {len(changes)} cambio(s), "
+                  f"{len(new_offers)} oferta(s) nueva(s)")
+
+        except Exception as e:
+            # Un lote fallido no detiene el modo residente
+            print(f"\n❌ ERROR en el lote de {timestamp}: {e}")
+            self.notifier.send_error(str(e), timestamp)
+            # Los cambios no guardados se vuelven a detectar en el próximo lote
+            self.detector.discard()
+            self.seen_index.discard()
+            self._close_excel()  # Se recarga del disco en el próximo lote
+
+        metrics.print_summary()
+        metrics.write()
+
+    def _save_excel(self, results, timestamp):
+        """
+        Añade resultados al Excel, que se mantiene cargado entre lotes
+        (solo se vuelve a abrir si cambia el archivo, p. ej. por rotación mensual).
+        """
+        filepath = excel_path_for(timestamp)
+        if self.excel is None or self.excel.filepath != filepath:
+            self._close_excel()
+            self.excel = ExcelHandler(filepath)
+            self.excel.load_or_create()
+        self.excel.append_results(results)
+        self.excel.save()
+
+    def _close_excel(self):
+        if self.excel is not None:
+            self.excel.close()
+            self.excel = None
+
+    # ============== Bucle principal ==============
+
+    def stop(self, *args):
+        """
+        Pide la parada ordenada (también como manejador de señales).
+        """
+        print("\nParando el modo residente...")
+        self._stop.set()
+
+    def run(self, once=False):
+        """
+        Bucle principal: espera a la próxima URL que vence y procesa los lotes.
+
+        Args:
+            once (bool): Procesa las URLs pendientes una vez y termina.
+        """
+        self.reload_config(force=True)
+        print(f"Modo residente: {len(self.configs)} URL(s), intervalo por defecto {self.default_interval:.0f} s")
+
+        try:
+            while not self._stop.is_set():
+                self.reload_config()
+                now = time.monotonic()
+                due = self.pop_due(now)
+
+                if due:
+                    self.run_batch([name for _, name in due])
+                    finished = time.monotonic()
+                    for when, name in due:
+                        # Si una comprobación se ha retrasado, la siguiente se cuenta desde ahora
+                        self._schedule(name, max(when + self.intervals[name], finished))
+                    if once:
+                        break
+                    continue
+
+                if once:
+                    break
+                # Duerme hasta el próximo vencimiento (o hasta comprobar la configuración)
+                wait = self.queue[0][0] - now if self.queue else DAEMON_CONFIG_CHECK
+                self._stop.wait(min(max(wait, 0.0), DAEMON_CONFIG_CHECK))
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Libera los recursos compartidos y espera a las notificaciones pendientes.
+        """
+        self._close_excel()
+        if self.store is not None:
+            self.store.close()
+        self.seen_index.close()
+        self.notifier.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Scraper en modo residente con frecuencia por URL")
+    arg_parser.add_argument('--once', action='store_true', help="Procesa las URLs pendientes una vez y termina")
+    arg_parser.add_argument('--interval', default=DAEMON_DEFAULT_INTERVAL,
+                            help="Intervalo por defecto (segundos o '30m', '6h', '2d'...)")
+    args = arg_parser.parse_args()
+
+    daemon = Daemon(default_interval=args.interval)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run(once=args.once)
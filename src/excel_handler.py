@@ -5,10 +5,11 @@ incluyendo creación, lectura, escritura y actualización de datos.
 """
 
 # Importación de módulos necesarios
-import openpyxl  # Para manipular archivos Excel
-from openpyxl import Workbook  # Para crear nuevos archivos Excel
+# openpyxl se importa solo al abrir o crear el libro (si hay filas que escribir)
+import json  # Para guardar el índice de encabezados junto al Excel
 import os  # Para operaciones con el sistema de archivos
-from config import EXCEL_FILE  # Importa la ruta del archivo Excel desde la configuración
+from datetime import datetime  # Para calcular el mes del archivo rotado
+from config import EXCEL_FILE, EXCEL_ROTATION, EXCEL_INDEX_DIR  # Rutas del Excel y su índice, y modo de rotación
 
 
 class ExcelHandler:
@@ -22,27 +23,46 @@ class ExcelHandler:
         self.workbook = None     # Referencia al libro de Excel (se inicializa en None)
         self.sheet = None        # Referencia a la hoja activa (se inicializa en None)
         
+        # Índice encabezado -> número de columna (se carga al añadir resultados)
+        self.header_index = None
+        # Archivo donde se guarda el índice entre ejecuciones
+        self.index_path = os.path.join(
+            EXCEL_INDEX_DIR, os.path.splitext(os.path.basename(filepath))[0] + '.headers.json'
+        )
+        
     def load_or_create(self):
         """
         Carga un archivo Excel existente o crea uno nuevo si no existe.
         """
         if os.path.exists(self.filepath):  # Verifica si el archivo existe
             # Si existe, lo carga
+            import openpyxl  # Import diferido: para manipular archivos Excel
             self.workbook = openpyxl.load_workbook(self.filepath)
             self.sheet = self.workbook.active  # Obtiene la hoja activa
             print(f"Excel cargado: {self.filepath}")
         else:
             # Si no existe, crea uno nuevo
-            self.workbook = Workbook()
-            self.sheet = self.workbook.active
-            self.sheet.title = "Resultados Scraper"  # Establece el nombre de la hoja
-            print(f"Nuevo Excel creado: {self.filepath}")
+            self.create()
+    
+    def create(self):
+        """
+        Crea un libro nuevo en memoria (al guardar sustituye al archivo, si existe).
+        """
+        from openpyxl import Workbook  # Import diferido: para crear nuevos archivos Excel
+        self.workbook = Workbook()
+        self.sheet = self.workbook.active
+        self.sheet.title = "Resultados Scraper"  # Establece el nombre de la hoja
+        self.header_index = None
+        print(f"Nuevo Excel creado: {self.filepath}")
     
     def add_headers_if_needed(self, headers):
         """
         Añade encabezados al Excel si está vacío.
         Args:
             headers (list): Lista de nombres de columnas a añadir.
+            
+        Returns:
+            bool: True si se han añadido los encabezados.
         """
         # Verifica si la primera fila está vacía
         if self.sheet.max_row == 1 and self.sheet.cell(1, 1).value is None:
@@ -50,10 +70,58 @@ class ExcelHandler:
             for col, header in enumerate(headers, start=1):
                 self.sheet.cell(1, col, header)
             print("Encabezados añadidos")
+            return True
+        return False
+    
+    def _file_signature(self):
+        """
+        Identifica la versión del Excel en disco (tamaño y fecha de modificación),
+        para saber si el índice guardado sigue siendo válido.
+        """
+        stat = os.stat(self.filepath)
+        return [stat.st_size, stat.st_mtime_ns]
+    
+    def load_header_index(self):
+        """
+        Carga el índice encabezado -> columna. Usa el índice guardado junto al
+        Excel si corresponde a la misma versión del archivo; si no, lo
+        reconstruye leyendo la fila 1 una sola vez.
+        
+        Returns:
+            dict: Columna (empezando en 1) de cada encabezado.
+        """
+        if os.path.exists(self.index_path) and os.path.exists(self.filepath):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    saved = json.load(f)
+                if saved.get('signature') == self._file_signature():
+                    self.header_index = saved['headers']
+                    return self.header_index
+            except (OSError, ValueError, KeyError):
+                pass  # Índice dañado: se reconstruye
+        
+        # Lee la fila 1 de una vez (solo los encabezados no vacíos)
+        first_row = next(self.sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        self.header_index = {
+            header: col for col, header in enumerate(first_row, start=1) if header
+        }
+        return self.header_index
+    
+    def save_header_index(self):
+        """
+        Guarda el índice de encabezados junto con la versión del Excel recién guardado.
+        """
+        if self.header_index is None:
+            return
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        with open(self.index_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': self._file_signature(), 'headers': self.header_index}, f)
     
     def append_results(self, results):
         """
         Añade nuevas filas con los resultados al Excel.
+        Las columnas se buscan en el índice de encabezados (diccionario) y
+        cada fila se escribe de una vez con sheet.append().
         
         Args:
             results (list): Lista de diccionarios con los datos a añadir.
@@ -68,33 +136,33 @@ class ExcelHandler:
         for result in results:
             all_keys.update(result.keys())  # Añade todas las claves al conjunto
         
-        headers = sorted(list(all_keys))  # Convierte a lista y ordena alfabéticamente
+        headers = sorted(all_keys)  # Ordena alfabéticamente
         
         # Asegura que el Excel tenga los encabezados necesarios
-        self.add_headers_if_needed(headers)
-        
-        # Obtiene los encabezados actuales del Excel
-        current_headers = []
-        for col in range(1, self.sheet.max_column + 1):
-            header = self.sheet.cell(1, col).value
-            if header:  # Solo añade headers no vacíos
-                current_headers.append(header)
+        if self.add_headers_if_needed(headers):
+            self.header_index = {header: col for col, header in enumerate(headers, start=1)}
+        elif self.header_index is None:
+            self.load_header_index()
         
-        # Añade nuevos encabezados si hay columnas que no existían
+        # Añade nuevos encabezados si hay columnas que no existían (al final)
+        last_col = max(self.header_index.values(), default=0)
         for header in headers:
-            if header not in current_headers:  # Si es un nuevo header
-                # Añade al final de las columnas existentes
-                self.sheet.cell(1, len(current_headers) + 1, header)
-                current_headers.append(header)
+            if header not in self.header_index:  # Búsqueda en diccionario
+                last_col += 1
+                self.sheet.cell(1, last_col, header)
+                self.header_index[header] = last_col
         
-        # Añade los datos de cada resultado en nuevas filas
+        # Columnas ordenadas y sus encabezados, calculados una sola vez
+        columns = sorted((col, header) for header, col in self.header_index.items())
+        width = columns[-1][0] if columns else 0
+        
+        # Añade los datos de cada resultado en nuevas filas (sin recalcular max_row por fila)
         for result in results:
-            row_num = self.sheet.max_row + 1  # Obtiene el número de la siguiente fila
-            for col, header in enumerate(current_headers, start=1):
+            row = [None] * width
+            for col, header in columns:
                 # Obtiene el valor del resultado o '' si no existe
-                value = result.get(header, '')
-                # Escribe el valor en la celda correspondiente
-                self.sheet.cell(row_num, col, value)
+                row[col - 1] = result.get(header, '')
+            self.sheet.append(row)
         
         print(f"{len(results)} filas añadidas al Excel")
     
@@ -110,6 +178,9 @@ class ExcelHandler:
         # Guarda el workbook en el archivo especificado
         self.workbook.save(self.filepath)
         print(f"Excel guardado: {self.filepath}")
+        
+        # Guarda el índice de encabezados para la próxima ejecución
+        self.save_header_index()
     
     def close(self):
         """
@@ -122,7 +193,49 @@ class ExcelHandler:
             self.workbook.close()  # Cierra el workbook y libera recursos
 
 
-def update_excel_with_results(results):
+def excel_path_for(timestamp=None, filepath=EXCEL_FILE, rotation=EXCEL_ROTATION):
+    """
+    Calcula el archivo Excel donde se guardan los resultados de una ejecución.
+    Con rotación mensual cada mes va a su propio archivo, de modo que abrir
+    y reescribir el Excel solo cuesta lo que ocupe el mes en curso y no
+    todo el historial.
+    
+    Args:
+        timestamp (str): Timestamp de la ejecución ('YYYY-MM-DD HH:MM:SS').
+                         Si es None se usa la fecha actual.
+        filepath (str): Ruta base del Excel.
+        rotation (str): 'none' o 'monthly'.
+        
+    Returns:
+        str: Ruta del archivo Excel a actualizar.
+    """
+    if rotation != 'monthly':
+        return filepath
+    
+    # Los 7 primeros caracteres del timestamp son el mes: 'YYYY-MM'
+    month = (timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S'))[:7]
+    base, extension = os.path.splitext(filepath)
+    return f"{base}_{month}{extension}"
+
+
+def existing_excel_files(filepath=EXCEL_FILE):
+    """
+    Archivos Excel de resultados que existen: el archivo único (sin
+    rotación) y los mensuales (<base>_AAAA-MM), en orden cronológico.
+    
+    Args:
+        filepath (str): Ruta base del Excel.
+        
+    Returns:
+        list: Rutas de los archivos existentes.
+    """
+    import glob  # Import diferido: solo para recorrer los archivos mensuales
+    base, extension = os.path.splitext(filepath)
+    monthly = sorted(glob.glob(f"{glob.escape(base)}_[0-9][0-9][0-9][0-9]-[0-9][0-9]{extension}"))
+    return ([filepath] if os.path.exists(filepath) else []) + monthly
+
+
+def update_excel_with_results(results, filepath=None):
     """
     Función auxiliar que encapsula todo el proceso de actualización del Excel.
     Esta es la función principal que se debe usar desde otros módulos.
@@ -130,9 +243,15 @@ def update_excel_with_results(results):
     Args:
         results (list): Lista de diccionarios con los resultados a guardar.
                        Cada diccionario representa una fila con sus columnas.
+        filepath (str): Archivo Excel a actualizar. Si es None se calcula con
+                        excel_path_for según EXCEL_ROTATION.
     """
+    if filepath is None:
+        timestamp = results[0].get('timestamp') if results else None
+        filepath = excel_path_for(timestamp)
+    
     # Crea una instancia del manejador de Excel
-    handler = ExcelHandler()
+    handler = ExcelHandler(filepath)
     
     try:
         # Carga el archivo existente o crea uno nuevo
@@ -150,7 +269,55 @@ def update_excel_with_results(results):
         handler.close()
 
 
+def split_by_month(filepath=EXCEL_FILE):
+    """
+    Migra un Excel sin rotación a la rotación mensual: reparte sus filas
+    (según el mes de su timestamp) en los archivos mensuales que usa
+    excel_path_for. El archivo original no se modifica; una vez revisados
+    los archivos mensuales se puede borrar. Los meses que ya tienen archivo
+    se omiten para no duplicar filas si se repite la migración.
+    
+    Args:
+        filepath (str): Ruta del Excel con todo el historial.
+        
+    Returns:
+        dict: Filas escritas por archivo mensual.
+    """
+    import openpyxl  # Import diferido: para leer el Excel original
+    workbook = openpyxl.load_workbook(filepath, read_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = next(rows, ())
+        # Filas de cada mes como diccionarios encabezado -> valor (sin celdas vacías)
+        months = {}
+        for row in rows:
+            result = {header: value for header, value in zip(headers, row) if header and value is not None}
+            timestamp = str(result.get('timestamp') or '')
+            if timestamp:
+                months.setdefault(timestamp[:7], []).append(result)
+    finally:
+        workbook.close()
+    
+    written = {}
+    for month, results in sorted(months.items()):
+        target = excel_path_for(f"{month}-01", filepath, rotation='monthly')
+        if os.path.exists(target):
+            print(f"Advertencia: {target} ya existe; se omite el mes {month}")
+            continue
+        update_excel_with_results(results, target)
+        written[target] = len(results)
+    return written
+
+
 if __name__ == "__main__":
+    import sys
+    
+    if sys.argv[1:] == ['--split-monthly']:
+        # Migración a la rotación mensual: python src/excel_handler.py --split-monthly
+        for target, count in split_by_month().items():
+            print(f"{target}: {count} filas")
+        sys.exit(0)
+    
     # Código de prueba que se ejecuta solo cuando este archivo
     # se ejecuta directamente (no cuando se importa como módulo)
     
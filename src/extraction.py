@@ -0,0 +1,315 @@
+"""
+Plan de extracción de texto por áreas (search_areas).
+En lugar de ejecutar soup.select() y get_text() una vez por área, el plan:
+1. Compila todos los selectores de la página en una única lista de selectores
+   únicos (separando las listas "h1, h2" y eliminando repetidos entre áreas)
+   e indexa cada uno por la etiqueta, clase o id de su último compuesto.
+2. Recorre el DOM una sola vez: para cada etiqueta solo evalúa los selectores
+   que pueden coincidir con ella, y en el mismo recorrido acumula el texto de
+   los nodos coincidentes. Si un nodo coincidente contiene a otro (p. ej.
+   "article" y ".job-description"), el texto del interior se lee una sola vez
+   y se comparte entre ambos y entre todas las áreas que los usan.
+
+El resultado es el mismo que con soup.select() y get_text() por área: para
+cada área se unen con espacios los textos (en minúsculas) de sus elementos,
+en orden del documento (benchmarks/bench_extraction.py lo comprueba).
+"""
+import functools  # Para reutilizar los planes ya compilados
+import re  # Para reconocer selectores simples
+
+# Compuesto simple: etiqueta opcional seguida de clases e ids (p. ej. "div.row#main")
+_SIMPLE_COMPOUND = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][a-zA-Z_-][\w-]*)*)$')
+
+# Combinadores entre compuestos: descendiente (espacio), hijo, hermano adyacente y general
+_COMBINATOR = re.compile(r'\s*[>+~]\s*|\s+')
+
+# Caracteres que indican atributos, pseudo-clases o escapes (se evalúan con soupsieve)
+_COMPLEX_CHARS = frozenset('[]():"\'\\')
+
+
+def split_selector_list(selector):
+    """
+    Separa una lista de selectores CSS por sus comas de primer nivel.
+    Ignora las comas dentro de paréntesis, corchetes o comillas
+    (p. ej. ":is(h1, h2)" o "[title='a, b']").
+
+    Args:
+        selector (str): Selector CSS, posiblemente con comas ("h1, h2").
+
+    Returns:
+        list: Selectores individuales sin espacios sobrantes.
+    """
+    parts = []
+    current = []
+    depth = 0
+    quote = None
+
+    for char in selector:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
+
+
+def parse_simple_selector(compound):
+    """
+    Descompone un selector compuesto simple (etiqueta, clases e id, sin
+    combinadores, atributos ni pseudo-clases) en sus partes.
+    Ejemplo: "div.row.uvigo-row-nopadding" -> ('div', {'row', 'uvigo-row-nopadding'}, None)
+
+    Args:
+        compound (str): Selector compuesto.
+
+    Returns:
+        tuple: (tag o None, frozenset de clases, id o None), o None si no es simple.
+    """
+    match = _SIMPLE_COMPOUND.match(compound)
+    if not match or not compound:
+        return None
+    tag = match.group('tag')
+    classes = set()
+    element_id = None
+    for token in re.findall(r'[.#][^.#]+', match.group('rest')):
+        if token[0] == '.':
+            classes.add(token[1:])
+        elif element_id is None or element_id == token[1:]:
+            element_id = token[1:]
+        else:
+            return None  # Dos ids distintos: se deja la decisión a soupsieve
+    return (None if tag in (None, '*') else tag.lower(), frozenset(classes), element_id)
+
+
+class _CompiledSelector:
+    """
+    Selector individual del plan, con la información necesaria para
+    decidir rápidamente si una etiqueta puede coincidir con él.
+    """
+
+    def __init__(self, index, selector):
+        self.index = index
+        self.selector = selector
+        self._compiled = None  # Selector de soupsieve (se compila al primer uso)
+        self.last = None  # (tag, clases, id) del último compuesto, si es simple
+        self.is_compound = False  # True si el selector es un único compuesto simple
+
+        if not _COMPLEX_CHARS.intersection(selector):
+            compounds = [part for part in _COMBINATOR.split(selector.strip()) if part]
+            last = parse_simple_selector(compounds[-1]) if compounds else None
+            if last is not None:
+                self.last = last
+                self.is_compound = len(compounds) == 1
+
+    @property
+    def compiled(self):
+        """
+        Selector compilado con soupsieve. Se compila al primer uso, de modo
+        que compilar un plan no importa BeautifulSoup si la página no llega
+        a parsearse (p. ej. servida desde la caché).
+        """
+        if self._compiled is None:
+            import soupsieve  # Motor CSS de BeautifulSoup, para los selectores con combinadores
+            self._compiled = soupsieve.compile(self.selector)
+        return self._compiled
+
+    def last_matches(self, name, classes, element_id):
+        """
+        Comprueba el último compuesto (etiqueta, clases e id) contra una etiqueta.
+        """
+        tag, required_classes, required_id = self.last
+        return (
+            (tag is None or tag == name)
+            and (required_id is None or required_id == element_id)
+            and required_classes.issubset(classes)
+        )
+
+
+class AreaPlan:
+    def __init__(self, search_areas):
+        """
+        Constructor de la clase AreaPlan. Compila los selectores una sola vez.
+
+        Args:
+            search_areas (dict): Áreas configuradas. Formato: {area_name: selector}
+        """
+        self.selectors = []  # Selectores individuales únicos de todas las áreas
+        self.areas = []  # Lista de (area_name, índices de sus selectores)
+
+        index_of = {}
+        for area_name, area_selector in search_areas.items():
+            indexes = []
+            for selector in split_selector_list(area_selector):
+                if selector not in index_of:
+                    index_of[selector] = len(self.selectors)
+                    self.selectors.append(selector)
+                indexes.append(index_of[selector])
+            self.areas.append((area_name, frozenset(indexes)))
+
+        # Índices por id, clase y etiqueta del último compuesto de cada selector.
+        # Los selectores que no se pueden indexar se resuelven con un select() propio
+        self._by_id = {}
+        self._by_class = {}
+        self._by_tag = {}
+        self._any_tag = []
+        self._unindexed = []
+
+        for index, selector in enumerate(self.selectors):
+            compiled = _CompiledSelector(index, selector)
+            if compiled.last is None:
+                self._unindexed.append(compiled)
+                continue
+            tag, classes, element_id = compiled.last
+            if element_id is not None:
+                self._by_id.setdefault(element_id, []).append(compiled)
+            elif classes:
+                # Basta con indexar por una clase: las demás se comprueban después
+                self._by_class.setdefault(min(classes), []).append(compiled)
+            elif tag is not None:
+                self._by_tag.setdefault(tag, []).append(compiled)
+            else:
+                self._any_tag.append(compiled)
+
+    def _candidates(self, tag):
+        """
+        Devuelve los selectores indexados que podrían coincidir con una etiqueta.
+        """
+        candidates = list(self._any_tag)
+        candidates.extend(self._by_tag.get(tag.name, ()))
+        classes = tag.get('class') or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        for class_name in classes:
+            candidates.extend(self._by_class.get(class_name, ()))
+        element_id = tag.get('id')
+        if element_id is not None:
+            candidates.extend(self._by_id.get(element_id, ()))
+        return candidates, frozenset(classes), element_id
+
+    def _walk(self, soup):
+        """
+        Recorre el documento una sola vez, localizando los nodos de cada
+        selector y acumulando su texto.
+
+        Returns:
+            list: Lista de (texto en minúsculas, índices de selectores) por nodo
+                  coincidente, en orden del documento.
+        """
+        from bs4.element import NavigableString, Tag  # Tipos de nodo del árbol de BeautifulSoup
+
+        # Selectores no indexables: un select() de soupsieve cada uno
+        unindexed_ids = [
+            (compiled.index, {id(node) for node in compiled.compiled.select(soup)})
+            for compiled in self._unindexed
+        ]
+
+        matched = []  # (índices, partes de texto) en orden del documento
+        open_nodes = []  # Nodos coincidentes abiertos: (último descendiente, tipos de texto, partes)
+
+        for element in soup.descendants:
+            if isinstance(element, NavigableString):
+                if open_nodes:
+                    element_type = type(element)
+                    for _, types, parts in open_nodes:
+                        # Mismo filtro que get_text(): solo los tipos de texto
+                        # relevantes para el nodo (sin comentarios, ni script/style)
+                        if element_type is types if isinstance(types, type) else element_type in types:
+                            parts.append(element)
+            elif isinstance(element, Tag):
+                candidates, classes, element_id = self._candidates(element)
+                indexes = {
+                    compiled.index
+                    for compiled in candidates
+                    if compiled.last_matches(element.name, classes, element_id)
+                    and (compiled.is_compound or compiled.compiled.match(element))
+                }
+                for index, node_ids in unindexed_ids:
+                    if id(element) in node_ids:
+                        indexes.add(index)
+
+                if indexes:
+                    parts = []
+                    matched.append((frozenset(indexes), parts))
+                    last = element
+                    while isinstance(last, Tag) and last.contents:
+                        last = last.contents[-1]
+                    if last is not element:
+                        open_nodes.append((last, element.interesting_string_types, parts))
+
+            # Cierra los nodos cuyo subárbol termina en este elemento
+            while open_nodes and open_nodes[-1][0] is element:
+                open_nodes.pop()
+
+        return [(''.join(parts).lower(), indexes) for indexes, parts in matched]
+
+    def _select_each_area(self, soup):
+        """
+        Variante para motores sin árbol de BeautifulSoup (selectolax), que
+        seleccionan en C: un select() por área, calculando el texto de cada
+        nodo una sola vez aunque aparezca en varias áreas.
+        """
+        cache = {}
+
+        def text_of(node):
+            key = node._node.mem_id
+            if key not in cache:
+                cache[key] = node.get_text().lower()
+            return cache[key]
+
+        return {
+            area_name: ' '.join(
+                text_of(node)
+                for node in soup.select(', '.join(self.selectors[i] for i in sorted(area_indexes)))
+            )
+            for area_name, area_indexes in self.areas
+        }
+
+    def extract_texts(self, soup):
+        """
+        Obtiene el texto en minúsculas de cada área de la página.
+
+        Args:
+            soup (BeautifulSoup): Documento parseado (o documento compatible).
+
+        Returns:
+            dict: Texto de cada área. Formato: {area_name: text}
+        """
+        from bs4.element import Tag  # Import diferido: solo cuando ya hay una página parseada
+
+        if not isinstance(soup, Tag):
+            return self._select_each_area(soup)
+
+        nodes = self._walk(soup)
+        return {
+            area_name: ' '.join(text for text, indexes in nodes if indexes & area_indexes)
+            for area_name, area_indexes in self.areas
+        }
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_plan(area_items):
+    return AreaPlan(dict(area_items))
+
+
+def get_area_plan(search_areas):
+    """
+    Devuelve el plan de extracción de unas áreas, compilándolo solo la primera vez.
+
+    Args:
+        search_areas (dict): Áreas configuradas. Formato: {area_name: selector}
+
+    Returns:
+        AreaPlan: Plan compilado.
+    """
+    return _cached_plan(tuple(search_areas.items()))
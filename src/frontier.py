@@ -0,0 +1,94 @@
+"""
+Frontera de rastreo para los listados paginados (bloque "pagination" de
+urls_config.json).
+Guarda las páginas pendientes de una fuente y las ya vistas, con las URLs
+normalizadas para no descargar dos veces la misma página escrita de otra
+forma (mayúsculas en el host, puerto por defecto, fragmento #..., orden de
+los parámetros). Solo admite páginas del mismo host que la URL inicial y
+como máximo max_pages en total.
+"""
+from collections import deque  # Cola de páginas pendientes (en orden de descubrimiento)
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode  # Para resolver y normalizar URLs
+
+# Puertos por defecto de cada esquema (se eliminan al normalizar)
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url):
+    """
+    Normaliza una URL para compararla con las ya vistas.
+
+    Args:
+        url (str): URL absoluta.
+
+    Returns:
+        str: URL con esquema y host en minúsculas, sin puerto por defecto,
+             sin fragmento, con ruta '/' si está vacía y parámetros ordenados.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port is not None and parts.port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+
+
+class CrawlFrontier:
+    def __init__(self, start_url, max_pages):
+        """
+        Constructor de la clase CrawlFrontier.
+
+        Args:
+            start_url (str): Primera página del listado (ya descargada).
+            max_pages (int): Máximo de páginas de la fuente, incluida la primera.
+        """
+        self.host = urlsplit(start_url).hostname
+        self.max_pages = max(int(max_pages), 1)
+        self.seen = {normalize_url(start_url)}  # Páginas admitidas (normalizadas)
+        self.pending = deque()  # Páginas admitidas y aún sin descargar
+
+    def add(self, href, base_url):
+        """
+        Añade un enlace a la frontera si es una página nueva del mismo host
+        y no se ha alcanzado max_pages.
+
+        Args:
+            href (str): Enlace tal como aparece en la página (puede ser relativo).
+            base_url (str): URL de la página donde aparece el enlace.
+
+        Returns:
+            bool: True si la página se ha añadido.
+        """
+        if len(self.seen) >= self.max_pages or not href:
+            return False
+        url = urljoin(base_url, href.strip()).split('#', 1)[0]
+        parts = urlsplit(url)
+        if parts.scheme not in _DEFAULT_PORTS or parts.hostname != self.host:
+            return False  # Enlaces a otros sitios, mailto:, javascript:...
+        key = normalize_url(url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.pending.append(url)
+        return True
+
+    def add_all(self, hrefs, base_url):
+        """
+        Añade los enlaces de una página (ver add).
+
+        Returns:
+            int: Número de páginas nuevas.
+        """
+        return sum(1 for href in hrefs if self.add(href, base_url))
+
+    def pop_all(self):
+        """
+        Saca todas las páginas pendientes (se descargan en paralelo).
+
+        Returns:
+            list: URLs pendientes, en orden de descubrimiento.
+        """
+        batch = list(self.pending)
+        self.pending.clear()
+        return batch
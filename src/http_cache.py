@@ -0,0 +1,180 @@
+"""
+Caché persistente de validadores HTTP para peticiones condicionales.
+Guarda en disco, por URL, el ETag, el Last-Modified, el hash del cuerpo
+descargado y el resultado de la última extracción. Así, si el servidor
+responde 304 Not Modified o el contenido no ha cambiado, el scraper
+reutiliza el resultado anterior sin volver a parsear el HTML.
+"""
+import hashlib  # Para calcular el hash del cuerpo y de la configuración
+import json  # Para leer y escribir la caché en disco
+import os  # Para crear directorios y reemplazar el archivo de forma atómica
+import threading  # Para proteger la caché frente a accesos concurrentes
+import time  # Para registrar el último uso de cada entrada
+from config import HTTP_CACHE_FILE, HTTP_CACHE_MAX_ENTRIES  # Ruta y tamaño de la caché
+
+
+def body_hash(content):
+    """
+    Calcula el hash del cuerpo de una respuesta.
+
+    Args:
+        content (bytes): Cuerpo de la respuesta HTTP.
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+def config_hash(config):
+    """
+    Calcula un hash estable de la configuración de una URL.
+    Si la configuración cambia (keywords, áreas...), el resultado
+    guardado deja de ser válido aunque la página no haya cambiado.
+
+    Args:
+        config (dict): Configuración de la URL.
+
+    Returns:
+        str: Hash SHA-1 en hexadecimal.
+    """
+    serialized = json.dumps(config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+
+class ValidatorCache:
+    def __init__(self, filepath=HTTP_CACHE_FILE, max_entries=HTTP_CACHE_MAX_ENTRIES):
+        """
+        Constructor de la clase ValidatorCache.
+
+        Args:
+            filepath (str): Ruta del archivo JSON de la caché.
+            max_entries (int): Número máximo de URLs que se conservan.
+        """
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.hits = 0  # URLs servidas desde la caché en esta ejecución
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """
+        Carga la caché desde disco.
+
+        Returns:
+            dict: Entradas de la caché por URL. Vacío si no existe o está corrupta.
+        """
+        if not os.path.exists(self.filepath):
+            return {}
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            # Una caché dañada no debe impedir la ejecución: se empieza de cero
+            print(f"Advertencia: caché HTTP ignorada ({e})")
+            return {}
+
+    def lookup(self, url, cfg_hash):
+        """
+        Busca la entrada de una URL, solo si se obtuvo con la misma configuración.
+
+        Args:
+            url (str): URL consultada.
+            cfg_hash (str): Hash de la configuración actual de la URL.
+
+        Returns:
+            dict: Entrada de la caché, o None si no existe o no es válida.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and entry.get('config_hash') == cfg_hash:
+            return entry
+        return None
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Construye las cabeceras de petición condicional para una entrada.
+
+        Args:
+            entry (dict): Entrada de la caché (o None).
+
+        Returns:
+            dict: Cabeceras If-None-Match / If-Modified-Since disponibles.
+        """
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, url, etag=None, last_modified=None):
+        """
+        Registra que una URL se ha servido desde la caché y renueva su uso.
+
+        Args:
+            url (str): URL servida desde la caché.
+            etag (str): Nuevo ETag enviado por el servidor (opcional).
+            last_modified (str): Nuevo Last-Modified enviado por el servidor (opcional).
+        """
+        with self._lock:
+            self.hits += 1
+            entry = self._entries.get(url)
+            if entry is None:
+                return
+            entry['last_used'] = time.time()
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+
+    def store(self, url, cfg_hash, content_hash, result, etag=None, last_modified=None):
+        """
+        Guarda los validadores y el resultado de extracción de una URL.
+
+        Args:
+            url (str): URL descargada.
+            cfg_hash (str): Hash de la configuración usada en la extracción.
+            content_hash (str): Hash del cuerpo descargado.
+            result (dict): Campos extraídos (sin timestamp, url ni name).
+            etag (str): Cabecera ETag de la respuesta (opcional).
+            last_modified (str): Cabecera Last-Modified de la respuesta (opcional).
+        """
+        with self._lock:
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body_hash': content_hash,
+                'config_hash': cfg_hash,
+                'result': result,
+                'last_used': time.time(),
+            }
+
+    def save(self):
+        """
+        Guarda la caché en disco, descartando antes las entradas usadas hace
+        más tiempo si se supera max_entries (política LRU).
+        La escritura es atómica para no dejar el archivo a medias.
+        """
+        with self._lock:
+            if len(self._entries) > self.max_entries:
+                # Conserva las entradas usadas más recientemente
+                newest = sorted(
+                    self._entries.items(),
+                    key=lambda item: item[1].get('last_used', 0),
+                    reverse=True,
+                )[:self.max_entries]
+                self._entries = dict(newest)
+            entries = dict(self._entries)
+
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.filepath}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.filepath)
@@ -0,0 +1,242 @@
+"""
+Capa de sesión HTTP compartida para el scraper.
+Este módulo envuelve una única requests.Session con:
+- Pools de conexiones por host con keep-alive (evita un handshake TCP/TLS por URL)
+- Reintentos con backoff exponencial y jitter ante fallos transitorios
+- Respeto de la cabecera Retry-After (acotada para no bloquear la ejecución)
+- Estadísticas de reutilización de conexiones por host
+- Tiempos de cada conexión nueva (resolución DNS, conexión TCP y handshake
+  TLS) y de las esperas entre reintentos, separados del resto de la
+  petición (ver connection_timings)
+
+La medición de la conexión usa atributos internos de urllib3 2.x (_dns_host,
+_new_conn); si una versión no los tiene, las peticiones siguen funcionando
+y solo se pierden esas fases.
+"""
+import socket  # Para resolver el host por separado de la conexión
+import threading  # Los tiempos de conexión se anotan por hilo
+import time  # Para medir las fases de la conexión
+import requests  # Para realizar peticiones HTTP
+from requests.adapters import HTTPAdapter  # Adaptador con pool de conexiones
+from urllib3.connection import HTTPConnection, HTTPSConnection  # Conexiones que se instrumentan
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool  # Pools que las crean
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family  # Familias de direcciones (IPv4/IPv6) admitidas
+from urllib3.util.retry import Retry  # Política de reintentos de urllib3
+from config import (
+    REQUEST_TIMEOUT,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_RETRIES,
+    HTTP_BACKOFF_FACTOR,
+    HTTP_BACKOFF_JITTER,
+    HTTP_RETRY_STATUS,
+    HTTP_RETRY_AFTER_MAX,
+)
+
+
+class _BoundedRetry(Retry):
+    """
+    Política de reintentos que limita la espera indicada por Retry-After,
+    para que un servidor no pueda dejar parado al scraper durante horas.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, HTTP_RETRY_AFTER_MAX)
+
+    def sleep(self, response=None):
+        # Espera de backoff o Retry-After antes de reintentar: fase propia
+        start = time.perf_counter()
+        try:
+            super().sleep(response)
+        finally:
+            _record('backoff', time.perf_counter() - start)
+
+
+# Tiempos de conexión de la petición en curso en cada hilo
+_timings = threading.local()
+
+
+def _record(phase, seconds):
+    """
+    Suma el tiempo de una fase de conexión a la petición en curso del hilo.
+    """
+    timings = getattr(_timings, 'current', None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+class _TimedConnectionMixin:
+    """
+    Conexión de urllib3 que mide por separado la resolución DNS y la
+    conexión TCP. El host se resuelve una vez y se prueba cada dirección
+    (como hace urllib3), conectando ya a la IP para no resolver dos veces.
+    """
+    _socket_seconds = None  # DNS + TCP de la última conexión (para separar el TLS)
+
+    def _new_conn(self):
+        if not hasattr(self, '_dns_host'):
+            # Otra versión de urllib3: se conecta sin medir las fases
+            self._socket_seconds = None
+            return super()._new_conn()
+        start = time.perf_counter()
+        try:
+            addresses = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+
+        host = self._dns_host
+        try:
+            error = None
+            for ip in dict.fromkeys(address[4][0] for address in addresses):
+                self._dns_host = ip
+                try:
+                    return super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+            raise error
+        finally:
+            self._dns_host = host
+            end = time.perf_counter()
+            self._socket_seconds = end - start
+            _record('dns', resolved - start)
+            _record('connect', end - resolved)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        # connect() abre el socket (_new_conn) y después hace el handshake TLS
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            if self._socket_seconds is not None:
+                _record('tls', max(time.perf_counter() - start - self._socket_seconds, 0.0))
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedHTTPAdapter(HTTPAdapter):
+    """
+    Adaptador cuyos pools crean conexiones instrumentadas.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class PooledSession:
+    def __init__(self, headers=None, retries=HTTP_RETRIES, pool_maxsize=HTTP_POOL_MAXSIZE):
+        """
+        Constructor de la clase PooledSession.
+
+        Args:
+            headers (dict): Cabeceras que se envían en todas las peticiones.
+            retries (int): Número de reintentos ante errores transitorios.
+            pool_maxsize (int): Conexiones keep-alive que se conservan por host.
+        """
+        self.session = requests.Session()
+        if headers:
+            self.session.headers.update(headers)
+
+        # Reintenta errores de conexión, lectura y códigos transitorios.
+        # raise_on_status=False devuelve la última respuesta para que
+        # raise_for_status() genere el error habitual tras agotar los reintentos
+        retry = _BoundedRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            backoff_jitter=HTTP_BACKOFF_JITTER,
+            status_forcelist=HTTP_RETRY_STATUS,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+
+        # Un único adaptador mantiene un pool de conexiones por host
+        self.adapter = _TimedHTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+    def get(self, url, **kwargs):
+        """
+        Realiza una petición GET reutilizando las conexiones del pool.
+
+        Args:
+            url (str): URL a consultar.
+            **kwargs: Argumentos adicionales para requests.Session.get.
+
+        Returns:
+            requests.Response: Respuesta HTTP (tras los reintentos necesarios).
+        """
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        _timings.current = {}
+        return self.session.get(url, **kwargs)
+
+    @staticmethod
+    def connection_timings():
+        """
+        Tiempos de conexión de la última petición del hilo que llama.
+        Solo aparecen las fases que hubo: una petición servida por una
+        conexión keep-alive ya abierta no tiene ninguna. Si hubo reintentos
+        con conexiones nuevas, los tiempos se suman.
+
+        Returns:
+            dict: Segundos por fase ('dns', 'connect' y, en HTTPS, 'tls'; 'backoff'
+                  con la espera total entre reintentos).
+        """
+        return dict(getattr(_timings, 'current', None) or {})
+
+    def pool_stats(self):
+        """
+        Calcula las estadísticas de reutilización de conexiones por host.
+        Un "hit" es una petición servida por una conexión ya abierta;
+        un "miss" es una petición que tuvo que abrir una conexión nueva.
+
+        Returns:
+            dict: {host: {'requests': int, 'hits': int, 'misses': int}}
+        """
+        stats = {}
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{key.key_host}:{key.key_port}" if key.key_port else key.key_host
+            misses = pool.num_connections
+            stats[host] = {
+                'requests': pool.num_requests,
+                'hits': max(pool.num_requests - misses, 0),
+                'misses': misses,
+            }
+        return stats
+
+    def close(self):
+        """
+        Cierra la sesión y todas las conexiones abiertas del pool.
+        """
+        self.session.close()
@@ -0,0 +1,199 @@
+"""
+Conteo de múltiples palabras clave en una sola pasada.
+Este módulo compila una lista de keywords en un autómata multi-patrón:
+un trie de keywords que se traduce a una única expresión regular. El motor
+de expresiones regulares (en C) recorre el texto una vez buscando el
+siguiente punto donde empieza alguna keyword, y el trie enumera todas las
+keywords que coinciden a partir de ese punto (incluidas las solapadas,
+como "psicolog" dentro de "psicología").
+
+El conteo respeta la semántica de str.count(): ocurrencias no solapadas
+de cada keyword, de izquierda a derecha. Opcionalmente permite:
+- whole_word: contar solo palabras completas
+- accent_insensitive: ignorar tildes y diacríticos ("psicologia" == "psicología")
+"""
+import functools  # Para reutilizar los autómatas ya compilados
+import re  # Para compilar el trie como expresión regular
+import unicodedata  # Para eliminar tildes en el modo accent_insensitive
+from config import KEYWORD_AUTOMATON_THRESHOLD  # Número de keywords a partir del cual usar el autómata
+
+# Marcas diacríticas combinables que quedan tras la normalización NFD
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+
+# Clave del trie que marca el final de una keyword
+_END = ''
+
+
+def strip_accents(text):
+    """
+    Elimina tildes y diacríticos de un texto ("Psicoloxía" -> "Psicoloxia").
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        str: Texto sin diacríticos.
+    """
+    return _COMBINING_MARKS.sub('', unicodedata.normalize('NFD', text))
+
+
+def _is_word_char(char):
+    """
+    Indica si un carácter forma parte de una palabra (letra, dígito o '_').
+    """
+    return char.isalnum() or char == '_'
+
+
+def _trie_to_regex(node):
+    """
+    Convierte un nodo del trie en una expresión regular equivalente.
+    Los prefijos comunes se factorizan, de modo que el motor de regex
+    no prueba cada keyword por separado en cada posición del texto.
+    """
+    ends_here = _END in node
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char != _END
+    ]
+    if not branches:
+        return ''
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    group = '(?:' + '|'.join(branches) + ')'
+    return group + '?' if ends_here else group
+
+
+class KeywordMatcher:
+    def __init__(self, keywords, whole_word=False, accent_insensitive=False):
+        """
+        Constructor de la clase KeywordMatcher. Compila el autómata una sola vez.
+
+        Args:
+            keywords (list): Palabras clave a contar.
+            whole_word (bool): Si es True, solo cuenta palabras completas.
+            accent_insensitive (bool): Si es True, ignora tildes y diacríticos.
+        """
+        self.keywords = list(keywords)
+        self.whole_word = whole_word
+        self.accent_insensitive = accent_insensitive
+
+        # Patrón normalizado (minúsculas y, opcionalmente, sin tildes) de cada keyword
+        self._patterns = {keyword: self.normalize(keyword.lower()) for keyword in self.keywords}
+        unique_patterns = sorted({pattern for pattern in self._patterns.values() if pattern})
+
+        # Con pocas keywords, str.count() en C es más rápido que recorrer el autómata
+        self.uses_automaton = whole_word or len(unique_patterns) >= KEYWORD_AUTOMATON_THRESHOLD
+        self._unique_patterns = unique_patterns
+        self._trie = {}
+        self._regex = None
+
+        if self.uses_automaton and unique_patterns:
+            for pattern in unique_patterns:
+                node = self._trie
+                for char in pattern:
+                    node = node.setdefault(char, {})
+                node[_END] = pattern
+            self._regex = re.compile(_trie_to_regex(self._trie))
+
+    def normalize(self, text):
+        """
+        Aplica al texto la misma normalización que a las keywords.
+
+        Args:
+            text (str): Texto en minúsculas.
+
+        Returns:
+            str: Texto normalizado.
+        """
+        return strip_accents(text) if self.accent_insensitive else text
+
+    def count(self, text):
+        """
+        Cuenta todas las keywords en el texto.
+
+        Args:
+            text (str): Texto donde buscar, ya en minúsculas.
+
+        Returns:
+            dict: Conteo de cada keyword. Formato: {keyword: count}
+        """
+        text = self.normalize(text)
+
+        if self.uses_automaton:
+            pattern_counts = self._scan(text)
+        else:
+            pattern_counts = {pattern: text.count(pattern) for pattern in self._unique_patterns}
+
+        return {
+            keyword: pattern_counts.get(pattern, 0)
+            for keyword, pattern in self._patterns.items()
+        }
+
+    def _scan(self, text):
+        """
+        Recorre el texto una sola vez contando todas las keywords del autómata.
+        """
+        counts = dict.fromkeys(self._unique_patterns, 0)
+        if self._regex is None:
+            return counts
+
+        # Posición a partir de la cual puede empezar la siguiente ocurrencia
+        # no solapada de cada keyword (semántica de str.count)
+        next_free = dict.fromkeys(self._unique_patterns, 0)
+        length = len(text)
+        search = self._regex.search
+        pos = 0
+
+        while True:
+            match = search(text, pos)
+            if match is None:
+                break
+            start, end = match.span()
+
+            # Toda keyword que empiece dentro de la coincidencia se encuentra
+            # recorriendo el trie desde cada posición del tramo
+            for begin in range(start, end):
+                node = self._trie
+                index = begin
+                while index < length:
+                    node = node.get(text[index])
+                    if node is None:
+                        break
+                    index += 1
+                    pattern = node.get(_END)
+                    if pattern is None or begin < next_free[pattern]:
+                        continue
+                    if self.whole_word and (
+                        (begin > 0 and _is_word_char(text[begin - 1]))
+                        or (index < length and _is_word_char(text[index]))
+                    ):
+                        continue
+                    counts[pattern] += 1
+                    next_free[pattern] = index
+
+            pos = end
+
+        return counts
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_matcher(keywords, whole_word, accent_insensitive):
+    return KeywordMatcher(keywords, whole_word, accent_insensitive)
+
+
+def get_matcher(keywords, whole_word=False, accent_insensitive=False):
+    """
+    Devuelve el autómata para una lista de keywords, compilándolo solo la
+    primera vez. Así se reutiliza entre áreas de una misma URL y entre
+    ejecuciones dentro del mismo proceso.
+
+    Args:
+        keywords (list): Palabras clave a contar.
+        whole_word (bool): Si es True, solo cuenta palabras completas.
+        accent_insensitive (bool): Si es True, ignora tildes y diacríticos.
+
+    Returns:
+        KeywordMatcher: Autómata compilado.
+    """
+    return _cached_matcher(tuple(keywords), bool(whole_word), bool(accent_insensitive))
@@ -2,27 +2,61 @@
 Script principal que ejecuta el scraper completo.
 Este es el punto de entrada de la aplicación que orquesta todo el proceso:
 1. Ejecuta el scraping de todas las URLs configuradas
-2. Guarda los resultados en Excel
-3. Envía notificaciones de Telegram
+2. Separa las ofertas nuevas y detecta los cambios respecto a la ejecución anterior
+3. Guarda los resultados en Excel y/o en la base de datos SQLite
+4. Envía notificaciones de Telegram
+
+Cada fase (y cada URL dentro del scraping) se mide con metrics.RunMetrics:
+al terminar se muestra una tabla de tiempos y se añaden las métricas a
+METRICS_FILE. Con SCRAPER_PROFILE se perfila además la ejecución completa.
+
+Los módulos pesados (requests, bs4, openpyxl...) se importan solo cuando
+su fase se ejecuta: p. ej. openpyxl solo si hay filas que escribir en el
+Excel. benchmarks/check_startup.py vigila el tiempo de arranque.
+
+Uso (desde la raíz del repositorio):
+    python src/main.py                          # Ejecución completa
+    python src/main.py --dry-run                # Scraping y cambios, sin guardar ni notificar
+    python src/main.py --check-config           # Solo valida urls_config.json
+    python src/main.py --urls-config otra.json  # Otro archivo de URLs
+    python src/main.py --shard 1/4              # Un shard de 4 (ver sharding.py)
+    python src/main.py --merge                  # Combina los shards, guarda y notifica
+    python src/main.py --shards 4               # 4 shards como procesos locales y la combinación
 """
-# Importaciones necesarias
+# Importaciones necesarias (solo las ligeras; el resto se importa en cada fase)
+import os  # Para eliminar los parciales ya combinados
 from datetime import datetime  # Para generar timestamps de ejecución
-from scraper import WebScraper  # Clase principal del scraper
-from excel_handler import update_excel_with_results  # Función para guardar en Excel
-from notifier import TelegramNotifier  # Clase para enviar notificaciones
+from config import RESULTS_STORE, CHANGES_ONLY, PROFILE  # Dónde se guardan los resultados, si solo los cambios y perfilado
+from metrics import RunMetrics, profiling  # Tiempos por etapa y perfilado opcional
 
 
-def main():
+def main(dry_run=False, urls_config=None, shard=None, merge=False):
     """
     Función principal que orquesta todo el proceso de scraping.
     Maneja la ejecución completa desde el inicio hasta el final,
     incluyendo manejo de errores y notificaciones.
+
+    Args:
+        dry_run (bool): Solo scraping y detección de cambios: no guarda
+                        resultados ni estado y no envía notificaciones.
+        urls_config (str): Archivo de URLs a usar en lugar de URLS_CONFIG.
+        shard (tuple): (i, N): solo scrapea las URLs del shard i de N y
+                       guarda un resultado parcial (ver sharding.py).
+        merge (bool): En lugar de scrapear, combina los parciales de los
+                      shards y continúa con el guardado y la notificación.
     """
+    from notifier import TelegramNotifier  # Clase para enviar notificaciones
+    
     # Genera el timestamp de ejecución en formato YYYY-MM-DD HH:MM:SS
     timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     # Crea una instancia del notificador para enviar mensajes
-    notifier = TelegramNotifier()
+    # (en modo de prueba queda sin credenciales: no se envía nada)
+    notifier = TelegramNotifier(bot_token=None, chat_id=None) if dry_run else TelegramNotifier()
+    
+    # Métricas de la ejecución (compartidas con el scraper)
+    metrics = RunMetrics(timestamp)
+    seen_index = None  # Índice de ofertas vistas (se abre tras el scraping)
     
     try:
         # ============ Inicio del proceso ============
@@ -31,11 +65,48 @@ def main():
         print("=" * 50)
         
         # ============ Fase 1: Ejecutar scraper ============
-        # Crea una instancia del scraper con la configuración cargada
-        scraper = WebScraper()
-        
-        # Ejecuta el scraping de todas las URLs configuradas
-        results = scraper.scrape_all()
+        if merge:
+            # Combinación: los resultados vienen de los parciales de cada shard
+            from sharding import read_partials
+            with metrics.stage('merge'):
+                timestamp, results, records, partial_paths = read_partials()
+            metrics.timestamp = timestamp  # Las métricas se anotan con el timestamp de la ejecución
+            metrics.extend(records)
+            print(f"Combinados {len(results)} resultado(s) de {len(partial_paths)} shard(s) - {timestamp}")
+        else:
+            from scraper import WebScraper  # Clase principal del scraper
+            
+            # Crea una instancia del scraper con la configuración cargada
+            if urls_config:
+                from urls_config import load_urls_config
+                scraper = WebScraper(urls_config=load_urls_config(urls_config), metrics=metrics)
+            else:
+                scraper = WebScraper(metrics=metrics)
+            
+            if shard:
+                # Solo las URLs de este shard, con su propia caché HTTP
+                from sharding import select_shard, config_signature, shard_file
+                from http_cache import ValidatorCache
+                from config import HTTP_CACHE_FILE
+                index, count = shard
+                signature = config_signature(scraper.urls_config)
+                selected = select_shard(scraper.urls_config, index, count)
+                scraper.urls_config = [config for _, config in selected]
+                if scraper.cache is not None:
+                    scraper.cache = ValidatorCache(shard_file(HTTP_CACHE_FILE, index, count))
+                print(f"Shard {index}/{count}: {len(selected)} URL(s)")
+            
+            # Ejecuta el scraping de todas las URLs configuradas
+            with metrics.stage('scrape'):
+                results = scraper.scrape_all()
+            
+            if shard:
+                # El guardado y la notificación se hacen al combinar los shards
+                from sharding import write_partial
+                path = write_partial(index, count, timestamp, signature,
+                                     [position for position, _ in selected], results, list(metrics.records))
+                print(f"\nResultados parciales guardados en {path}")
+                return
         
         # Verifica que se obtuvieron resultados
         if not results:
@@ -43,15 +114,69 @@ def main():
         
         print(f"\nResultados obtenidos: {len(results)}")
         
-        # ============ Fase 2: Guardar en Excel ============
-        print("\nActualizando Excel...")
-        # Guarda todos los resultados en el archivo Excel
-        update_excel_with_results(results)
+        # ============ Fase 2: Ofertas nuevas y cambios ============
+        # Las ofertas de cada fuente se comparan con el índice de ofertas ya
+        # vistas (y se retiran de los resultados antes de calcular su huella)
+        from seen_offers import SeenOffersIndex  # Índice persistente de ofertas vistas
+        with metrics.stage('offers'):
+            seen_index = SeenOffersIndex()
+            new_offers = seen_index.diff(results)
+        print(f"Ofertas nuevas: {len(new_offers)}")
+        
+        # Compara cada fuente con su último resultado (huella de sus métricas)
+        from change_detector import ChangeDetector  # Detección de cambios respecto a la ejecución anterior
+        with metrics.stage('changes'):
+            detector = ChangeDetector()
+            changed_results, changes = detector.diff(results)
+        print(f"Cambios detectados: {len(changes)} de {len(results)} fuente(s)")
+        
+        if dry_run:
+            # Modo de prueba: sin guardar resultados ni estado y sin notificar
+            for change in changes:
+                print(f"  - {change['name']}: {change['kind']}")
+            for offer in new_offers:
+                print(f"  + {offer['name']}: {offer['title']} {offer['link'] or ''}".rstrip())
+            print("\nModo de prueba: no se guardan resultados ni se envían notificaciones")
+            return
+        
+        # Con CHANGES_ONLY solo se guardan las fuentes que han cambiado
+        to_store = changed_results if CHANGES_ONLY else results
+        
+        # ============ Fase 3: Guardar resultados ============
+        if (to_store or new_offers) and RESULTS_STORE in ('sqlite', 'both'):
+            print("\nGuardando en la base de datos...")
+            # Inserta los resultados en el almacén SQLite (índices por fecha, fuente y métrica)
+            from results_store import save_results  # Función para guardar en la base de datos
+            with metrics.stage('store_sqlite'):
+                save_results(to_store, offers=new_offers)
         
-        # ============ Fase 3: Enviar notificación ============
+        if to_store and RESULTS_STORE in ('excel', 'both'):
+            print("\nActualizando Excel...")
+            # Guarda los resultados en el archivo Excel
+            from excel_handler import update_excel_with_results  # Función para guardar en Excel (openpyxl)
+            with metrics.stage('store_excel'):
+                update_excel_with_results(to_store)
+        
+        # El estado solo se actualiza cuando los resultados ya están guardados
+        with metrics.stage('state'):
+            detector.save()
+            seen_index.save()
+        
+        if merge:
+            # Los parciales ya están guardados: se eliminan para no combinarlos dos veces
+            for path in partial_paths:
+                os.remove(path)
+        
+        # ============ Fase 4: Enviar notificación ============
         print("\nEnviando notificación...")
-        # Envía un resumen con estadísticas a Telegram
-        notifier.send_summary(results, timestamp)
+        with metrics.stage('notify'):
+            if CHANGES_ONLY:
+                # Solo los cambios: nada si ninguna fuente ha cambiado
+                notifier.send_changes(changes, results, timestamp)
+            else:
+                # Envía un resumen con estadísticas a Telegram
+                notifier.send_summary(results, timestamp)
+            notifier.send_new_offers(new_offers, timestamp)
         
         # ============ Finalización exitosa ============
         print("\n" + "=" * 50)
@@ -64,15 +189,83 @@ def main():
         error_msg = str(e) 
         print(f"\n❌ ERROR: {error_msg}")
         
-        # Envía notificación de error a Telegram
-        notifier.send_error(error_msg, timestamp)
+        if shard:
+            # Un shard no notifica: deja el error para la combinación, que
+            # envía un único aviso aunque fallen varios shards
+            from sharding import write_failure
+            write_failure(*shard, timestamp, error_msg)
+        else:
+            # Envía notificación de error a Telegram
+            notifier.send_error(error_msg, timestamp)
         
         # Re-lanza la excepción para que GitHub Actions marque el workflow como fallido
         # Esto es importante para el monitoreo y debugging
         raise
+    
+    finally:
+        if seen_index is not None:
+            seen_index.close()
+        
+        # Las notificaciones se envían en segundo plano: espera a que se entreguen
+        with metrics.stage('notify_flush'):
+            notifier.close()
+        
+        # Tabla de tiempos por etapa y métricas en formato JSON lines
+        print("\nMétricas de la ejecución:")
+        metrics.print_summary()
+        if not shard:
+            # Las métricas de cada shard van en su parcial y se escriben al combinar
+            metrics.write()
 
 
 if __name__ == "__main__":
     # Punto de entrada cuando el script se ejecuta directamente
     # (no cuando se importa como módulo)
-    main()
\ No newline at end of file
+    import argparse
+    
+    arg_parser = argparse.ArgumentParser(description="Scraper de ofertas de empleo")
+    arg_parser.add_argument('--dry-run', action='store_true',
+                            help="Scraping y detección de cambios, sin guardar ni notificar")
+    arg_parser.add_argument('--urls-config', metavar='PATH', help="Archivo de URLs (por defecto URLS_CONFIG)")
+    arg_parser.add_argument('--check-config', action='store_true',
+                            help="Valida el archivo de URLs y termina (sin scraping)")
+    arg_parser.add_argument('--profile', metavar='MODOS', default=PROFILE,
+                            help="Perfila la ejecución: cprofile, tracemalloc o ambos separados por comas "
+                                 "(por defecto SCRAPER_PROFILE)")
+    shard_group = arg_parser.add_mutually_exclusive_group()
+    shard_group.add_argument('--shard', metavar='i/N',
+                             help="Solo scrapea el shard i de N y guarda un resultado parcial")
+    shard_group.add_argument('--merge', action='store_true',
+                             help="Combina los parciales de los shards, guarda y notifica")
+    shard_group.add_argument('--shards', type=int, metavar='N',
+                             help="Ejecuta N shards como procesos locales y los combina")
+    args = arg_parser.parse_args()
+    
+    shard = None
+    if args.shard:
+        from sharding import parse_shard
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            arg_parser.error(str(e))
+    
+    if args.check_config:
+        from config import URLS_CONFIG
+        from urls_config import load_urls_config
+        path = args.urls_config or URLS_CONFIG
+        urls = load_urls_config(path, cache_path='')  # Siempre valida (sin la copia guardada)
+        print(f"{len(urls)} URL(s) válidas en {path}")
+        raise SystemExit(0 if urls else 1)
+    
+    if args.shards:
+        # Shards locales: N procesos en paralelo y después la combinación en este
+        from sharding import run_local
+        extra_args = ('--urls-config', args.urls_config) if args.urls_config else ()
+        failed = run_local(args.shards, extra_args)
+        if failed:
+            # La combinación falla con los errores de los shards y los notifica una sola vez
+            print(f"Han fallado los shards: {', '.join(map(str, failed))} (ver los .log)")
+    
+    with profiling(args.profile):
+        main(dry_run=args.dry_run, urls_config=args.urls_config, shard=shard,
+             merge=args.merge or bool(args.shards))
\ No newline at end of file
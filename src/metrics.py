@@ -0,0 +1,220 @@
+"""
+Instrumentación de cada ejecución.
+Registra, por URL y por etapa, el tiempo de reloj y los datos propios de la
+etapa (bytes descargados, nodos del documento parseado...), junto con el
+pico de memoria (RSS) del proceso al terminarla:
+
+- Por URL: wait (rate limiting); dns, connect y tls (solo cuando la
+  petición abre una conexión nueva; con keep-alive no aparecen); backoff
+  (solo si hubo reintentos: esperas de backoff y Retry-After, con el número
+  de reintentos); request (envío y espera hasta las cabeceras de todos los
+  intentos, sin la conexión ni las esperas); download (lectura del cuerpo),
+  parse y extract
+- Por ejecución: scrape, changes, store_sqlite, store_excel, notify...
+
+Los registros se añaden en formato JSON lines a METRICS_FILE (una línea por
+etapa, con el timestamp de la ejecución) y se resumen en una tabla por
+consola. Cuando el archivo supera METRICS_MAX_BYTES se rota a
+METRICS_FILE.1 (se conserva solo la generación anterior), de modo que no
+crece sin límite. Con --profile (o SCRAPER_PROFILE) cprofile y/o
+tracemalloc se perfila además la ejecución completa (ver profiling).
+"""
+import json  # Para escribir los registros en formato JSON lines
+import os  # Para crear el directorio del archivo de métricas
+import sys  # Para conocer la unidad de ru_maxrss según la plataforma
+import threading  # Los hilos de descarga registran en paralelo
+import time  # Para medir tiempos de reloj
+from contextlib import contextmanager  # Para medir etapas con un bloque with
+from config import METRICS_FILE, METRICS_MAX_BYTES, PROFILE, PROFILE_FILE  # Destino de las métricas y perfilado
+
+
+def peak_rss_mb():
+    """
+    Devuelve el pico de memoria residente (RSS) del proceso en MB.
+
+    Returns:
+        float: Pico de RSS en MB, o None si la plataforma no lo permite (Windows).
+    """
+    try:
+        import resource  # Solo disponible en sistemas Unix
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en bytes en macOS y en KB en Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+class RunMetrics:
+    def __init__(self, timestamp=None):
+        """
+        Constructor de la clase RunMetrics.
+
+        Args:
+            timestamp (str): Timestamp de la ejecución (se añade a cada registro).
+        """
+        self.timestamp = timestamp
+        self.records = []  # Un diccionario por etapa medida
+        self._lock = threading.Lock()  # Protege records frente a los hilos de descarga
+
+    def add(self, stage, seconds, name=None, **fields):
+        """
+        Añade el registro de una etapa.
+
+        Args:
+            stage (str): Etapa (p. ej. 'download' o 'store_excel').
+            seconds (float): Tiempo de reloj de la etapa.
+            name (str): Fuente a la que pertenece (None = etapa de la ejecución).
+            **fields: Datos propios de la etapa (bytes, nodes...).
+        """
+        record = {'stage': stage, 'name': name, 'seconds': round(seconds, 6), **fields}
+        record['peak_rss_mb'] = peak_rss_mb()
+        with self._lock:
+            self.records.append(record)
+
+    @contextmanager
+    def stage(self, stage, name=None):
+        """
+        Mide el tiempo de un bloque with. El diccionario devuelto recoge los
+        datos que el bloque quiera añadir al registro.
+
+        Ejemplo:
+            with metrics.stage('download', 'UVigo') as fields:
+                fields['bytes'] = len(content)
+        """
+        fields = {}
+        start = time.perf_counter()
+        try:
+            yield fields
+        finally:
+            self.add(stage, time.perf_counter() - start, name, **fields)
+
+    def extend(self, records):
+        """
+        Añade registros tomados en otro proceso (workers de parseo).
+        """
+        with self._lock:
+            self.records.extend(records)
+
+    def drain(self):
+        """
+        Devuelve y vacía los registros acumulados.
+        """
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+    def write(self, filepath=METRICS_FILE, max_bytes=METRICS_MAX_BYTES):
+        """
+        Añade los registros al archivo JSON lines (uno por línea). Si el
+        archivo ya ocupa max_bytes, antes se rota a <filepath>.1
+        (sustituyendo la generación anterior).
+
+        Args:
+            filepath (str): Archivo de métricas. Vacío = no se escribe.
+            max_bytes (int): Tamaño a partir del que se rota (0 = sin límite).
+        """
+        if not filepath or not self.records:
+            return
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+        if max_bytes and os.path.exists(filepath) and os.path.getsize(filepath) >= max_bytes:
+            os.replace(filepath, f"{filepath}.1")
+        with open(filepath, 'a', encoding='utf-8') as f:
+            for record in self.records:
+                f.write(json.dumps({'timestamp': self.timestamp, **record}, ensure_ascii=False) + '\n')
+        print(f"Métricas guardadas en {filepath} ({len(self.records)} registros)")
+
+    def summary(self):
+        """
+        Agrega los registros por etapa, en el orden en que aparecen.
+
+        Returns:
+            dict: etapa -> {'count', 'total', 'max', 'bytes', 'nodes'}.
+        """
+        stages = {}
+        for record in self.records:
+            stats = stages.setdefault(record['stage'], {'count': 0, 'total': 0.0, 'max': 0.0, 'bytes': 0, 'nodes': 0})
+            stats['count'] += 1
+            stats['total'] += record['seconds']
+            stats['max'] = max(stats['max'], record['seconds'])
+            stats['bytes'] += record.get('bytes') or 0
+            stats['nodes'] += record.get('nodes') or 0
+        return stages
+
+    def print_summary(self, slowest=5):
+        """
+        Muestra una tabla con el tiempo por etapa y las fuentes más lentas.
+
+        Args:
+            slowest (int): Número de fuentes más lentas a mostrar.
+        """
+        stages = self.summary()
+        if not stages:
+            return
+
+        print(f"{'Etapa':<14}{'N':>6}{'Total (s)':>12}{'Media (ms)':>12}{'Máx (ms)':>12}  Datos")
+        for stage, stats in stages.items():
+            extra = []
+            if stats['bytes']:
+                extra.append(f"{stats['bytes'] / 1024:.1f} KB")
+            if stats['nodes']:
+                extra.append(f"{stats['nodes']} nodos")
+            print(f"{stage:<14}{stats['count']:>6}{stats['total']:>12.3f}"
+                  f"{stats['total'] / stats['count'] * 1000:>12.1f}{stats['max'] * 1000:>12.1f}  {', '.join(extra)}")
+
+        # Tiempo acumulado por fuente (suma de sus etapas)
+        per_source = {}
+        for record in self.records:
+            if record['name'] is not None:
+                per_source[record['name']] = per_source.get(record['name'], 0.0) + record['seconds']
+        if per_source:
+            print("Fuentes más lentas:")
+            for name, seconds in sorted(per_source.items(), key=lambda item: item[1], reverse=True)[:slowest]:
+                print(f"  {name}: {seconds * 1000:.1f} ms")
+
+        peaks = [record['peak_rss_mb'] for record in self.records if record.get('peak_rss_mb')]
+        if peaks:
+            print(f"Pico de memoria (RSS): {max(peaks):.1f} MB")
+
+
+@contextmanager
+def profiling(modes=PROFILE, filepath=PROFILE_FILE, top=20):
+    """
+    Perfila el bloque with con cProfile y/o tracemalloc.
+
+    Args:
+        modes (str): Perfiladores separados por comas ('cprofile', 'tracemalloc').
+                     Vacío = sin perfilado.
+        filepath (str): Archivo donde se guardan las estadísticas de cProfile
+                        (se pueden abrir con pstats o snakeviz).
+        top (int): Número de entradas a mostrar de cada perfilador.
+    """
+    modes = {mode.strip().lower() for mode in (modes or '').split(',') if mode.strip()}
+    profiler = None
+
+    if 'tracemalloc' in modes:
+        import tracemalloc  # Import diferido: solo al perfilar
+        tracemalloc.start()
+    if 'cprofile' in modes:
+        import cProfile  # Import diferido: solo al perfilar
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            import pstats
+            profiler.disable()
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            profiler.dump_stats(filepath)
+            print(f"\nPerfil de cProfile guardado en {filepath}. Funciones con más tiempo acumulado:")
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+
+        if 'tracemalloc' in modes:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"\ntracemalloc: memoria actual {current / 1024 / 1024:.1f} MB, pico {peak / 1024 / 1024:.1f} MB")
+            print("Líneas con más memoria asignada:")
+            for stat in snapshot.statistics('lineno')[:top]:
+                print(f"  {stat}")
@@ -2,65 +2,339 @@
 Sistema de notificaciones por Telegram.
 Este módulo gestiona el envío de notificaciones al usuario a través de Telegram,
 incluyendo notificaciones de éxito, error y resúmenes detallados.
+
+El envío es asíncrono y no bloquea el scraper: los mensajes se encolan y un
+hilo en segundo plano los entrega con python-telegram-bot (una sola conexión
+HTTP reutilizada). Los mensajes encolados casi a la vez se agrupan, se
+trocean respetando el límite de 4096 caracteres de Telegram y se envían
+con un intervalo mínimo entre ellos, esperando lo que indique Telegram
+(retry_after) si responde 429. La URL de la API es configurable
+(TELEGRAM_API_URL) para poder probarlo contra un servidor local.
 """
-import requests  # Para realizar peticiones HTTP a la API de Telegram
-from config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID  # Credenciales de Telegram
+import html  # Para escapar los textos dentro de mensajes con formato HTML
+import queue  # Cola de mensajes entre el scraper y el hilo de envío
+import re  # Para trocear las líneas largas sin cortar etiquetas HTML
+import threading  # Hilo de envío en segundo plano
+import time  # Para respetar el intervalo mínimo entre mensajes
+from config import (  # Credenciales y parámetros de envío de Telegram
+    TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, TELEGRAM_API_URL, TELEGRAM_MAX_LENGTH,
+    TELEGRAM_MIN_INTERVAL, TELEGRAM_COALESCE_DELAY, TELEGRAM_MAX_RETRIES, TELEGRAM_FLUSH_TIMEOUT
+)
+
+# Marca de fin para el hilo de envío
+_STOP = object()
+
+
+# Piezas de una línea con formato HTML: etiqueta, entidad (&amp;), espacios, palabra u otro carácter
+_HTML_TOKEN = re.compile(r'<[^<>]*>|&#?\w+;|\s+|[^<&\s]+|[<&]')
+
+# Etiqueta HTML: (/ de cierre, nombre, / de autocierre)
+_HTML_TAG = re.compile(r'<(/?)([a-zA-Z][\w-]*)[^<>]*?(/?)>')
+
+
+def _open_tags_after(open_tags, token):
+    """
+    Etiquetas abiertas tras añadir una pieza de texto.
+    
+    Args:
+        open_tags (list): Etiquetas abiertas: (nombre, etiqueta de apertura).
+        token (str): Pieza de la línea (ver _HTML_TOKEN).
+        
+    Returns:
+        list: Etiquetas abiertas después de la pieza.
+    """
+    match = _HTML_TAG.fullmatch(token)
+    if not match or match.group(3):
+        return open_tags
+    closing, name = match.group(1), match.group(2).lower()
+    if not closing:
+        return open_tags + [(name, token)]
+    # Cierre: se quita la última etiqueta abierta con ese nombre
+    for i in range(len(open_tags) - 1, -1, -1):
+        if open_tags[i][0] == name:
+            return open_tags[:i] + open_tags[i + 1:]
+    return open_tags
+
+
+def _split_line(line, max_length):
+    """
+    Trocea una línea más larga que el límite sin romper el HTML: solo se
+    corta entre palabras (o dentro de una palabra más larga que el límite),
+    nunca dentro de una etiqueta o una entidad. Las etiquetas abiertas en
+    el punto de corte se cierran al final del trozo y se vuelven a abrir al
+    principio del siguiente.
+    
+    Args:
+        line (str): Línea a trocear.
+        max_length (int): Longitud máxima de cada trozo.
+        
+    Returns:
+        list: Trozos de la línea.
+    """
+    def closing(tags):
+        return ''.join(f"</{name}>" for name, _ in reversed(tags))
+    
+    parts = []
+    current = ''
+    open_tags = []
+    for token in _HTML_TOKEN.findall(line):
+        tags = _open_tags_after(open_tags, token)
+        while len(current) + len(token) + len(closing(tags)) > max_length:
+            reopen = ''.join(tag for _, tag in open_tags)
+            if current != reopen:
+                # Se cierra el trozo en el último límite entre piezas
+                parts.append(current + closing(open_tags))
+                current = reopen
+                continue
+            room = max_length - len(current) - len(closing(tags))
+            if token.startswith(('<', '&')) or room <= 0:
+                # Etiqueta o entidad que no cabe ni sola: se deja entera
+                break
+            # Palabra más larga que un trozo entero: se corta por caracteres
+            parts.append(current + token[:room] + closing(open_tags))
+            token = token[room:]
+        current += token
+        open_tags = tags
+    
+    if current.strip() and current != ''.join(tag for _, tag in open_tags):
+        parts.append(current + closing(open_tags))
+    return parts
+
+
+def split_message(message, max_length=TELEGRAM_MAX_LENGTH):
+    """
+    Trocea un mensaje en partes de como máximo max_length caracteres,
+    cortando por líneas para no romper el formato HTML.
+    Solo una línea más larga que el límite se corta dentro de la línea,
+    entre palabras y fuera de las etiquetas (ver _split_line).
+    
+    Args:
+        message (str): Mensaje completo.
+        max_length (int): Longitud máxima de cada parte.
+        
+    Returns:
+        list: Partes del mensaje (sin partes vacías).
+    """
+    chunks = []
+    current = ''
+    for line in message.split('\n'):
+        # Líneas más largas que el límite: se trocean y solo el último trozo
+        # sigue acumulando líneas
+        if len(line) > max_length:
+            if current.strip():
+                chunks.append(current)
+            *pieces, line = _split_line(line, max_length) or ['']
+            chunks.extend(pieces)
+            current = ''
+        
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > max_length:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    
+    if current.strip():
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk.strip()]
 
 
 class TelegramNotifier:
-    def __init__(self):
+    def __init__(self, bot_token=TELEGRAM_BOT_TOKEN, chat_id=TELEGRAM_CHAT_ID, base_url=TELEGRAM_API_URL):
         """
         Constructor de la clase TelegramNotifier.
         Inicializa las credenciales y la URL base de la API de Telegram.
+        
+        Args:
+            bot_token (str): Token del bot (por defecto TELEGRAM_BOT_TOKEN).
+            chat_id (str): Chat de destino (por defecto TELEGRAM_CHAT_ID).
+            base_url (str): URL de la API sin el token (por defecto TELEGRAM_API_URL).
         """
         # Token del bot de Telegram (obtenido de @BotFather)
-        self.bot_token = TELEGRAM_BOT_TOKEN
+        self.bot_token = bot_token
         
         # ID del chat donde enviar los mensajes (obtenido de @userinfobot)
-        self.chat_id = TELEGRAM_CHAT_ID
+        self.chat_id = chat_id
+        
+        # URL base de la API de Telegram (se le añade el token, como espera python-telegram-bot)
+        self.base_url = base_url
+        
+        # Cola de mensajes pendientes y el hilo que los envía (se arranca con el primer mensaje)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
         
-        # URL base de la API de Telegram para este bot
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        # Estadísticas de envío
+        self.sent = 0  # Mensajes entregados
+        self.failed = 0  # Mensajes que no se pudieron entregar
+        self._last_sent = 0.0  # Instante (monotonic) del último envío
     
     def send_message(self, message):
         """
-        Envía un mensaje a través de Telegram usando la API Bot.
+        Encola un mensaje para enviarlo por Telegram sin bloquear.
+        Los mensajes encolados casi a la vez se agrupan en uno solo
+        (troceado si supera 4096 caracteres).
         
         Args:
             message (str): Mensaje a enviar. Puede incluir formato HTML.
             
         Returns:
-            bool: True si el mensaje se envió correctamente, False en caso contrario.
+            bool: True si el mensaje se encoló, False si Telegram no está configurado.
         """
         # Verifica que las credenciales estén configuradas
         if not self.bot_token or not self.chat_id:
             print("Telegram no configurado. Mensaje no enviado.")
             return False
         
-        # Construye la URL del endpoint de envío de mensajes
-        url = f"{self.base_url}/sendMessage"
+        self._start()
+        self._queue.put(message)
+        return True
+    
+    def close(self, timeout=TELEGRAM_FLUSH_TIMEOUT):
+        """
+        Espera a que se entreguen los mensajes pendientes y detiene el hilo de envío.
+        
+        Args:
+            timeout (float): Segundos máximos de espera.
+            
+        Returns:
+            bool: True si se entregaron todos los mensajes encolados; False si
+                  alguno no se pudo entregar o sigue pendiente tras timeout.
+        """
+        if not self._queue.empty():
+            # Mensajes encolados después de que el hilo terminara (p. ej. tras
+            # un error al conectar): se arranca otro para entregarlos
+            self._start()
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return self.failed == 0
+        
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            print(f"Advertencia: quedan notificaciones de Telegram sin enviar tras {timeout} s")
+            return False
+        if self.failed:
+            print(f"Advertencia: {self.failed} notificación(es) de Telegram sin entregar")
+        return self.failed == 0
+    
+    def _start(self):
+        """
+        Arranca el hilo de envío si no está en marcha. Si el anterior terminó
+        (no pudo conectar con Telegram), se arranca uno nuevo, que vuelve a
+        intentar la conexión.
+        """
+        import asyncio  # Import diferido: bucle de eventos del hilo de envío (solo si se envía algo)
         
-        # Prepara el payload con los datos del mensaje
-        payload = {
-            'chat_id': self.chat_id,  # Destinatario del mensaje
-            'text': message,  # Contenido del mensaje
-            'parse_mode': 'HTML'  # Permite formato HTML en el mensaje
-        }
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=lambda: asyncio.run(self._run()), name='telegram-notifier', daemon=True
+                )
+                self._thread.start()
+    
+    async def _run(self):
+        """
+        Bucle del hilo de envío: agrupa los mensajes pendientes y los entrega
+        con una única conexión hasta recibir la marca de fin.
+        """
+        # Import diferido: python-telegram-bot solo se carga si se envía algo
+        import asyncio
+        from telegram import Bot
+        from telegram.error import TelegramError
         
+        bot = Bot(self.bot_token, base_url=self.base_url)
         try:
-            # Realiza la petición POST a la API de Telegram
-            response = requests.post(url, json=payload, timeout=10)
-            
-            # Verifica que la respuesta sea exitosa (status code 2xx)
-            response.raise_for_status()
-            
-            print("Notificación de Telegram enviada")
-            return True
+            await bot.initialize()
+        except TelegramError as e:
+            print(f"Error al conectar con Telegram: {e}")
+            self._discard_pending()
+            return
+        
+        try:
+            stopping = False
+            while not stopping:
+                message = await asyncio.to_thread(self._queue.get)
+                if message is _STOP:
+                    break
+                
+                # Breve espera para agrupar las alertas que llegan casi a la vez
+                await asyncio.sleep(TELEGRAM_COALESCE_DELAY)
+                batch = [message]
+                while True:
+                    try:
+                        pending = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if pending is _STOP:
+                        stopping = True
+                        break
+                    batch.append(pending)
+                
+                for chunk in split_message('\n'.join(batch)):
+                    await self._deliver(bot, chunk)
+        finally:
+            await bot.shutdown()
+    
+    def _discard_pending(self):
+        """
+        Descarta los mensajes pendientes (p. ej. si el token no es válido).
+        """
+        while True:
+            try:
+                message = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if message is not _STOP:
+                self.failed += 1
+    
+    async def _deliver(self, bot, text):
+        """
+        Envía un mensaje respetando el intervalo mínimo entre mensajes y los
+        429 de Telegram (retry_after). Reintenta los errores de red.
+        
+        Args:
+            bot (telegram.Bot): Bot ya inicializado.
+            text (str): Texto del mensaje (como máximo 4096 caracteres).
+        """
+        import asyncio
+        from telegram.error import NetworkError, RetryAfter, TelegramError
+        
+        for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+            # Intervalo mínimo entre mensajes al mismo chat
+            wait = self._last_sent + TELEGRAM_MIN_INTERVAL - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
             
-        except requests.exceptions.RequestException as e:
-            # Captura cualquier error de red o HTTP
-            print(f"Error al enviar notificación de Telegram: {e}")
-            return False
+            try:
+                await bot.send_message(chat_id=self.chat_id, text=text, parse_mode='HTML')
+                self._last_sent = time.monotonic()
+                self.sent += 1
+                print("Notificación de Telegram enviada")
+                return
+            except RetryAfter as e:
+                # Telegram indica cuánto esperar antes de volver a enviar
+                retry_after = e.retry_after
+                if hasattr(retry_after, 'total_seconds'):
+                    retry_after = retry_after.total_seconds()
+                print(f"Telegram pide esperar {retry_after} s antes de reenviar")
+                await asyncio.sleep(retry_after)
+            except NetworkError as e:
+                # Errores de red o timeouts (TimedOut hereda de NetworkError)
+                print(f"Error de red al enviar notificación de Telegram: {e}")
+                await asyncio.sleep(2 ** attempt)
+            except TelegramError as e:
+                # Errores definitivos (chat inexistente, HTML inválido...)
+                print(f"Error al enviar notificación de Telegram: {e}")
+                break
+            except Exception as e:
+                # Cualquier otro error inesperado (p. ej. respuesta mal formada)
+                print(f"Error inesperado al enviar notificación de Telegram: {e!r}")
+                break
+        
+        self.failed += 1
     
     def send_success(self, results_count, timestamp):
         """
@@ -71,7 +345,8 @@ class TelegramNotifier:
             timestamp (str): Fecha y hora de la ejecución.
             
         Returns:
-            bool: True si la notificación se envió correctamente.
+            bool: True si la notificación se encoló para enviarla (la entrega se
+                  confirma con close()).
         """
         # Construye el mensaje con formato HTML
         message = f"""
@@ -95,14 +370,16 @@ Los datos han sido guardados en el Excel.
             timestamp (str): Fecha y hora cuando ocurrió el error.
             
         Returns:
-            bool: True si la notificación se envió correctamente.
+            bool: True si la notificación se encoló para enviarla (la entrega se
+                  confirma con close()).
         """
-        # Construye el mensaje de error con formato HTML
+        # Construye el mensaje de error con formato HTML (el texto de la
+        # excepción se escapa: un '<' o '&' haría que Telegram rechazara el mensaje)
         message = f"""
 ❌ <b>Error en el Scraper</b>
 
 📅 Fecha: {timestamp}
-⚠️ Error: {error_msg}
+⚠️ Error: {html.escape(str(error_msg))}
 
 Por favor, revisa los logs en GitHub Actions.
 """
@@ -119,7 +396,8 @@ Por favor, revisa los logs en GitHub Actions.
             timestamp (str): Fecha y hora de la ejecución.
             
         Returns:
-            bool: True si la notificación se envió correctamente.
+            bool: True si la notificación se encoló para enviarla (la entrega se
+                  confirma con close()).
         """
         # Filtra los resultados exitosos (sin errores)
         successful = [r for r in results if 'error' not in r]
@@ -147,6 +425,101 @@ Por favor, revisa los logs en GitHub Actions.
         
         # Envía el mensaje usando el método base
         return self.send_message(message)
+    
+    def send_changes(self, changes, results, timestamp):
+        """
+        Envía solo los cambios detectados respecto a la ejecución anterior
+        (ver change_detector). Si no hay cambios no se envía nada.
+        
+        Args:
+            changes (list): Cambios devueltos por ChangeDetector.diff.
+            results (list): Todos los resultados de la ejecución (para el total).
+            timestamp (str): Fecha y hora de la ejecución.
+            
+        Returns:
+            bool: True si la notificación se encoló para enviarla (o no era necesaria).
+        """
+        if not changes:
+            print("Sin cambios: no se envía notificación")
+            return True
+        
+        # Encabezado con el número de fuentes cambiadas sobre el total revisado
+        message = f"""
+🔔 <b>Cambios detectados</b>
+
+📅 {timestamp}
+🔎 {len(changes)} de {len(results)} fuente(s) con cambios
+
+"""
+        for change in changes:
+            message += self._format_change(change)
+        
+        # Envía el mensaje usando el método base
+        return self.send_message(message)
+    
+    def send_new_offers(self, offers, timestamp):
+        """
+        Envía las ofertas que no se habían visto en ejecuciones anteriores
+        (ver seen_offers). Si no hay ofertas nuevas no se envía nada.
+
+        Args:
+            offers (list): Ofertas devueltas por SeenOffersIndex.diff.
+            timestamp (str): Fecha y hora de la ejecución.
+
+        Returns:
+            bool: True si la notificación se encoló para enviarla (o no era necesaria).
+        """
+        if not offers:
+            print("Sin ofertas nuevas: no se envía notificación")
+            return True
+
+        message = f"""
+📌 <b>Ofertas nuevas</b>
+
+📅 {timestamp}
+🆕 {len(offers)} oferta(s)
+
+"""
+        for offer in offers:
+            title = html.escape(offer.get('title') or 'Sin título')
+            if offer.get('link'):
+                title = f"<a href=\"{html.escape(offer['link'])}\">{title}</a>"
+            line = f"• <b>{html.escape(str(offer['name']))}</b>: {title}"
+            if offer.get('end'):
+                # Solo la fecha (las horas se guardan a 00:00)
+                line += f" (hasta {html.escape(offer['end'][:10])})"
+            message += line + "\n"
+
+        # Envía el mensaje usando el método base
+        return self.send_message(message)
+
+    @staticmethod
+    def _format_change(change):
+        """
+        Formatea un cambio como un bloque de líneas HTML.
+        """
+        name = html.escape(str(change['name']))
+        kind = change['kind']
+        
+        if kind == 'error':
+            return f"❌ <b>{name}</b>: {html.escape(str(change['error']))}\n"
+        
+        # Icono y título según el tipo de cambio
+        titles = {'nueva': '🆕 Nueva fuente', 'recuperada': '✅ Recuperada', 'cambios': '🔄'}
+        lines = [f"{titles[kind]} <b>{name}</b>"]
+        
+        for metric, (before, after) in change['deltas'].items():
+            metric = html.escape(str(metric))
+            if before is None:
+                # Métrica nueva: solo se muestra su valor
+                lines.append(f"  • {metric}: {html.escape(str(after))}")
+            elif isinstance(before, (int, float)) and isinstance(after, (int, float)):
+                # Conteos: se muestra la diferencia con signo
+                lines.append(f"  • {metric}: {before} → {after} ({after - before:+})")
+            else:
+                # Status u otros valores: NO → YES
+                lines.append(f"  • {metric}: {html.escape(str(before))} → {html.escape(str(after))}")
+        return '\n'.join(lines) + '\n'
 
 
 if __name__ == "__main__":
@@ -156,5 +529,6 @@ if __name__ == "__main__":
     # Crea una instancia del notificador
     notifier = TelegramNotifier()
     
-    # Envía un mensaje de prueba de éxito
-    notifier.send_success(10, "2025-01-15 20:00:00")
\ No newline at end of file
+    # Envía un mensaje de prueba de éxito y espera a que se entregue
+    notifier.send_success(10, "2025-01-15 20:00:00")
+    notifier.close()
\ No newline at end of file
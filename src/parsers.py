@@ -0,0 +1,301 @@
+"""
+Motores de parseo HTML intercambiables.
+Este módulo abstrae el parser usado por el scraper para que los métodos
+check_* y count_keywords_* funcionen igual con cualquiera de ellos:
+- 'html.parser': BeautifulSoup con el parser de la librería estándar (más lento)
+- 'lxml': BeautifulSoup con lxml (mismo API, parseo en C)
+- 'selectolax': motor lexbor de selectolax, envuelto con el subconjunto del
+  API de BeautifulSoup que usa el scraper (select, select_one, get_text, text,
+  find_next_sibling)
+
+Con los motores de BeautifulSoup se puede hacer un parseo parcial: si se
+indican selectores raíz (clave "parse_only" de urls_config.json), un
+SoupStrainer descarta durante el parseo todo lo que no esté dentro de
+ellos, de modo que solo se construyen en memoria los subárboles útiles.
+
+Los motores (también BeautifulSoup) solo se importan al parsear la primera página.
+Ejecutar este archivo comprueba que todos los motores instalados producen
+los mismos resultados sobre los fixtures de data/fixtures.
+"""
+import functools  # Para cachear la comprobación de motores instalados
+import importlib.util  # Para comprobar si un motor opcional está instalado
+from config import PARSER_BACKEND  # Motor de parseo por defecto
+from extraction import parse_simple_selector  # Descomposición de selectores simples
+
+# Motores soportados y el módulo que necesita cada uno
+PARSER_BACKENDS = {
+    'html.parser': 'bs4',
+    'lxml': 'lxml',
+    'selectolax': 'selectolax',
+}
+
+# Etiquetas cuyo texto no forma parte del contenido visible (igual que BeautifulSoup)
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+# Motores (y parse_only) ya avisados como no disponibles (para no repetir el aviso por URL)
+_warned_backends = set()
+
+
+@functools.lru_cache(maxsize=None)
+def _is_installed(module):
+    """
+    Indica si un módulo está instalado (se comprueba una sola vez).
+    """
+    return importlib.util.find_spec(module) is not None
+
+
+def available_backends():
+    """
+    Lista los motores de parseo instalados en el entorno.
+
+    Returns:
+        list: Nombres de los motores disponibles.
+    """
+    return [
+        name for name, module in PARSER_BACKENDS.items()
+        if _is_installed(module)
+    ]
+
+
+def resolve_backend(backend=None):
+    """
+    Determina el motor a usar, volviendo a 'html.parser' si el pedido
+    no existe o no está instalado.
+
+    Args:
+        backend (str): Motor solicitado (None = PARSER_BACKEND de config).
+
+    Returns:
+        str: Nombre del motor que se usará.
+    """
+    backend = backend or PARSER_BACKEND
+    if backend in PARSER_BACKENDS and _is_installed(PARSER_BACKENDS[backend]):
+        return backend
+
+    if backend not in _warned_backends:
+        _warned_backends.add(backend)
+        print(f"Advertencia: motor de parseo '{backend}' no disponible, se usa 'html.parser'")
+    return 'html.parser'
+
+
+@functools.lru_cache(maxsize=256)
+def build_strainer(selectors):
+    """
+    Construye un SoupStrainer que conserva solo los elementos que cumplen
+    alguno de los selectores (y todo su contenido).
+    Solo admite selectores compuestos simples (etiqueta, clases e id),
+    que son los que se pueden evaluar antes de construir el árbol.
+
+    Args:
+        selectors (tuple): Selectores raíz (p. ej. ("div#contenedor",)).
+
+    Returns:
+        SoupStrainer: Filtro para parse_only, o None si algún selector no es simple.
+    """
+    compounds = [parse_simple_selector(selector) for selector in selectors]
+    if not compounds or None in compounds:
+        return None
+
+    def matches(name, attrs):
+        # Durante el parseo los atributos llegan como dict (class puede ser texto o lista)
+        attrs = attrs if hasattr(attrs, 'get') else dict(attrs)
+        classes = attrs.get('class') or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        classes = frozenset(classes)
+        element_id = attrs.get('id')
+        return any(
+            (tag is None or tag == name)
+            and (required_id is None or required_id == element_id)
+            and required_classes.issubset(classes)
+            for tag, required_classes, required_id in compounds
+        )
+
+    from bs4 import SoupStrainer  # Import diferido: solo al parsear
+    return SoupStrainer(matches)
+
+
+def parse(html, backend=None, parse_only=None):
+    """
+    Parsea HTML con el motor indicado.
+
+    Args:
+        html (str): Contenido HTML de la página.
+        backend (str): Motor a usar (None = PARSER_BACKEND de config).
+        parse_only (tuple): Selectores raíz para el parseo parcial (opcional).
+                            Se ignora con selectolax, que siempre parsea completo.
+
+    Returns:
+        BeautifulSoup | LexborDocument: Documento con API compatible con BeautifulSoup.
+    """
+    backend = resolve_backend(backend)
+    if backend == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser  # Import diferido: dependencia opcional
+        return LexborDocument(LexborHTMLParser(html))
+
+    strainer = None
+    if parse_only:
+        strainer = build_strainer(tuple(parse_only))
+        if strainer is None and parse_only not in _warned_backends:
+            _warned_backends.add(parse_only)
+            print(f"Advertencia: parse_only {list(parse_only)} no admite parseo parcial "
+                  f"(solo etiqueta, clases e id); se parsea la página completa")
+    from bs4 import BeautifulSoup  # Import diferido: solo al parsear
+    return BeautifulSoup(html, backend, parse_only=strainer)
+
+
+def count_nodes(document):
+    """
+    Cuenta los elementos de un documento parseado (para las métricas).
+
+    Args:
+        document (BeautifulSoup | LexborDocument): Documento devuelto por parse().
+
+    Returns:
+        int: Número de elementos HTML.
+    """
+    if isinstance(document, LexborElement):
+        return sum(1 for node in document._node.traverse() if node.is_element_node)
+    return len(document.find_all(True))
+
+
+def _wrap(node):
+    """
+    Envuelve un nodo de selectolax (o None).
+    """
+    return LexborElement(node) if node is not None else None
+
+
+def _visible_text(node, separator='', strip=False):
+    """
+    Obtiene el texto de un nodo de selectolax como lo haría get_text()
+    de BeautifulSoup: ignora comentarios y el contenido de script/style
+    salvo que el propio nodo sea uno de ellos.
+    """
+    if node.tag in _NON_TEXT_TAGS:
+        return node.text(deep=True)
+
+    parts = []
+    for child in node.traverse(include_text=True):
+        if not child.is_text_node or child.parent.tag in _NON_TEXT_TAGS:
+            continue
+        text = child.text_content
+        if strip:
+            text = text.strip()
+            if not text:
+                continue
+        parts.append(text)
+    return separator.join(parts)
+
+
+class LexborElement:
+    """
+    Elemento HTML de selectolax con el API mínimo de un Tag de BeautifulSoup.
+    """
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def name(self):
+        return self._node.tag
+
+    @property
+    def text(self):
+        return self.get_text()
+
+    def select(self, selector):
+        return [LexborElement(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        return _wrap(self._node.css_first(selector))
+
+    def get_text(self, separator='', strip=False):
+        return _visible_text(self._node, separator, strip)
+
+    def get(self, key, default=None):
+        return self._node.attributes.get(key, default)
+
+    def find_next_sibling(self, string=False):
+        """
+        Devuelve el siguiente hermano. Con string=True, el siguiente nodo de
+        texto (como find_next_sibling(string=True) de BeautifulSoup).
+        """
+        sibling = self._node.next
+        while sibling is not None:
+            if string and sibling.is_text_node:
+                return sibling.text_content
+            if not string and sibling.is_element_node:
+                return LexborElement(sibling)
+            sibling = sibling.next
+        return None
+
+
+class LexborDocument(LexborElement):
+    """
+    Documento completo de selectolax con el API mínimo de BeautifulSoup.
+    """
+
+    def __init__(self, tree):
+        super().__init__(tree.root)
+        self._tree = tree
+
+    def select(self, selector):
+        return [LexborElement(node) for node in self._tree.css(selector)]
+
+    def select_one(self, selector):
+        return _wrap(self._tree.css_first(selector))
+
+
+def check_parity(fixtures_dir='data/fixtures'):
+    """
+    Comprueba que todos los motores instalados extraen los mismos resultados
+    para cada fixture, también con parseo parcial si el fixture define
+    parse_only. Cada fixture es un par <nombre>.html / <nombre>.json,
+    donde el JSON contiene la configuración de URL a aplicar.
+
+    Args:
+        fixtures_dir (str): Directorio con los fixtures.
+
+    Returns:
+        bool: True si todos los motores coinciden en todos los fixtures.
+    """
+    import json
+    import os
+    from processors import get_plan
+    backends = available_backends()
+    all_equal = True
+
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if not filename.endswith('.html'):
+            continue
+        base = os.path.join(fixtures_dir, filename[:-len('.html')])
+        with open(f"{base}.html", 'r', encoding='utf-8') as f:
+            html = f.read()
+        with open(f"{base}.json", 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        results = {backend: get_plan(config).run(parse(html, backend)) for backend in backends}
+        parse_only = get_plan(config).parse_only
+        if parse_only:
+            # El parseo parcial debe dar lo mismo que el parseo completo
+            for backend in backends:
+                if backend != 'selectolax':
+                    partial = parse(html, backend, parse_only)
+                    results[f"{backend}+parse_only"] = get_plan(config).run(partial)
+        reference = results['html.parser']
+        for backend, result in results.items():
+            equal = result == reference
+            all_equal = all_equal and equal
+            print(f"{'✓' if equal else '❌'} {filename} [{backend}]: {result}")
+
+    return all_equal
+
+
+if __name__ == "__main__":
+    # Comprobación de paridad entre motores sobre los fixtures versionados
+    # Se ejecuta desde la raíz del repositorio: python src/parsers.py
+    print(f"Motores disponibles: {', '.join(available_backends())}")
+    if not check_parity():
+        raise SystemExit("Los motores de parseo no producen los mismos resultados")
+    print("Todos los motores producen los mismos resultados")
@@ -0,0 +1,150 @@
+"""
+Etapa de parseo en procesos separados de la descarga.
+El parseo del HTML y el conteo de keywords consumen CPU y, ejecutados en
+los hilos de descarga, quedan limitados a un solo núcleo por el GIL.
+Con este módulo los hilos solo descargan: cada cuerpo descargado se envía
+a un ProcessPoolExecutor de workers de parseo, que devuelven el diccionario
+de datos extraídos (y las métricas de parseo medidas en el worker).
+
+- Contrapresión: como máximo hay PARSE_QUEUE_SIZE cuerpos pendientes de
+  parsear (en cola o en un worker). Si la cola está llena, los hilos de
+  descarga esperan antes de descargar más, de modo que la memoria no crece
+  aunque la red sea más rápida que el parseo.
+- Parada ordenada: al salir se esperan como máximo PARSE_SHUTDOWN_TIMEOUT
+  segundos a los trabajos pendientes; los que no terminan se cancelan.
+- Workers ligeros: cada worker solo tiene los planes compilados y el
+  parseo (processors.parse_and_extract), sin el estado de red del scraper,
+  y se arranca con 'forkserver' (o 'spawn'), nunca con fork desde un
+  proceso con hilos de descarga activos.
+"""
+import multiprocessing  # Método de arranque de los workers
+import threading  # Semáforo para acotar la cola de cuerpos pendientes
+from concurrent.futures import ProcessPoolExecutor, wait  # Workers de parseo en otros procesos
+from config import PARSE_QUEUE_SIZE, PARSE_SHUTDOWN_TIMEOUT  # Tamaño de la cola y espera al cerrar
+from metrics import RunMetrics  # Métricas de parseo medidas en cada worker
+from processors import parse_and_extract  # Parseo y extracción sin estado de red
+
+# Métricas propias de cada proceso worker (se crean una vez en init_worker)
+_worker_metrics = None
+
+
+def start_method():
+    """
+    Método de arranque de los procesos worker. No se usa 'fork': el pool se
+    crea con hilos de descarga ya en marcha (sesión HTTP, cachés, rate
+    limiter) y un fork copiaría sus locks en el estado en que estén, lo que
+    puede bloquear al worker. 'forkserver' arranca los workers desde un
+    proceso limpio sin hilos; donde no existe (Windows, macOS antiguo) se
+    usa 'spawn'.
+
+    Returns:
+        str: 'forkserver' o 'spawn'.
+    """
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+def init_worker():
+    """
+    Inicializa un proceso worker. El worker solo parsea y extrae: no crea
+    un WebScraper (ni su sesión HTTP ni las cachés HTTP, de robots.txt o de
+    snapshots), solo el registro de métricas. Los planes de áreas y
+    autómatas de keywords compilados quedan cacheados en el proceso y se
+    reutilizan entre trabajos.
+    """
+    global _worker_metrics
+    _worker_metrics = RunMetrics()
+
+
+def parse_job(config, html):
+    """
+    Parsea una página y extrae sus datos dentro de un proceso worker.
+
+    Args:
+        config (dict): Configuración de la URL.
+        html (str): Contenido HTML descargado.
+
+    Returns:
+        tuple: (data, records). data son los datos extraídos (o {'error': ...}
+               si el parseo falla) y records las métricas de parseo y
+               extracción medidas en el worker.
+    """
+    data = parse_and_extract(config, html, _worker_metrics)
+    return data, _worker_metrics.drain()
+
+
+class ParsePipeline:
+    def __init__(self, workers, queue_size=PARSE_QUEUE_SIZE, shutdown_timeout=PARSE_SHUTDOWN_TIMEOUT):
+        """
+        Constructor de la clase ParsePipeline. Arranca los procesos worker.
+
+        Args:
+            workers (int): Número de procesos de parseo.
+            queue_size (int): Máximo de cuerpos pendientes de parsear (contrapresión).
+            shutdown_timeout (float): Segundos de espera a los trabajos pendientes al cerrar.
+        """
+        self.workers = workers
+        self.queue_size = max(queue_size, 1)
+        self.shutdown_timeout = shutdown_timeout
+        self._slots = threading.BoundedSemaphore(self.queue_size)  # Huecos libres en la cola
+        self._pending = set()  # Trabajos enviados y aún no terminados
+        self._lock = threading.Lock()  # Protege _pending frente a los hilos de descarga
+        context = multiprocessing.get_context(start_method())
+        if context.get_start_method() == 'forkserver':
+            # El servidor importa una vez el código de parseo; cada worker lo hereda ya cargado
+            context.set_forkserver_preload(['processors', 'metrics'])
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                             initializer=init_worker)
+
+    def submit(self, config, html):
+        """
+        Envía una página a los workers. Bloquea el hilo que llama mientras
+        la cola esté llena.
+
+        Args:
+            config (dict): Configuración de la URL.
+            html (str): Contenido HTML descargado.
+
+        Returns:
+            concurrent.futures.Future: Futuro con (datos extraídos, métricas).
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(parse_job, config, html)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future):
+        """
+        Libera el hueco de un trabajo terminado (o cancelado).
+        """
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+
+    def shutdown(self):
+        """
+        Cierra los workers esperando como máximo shutdown_timeout segundos
+        a los trabajos pendientes; el resto se cancelan.
+
+        Returns:
+            int: Número de trabajos cancelados.
+        """
+        with self._lock:
+            pending = set(self._pending)
+        _, not_done = wait(pending, timeout=self.shutdown_timeout)
+        self._executor.shutdown(wait=not not_done, cancel_futures=True)
+        return len(not_done)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        cancelled = self.shutdown()
+        if cancelled:
+            print(f"Advertencia: {cancelled} página(s) sin parsear al cerrar los workers")
+        return False
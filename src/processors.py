@@ -0,0 +1,633 @@
+"""
+Registro de procesadores y compilación de planes por URL.
+Cada entrada de urls_config.json se compila una sola vez en un plan
+inmutable (UrlPlan) con todo lo que no depende de la página: selectores
+resueltos desde el bloque "selectors", autómata de keywords, plan de
+extracción por áreas, formato de fechas, parseo parcial, paginación... El
+trabajo por página se limita a ejecutar el plan.
+
+En los listados paginados el plan se ejecuta en cada página y los datos de
+todas se agregan en un único resultado por fuente con Processor.merge.
+
+Los tipos que trabajan con ofertas (date_check, keyword_check) devuelven
+además en '_offers' un registro por oferta relevante (título, enlace y
+plazo), que seen_offers.py compara con las ofertas ya vistas.
+
+run() devuelve datos que solo dependen de la página (son los que se
+guardan en la caché HTTP); finalize() los convierte en el resultado del
+momento en que se consultan. Solo date_check depende de la fecha: guarda
+sus plazos y los evalúa frente a hoy en cada ejecución, aunque la página
+no haya cambiado.
+
+Los tipos de página ("type" en la configuración) se resuelven con un
+registro: para añadir un tipo nuevo basta con definir una subclase de
+Processor decorada con @register('nuevo_tipo'), sin tocar el scraper.
+"""
+import functools  # Para cachear los planes compilados
+import json  # Para obtener una clave estable de cada configuración
+import re  # Para descomponer los selectores :contains()
+from dataclasses import dataclass, field  # Para los planes inmutables
+from datetime import date, datetime  # Para los plazos de date_check
+from types import MappingProxyType  # Diccionarios de solo lectura dentro del plan
+from urllib.parse import urljoin  # Para los enlaces absolutos de las ofertas
+from config import MAX_RESPONSE_BYTES, PAGINATION_MAX_PAGES  # Límites por defecto de descarga y paginación
+from extraction import get_area_plan, split_selector_list  # Extracción del texto por áreas
+from http_cache import config_hash  # Huella de la configuración (para la caché)
+from keyword_matcher import get_matcher  # Autómata para contar keywords en una pasada
+import parsers  # Motores de parseo (el import de cada motor es diferido)
+from streaming import early_stop_roots  # Contenedores para la parada temprana
+
+# Tipo que se usa si la configuración no indica ninguno (o indica uno desconocido)
+DEFAULT_TYPE = 'keyword_count'
+
+# Selector con pseudo-clase :contains('texto'), p. ej. "strong:contains('Plazo:')"
+_CONTAINS = re.compile(r"""^(?P<selector>.*?):(?:-soup-)?contains\(\s*(?P<quote>['"])(?P<text>.*?)(?P=quote)\s*\)$""")
+
+# Procesadores registrados: tipo -> instancia
+PROCESSORS = {}
+
+# Versión de la extracción: forma parte de la huella de cada plan, así los
+# resultados guardados en la caché HTTP con una versión anterior no se reutilizan
+EXTRACTION_VERSION = 3
+
+# Selector por defecto del título de una oferta dentro de su fila
+DEFAULT_OFFER_TITLE = 'h1, h2, h3, h4, h5, a'
+
+
+def register(type_name):
+    """
+    Decorador que registra un procesador para un tipo de página.
+
+    Args:
+        type_name (str): Valor de la clave "type" en urls_config.json.
+    """
+    def decorator(cls):
+        PROCESSORS[type_name] = cls()
+        return cls
+    return decorator
+
+
+def split_contains(selector):
+    """
+    Separa un selector con :contains('texto') en el selector CSS y el texto.
+    Así el texto se comprueba en Python en lugar de con la pseudo-clase
+    (una de las rutas más lentas de soupsieve, y no soportada por selectolax).
+
+    Args:
+        selector (str): Selector, p. ej. "strong:contains('Plazo:')".
+
+    Returns:
+        tuple: (selector CSS, texto o None).
+    """
+    match = _CONTAINS.match(selector.strip())
+    if not match:
+        return selector.strip(), None
+    return match.group('selector').strip() or '*', match.group('text')
+
+
+def offer_record(plan, title, element, start=None, end=None):
+    """
+    Registro de una oferta.
+
+    Args:
+        plan (UrlPlan): Plan de la URL (para resolver enlaces relativos).
+        title (str): Título de la oferta.
+        element: Enlace de la oferta, o elemento que lo contiene (fila).
+        start (date): Inicio del plazo (opcional).
+        end (date): Fin del plazo (opcional).
+
+    Returns:
+        dict: title, link (absoluto o None), start y end (YYYY-MM-DD o None).
+    """
+    link = element if element.name == 'a' else element.select_one('a[href]')
+    href = link.get('href') if link is not None else None
+    return {
+        'title': ' '.join(title.split()),
+        'link': urljoin(plan.url, href) if href else None,
+        'start': start.isoformat() if start else None,
+        'end': end.isoformat() if end else None,
+    }
+
+
+@dataclass(frozen=True)
+class UrlPlan:
+    """
+    Plan compilado e inmutable de una entrada de urls_config.json.
+    """
+    name: str
+    url: str
+    type: str
+    processor: object  # Procesador registrado para el tipo
+    cfg_hash: str  # Huella de la configuración original (caché de resultados)
+    parser: str = None  # Motor de parseo (None = el de config)
+    parse_only: tuple = None  # Selectores raíz del parseo parcial
+    stop_roots: tuple = None  # Contenedores para la parada temprana de la descarga
+    max_bytes: int = MAX_RESPONSE_BYTES  # Límite de descarga
+    pagination: MappingProxyType = None  # next, max_pages y stop_if_missing (None = una sola página)
+    compiled: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))  # Partes propias del procesador
+
+    def run(self, soup):
+        """
+        Ejecuta el plan sobre una página ya parseada.
+
+        Args:
+            soup (BeautifulSoup): Documento parseado (o documento compatible).
+
+        Returns:
+            dict: Campos extraídos (status, conteos o error).
+        """
+        return self.processor.run(self, soup)
+
+    def finalize(self, data, reference=None):
+        """
+        Resultado a partir de los datos de run() (recién extraídos o de la caché).
+
+        Args:
+            data (dict): Datos devueltos por run(). No se modifican.
+            reference (datetime): Instante de referencia (None = ahora).
+
+        Returns:
+            dict: Campos del resultado.
+        """
+        return self.processor.finalize(self, data, reference)
+
+    def next_links(self, soup):
+        """
+        Enlaces a otras páginas del listado (selector "next" de la paginación).
+        Si la página no contiene "stop_if_missing" se considera que el listado
+        ha terminado y no se siguen sus enlaces.
+
+        Args:
+            soup (BeautifulSoup): Documento parseado (o documento compatible).
+
+        Returns:
+            list: Valores href de los enlaces (sin resolver).
+        """
+        stop_if_missing = self.pagination['stop_if_missing']
+        if stop_if_missing and soup.select_one(stop_if_missing) is None:
+            return []
+        return [link.get('href') for link in soup.select(self.pagination['next']) if link.get('href')]
+
+    def merge(self, pages):
+        """
+        Agrega los datos de las páginas de un listado (ver Processor.merge).
+        """
+        return self.processor.merge(self, pages)
+
+
+class Processor:
+    """
+    Procesador de un tipo de página. compile() prepara una sola vez todo lo
+    que necesita el tipo a partir de la configuración; run() lo ejecuta
+    sobre cada página; merge() agrega las páginas de un listado paginado.
+    """
+
+    def compile(self, config, selectors):
+        """
+        Args:
+            config (dict): Configuración de la URL.
+            selectors (dict): Bloque "selectors" de la configuración.
+
+        Returns:
+            dict: Partes compiladas que se guardan en plan.compiled.
+        """
+        return {}
+
+    def run(self, plan, soup):
+        raise NotImplementedError
+
+    def finalize(self, plan, data, reference=None):
+        """
+        Convierte los datos de run() en el resultado del momento. Por defecto
+        los datos no dependen de la fecha y se devuelven tal cual.
+        """
+        return data
+
+    def merge(self, plan, pages):
+        """
+        Agrega los datos de las páginas de un listado en un único resultado.
+        Por defecto se suman los conteos y del resto se conserva el valor de
+        la primera página.
+
+        Args:
+            plan (UrlPlan): Plan de la URL.
+            pages (list): Resultado de cada página, ya evaluado con finalize (la primera, primero).
+
+        Returns:
+            dict: Datos agregados.
+        """
+        merged = dict(pages[0])
+        for page in pages[1:]:
+            for key, value in page.items():
+                if isinstance(value, int) and not isinstance(value, bool) and isinstance(merged.get(key), int):
+                    merged[key] += value
+                else:
+                    merged.setdefault(key, value)
+        return merged
+
+
+@register('keyword_count')
+class KeywordCountProcessor(Processor):
+    """
+    Conteo de keywords en toda la página o en áreas concretas (search_areas).
+    """
+
+    def compile(self, config, selectors):
+        keywords = tuple(config.get('keywords') or ())
+        search_areas = config.get('search_areas') or None
+        return {
+            'keywords': keywords,
+            # Autómata de keywords con las opciones de coincidencia de la URL
+            'matcher': get_matcher(
+                keywords, config.get('whole_word', False), config.get('accent_insensitive', False)
+            ) if keywords else None,
+            # Plan de extracción de todas las áreas en un único recorrido del DOM
+            'area_plan': get_area_plan(search_areas) if search_areas else None,
+        }
+
+    def run(self, plan, soup):
+        matcher = plan.compiled['matcher']
+        if matcher is None:
+            # Si no hay keywords configuradas, marca como error
+            return {'error': 'No keywords configured'}
+
+        area_plan = plan.compiled['area_plan']
+        if area_plan is None:
+            # Sin áreas específicas: busca en toda la página
+            return matcher.count(soup.get_text().lower())
+
+        # Cuenta en cada área y agrega los resultados con el prefijo del área
+        data = {}
+        for area_name, area_text in area_plan.extract_texts(soup).items():
+            for keyword, count in matcher.count(area_text).items():
+                data[f"{area_name}_{keyword}"] = count
+        return data
+
+
+# Directivas de fecha admitidas en date_format: expresión regular y campo de la fecha
+_DATE_DIRECTIVES = {
+    '%d': (r'(\d{1,2})', 'day'),
+    '%m': (r'(\d{1,2})', 'month'),
+    '%Y': (r'(\d{4})', 'year'),
+}
+
+# Formato de fecha por defecto de los plazos (DD/MM/YYYY)
+DEFAULT_DATE_FORMAT = '%d/%m/%Y'
+
+
+def date_regex(date_format):
+    """
+    Traduce un formato de fecha ('%d/%m/%Y') a una expresión regular con un
+    grupo por campo, para extraer las fechas sin llamar a strptime.
+
+    Args:
+        date_format (str): Formato con las directivas %d, %m y %Y.
+
+    Returns:
+        tuple: (expresión regular, lista de campos en orden de aparición).
+
+    Raises:
+        ValueError: Si el formato usa otras directivas.
+    """
+    pattern = []
+    fields = []
+    for token in re.split(r'(%.)', date_format):
+        if token in _DATE_DIRECTIVES:
+            regex, name = _DATE_DIRECTIVES[token]
+            pattern.append(regex)
+            fields.append(name)
+        elif token.startswith('%'):
+            raise ValueError(f"directiva de fecha no soportada: {token}")
+        elif token:
+            pattern.append(re.escape(token))
+    if sorted(fields) != ['day', 'month', 'year']:
+        raise ValueError(f"el formato debe incluir %d, %m y %Y: {date_format}")
+    return ''.join(pattern), fields
+
+
+@register('date_check')
+class DateCheckProcessor(Processor):
+    """
+    Busca ofertas con el plazo abierto (p. ej. UVigo): en cada fila, tras la
+    etiqueta del plazo hay un rango "DD/MM/YYYY – DD/MM/YYYY".
+    Selectores usados del bloque "selectors":
+    - rows: filas de oferta
+    - card_summary: bloque donde está el plazo dentro de la fila (opcional)
+    - plazo: etiqueta del plazo, con :contains('texto')
+    - offer_title: título de la oferta dentro de la fila (opcional)
+
+    Los rangos de cada fila se extraen con una expresión regular
+    precompilada. run() devuelve todos los plazos en '_windows' (cada uno
+    como registro de oferta) y finalize() los compara con un único instante
+    de referencia: así un resultado de la caché se vuelve a evaluar cada
+    día. Un plazo incluye completo su día de cierre. Cada fila con un plazo
+    abierto se devuelve también como oferta en '_offers'. En un listado
+    paginado, cada página conserva sus cierres como fechas en '_closing' y
+    solo el resultado agregado (merge) los formatea.
+    """
+
+    def compile(self, config, selectors):
+        plazo_selector, plazo_text = split_contains(selectors.get('plazo', "strong:contains('Plazo:')"))
+        rows = selectors.get('rows', 'div.row.uvigo-row-nopadding')
+        card_summary = selectors.get('card_summary')
+
+        date_format = config.get('date_format', DEFAULT_DATE_FORMAT)
+        try:
+            single_date, fields = date_regex(date_format)
+        except ValueError as e:
+            print(f"Advertencia: {config['name']}: {e}; se usa {DEFAULT_DATE_FORMAT}")
+            date_format = DEFAULT_DATE_FORMAT
+            single_date, fields = date_regex(date_format)
+
+        # Etiqueta (opcional), fecha de inicio, separador y fecha de fin
+        label = re.escape(plazo_text) + r'\s*' if plazo_text else ''
+        separator = r'\s*' + re.escape(config.get('date_separator', '–')) + r'\s*'
+        return {
+            # Texto donde buscar los plazos: el resumen de cada fila (o la fila completa)
+            'rows': rows,
+            'card_summary': card_summary,
+            'offer_title': selectors.get('offer_title', DEFAULT_OFFER_TITLE),
+            'pattern': re.compile(label + single_date + separator + single_date),
+            'fields': tuple(fields),
+            'date_format': date_format,
+        }
+
+    def run(self, plan, soup):
+        compiled = plan.compiled
+        try:
+            windows = []
+            for row in soup.select(compiled['rows']):
+                # Texto del resumen de la fila (o de la fila completa)
+                if compiled['card_summary']:
+                    text = '\n'.join(element.get_text() for element in row.select(compiled['card_summary']))
+                else:
+                    text = row.get_text()
+                row_windows = self.parse_windows(text, compiled['pattern'], compiled['fields'])
+                if row_windows:
+                    title = row.select_one(compiled['offer_title'])
+                    title = title.get_text() if title else ''
+                    windows.extend(offer_record(plan, title, row, start, end) for start, end in row_windows)
+
+            # Los plazos se evalúan frente a la fecha actual en finalize
+            return {'_windows': windows}
+
+        except Exception as e:
+            # Manejo de errores en el procesamiento
+            print(f"Error procesando {plan.name}: {e}")
+            return {'status': "ERROR"}
+
+    def finalize(self, plan, data, reference=None):
+        if '_windows' not in data:
+            return data  # Error al procesar la página
+        today = (reference or datetime.now()).date()
+        result = {key: value for key, value in data.items() if key != '_windows'}
+        offers = [
+            offer for offer in data['_windows']
+            if date.fromisoformat(offer['start']) <= today <= date.fromisoformat(offer['end'])
+        ]
+        closing = [date.fromisoformat(offer['end']) for offer in offers]
+        if plan.pagination:
+            # Página de un listado: los cierres siguen como fechas hasta que
+            # merge() agrega todas las páginas y les da formato una sola vez
+            result['_closing'] = closing
+        else:
+            result.update(self.summarize(closing, plan.compiled['date_format']))
+        result['_offers'] = offers
+        return result
+
+    @staticmethod
+    def parse_windows(text, pattern, fields):
+        """
+        Extrae todos los plazos (inicio, fin) del texto en una pasada.
+        Las fechas imposibles (p. ej. 31/02) se ignoran.
+
+        Returns:
+            list: Lista de (fecha de inicio, fecha de fin) como datetime.date.
+        """
+        windows = []
+        count = len(fields)
+        for match in pattern.finditer(text):
+            numbers = [int(group) for group in match.groups()]
+            try:
+                start = date(**dict(zip(fields, numbers[:count])))
+                end = date(**dict(zip(fields, numbers[count:])))
+            except ValueError:
+                continue
+            windows.append((start, end))
+        return windows
+
+    @staticmethod
+    def summarize(closing, date_format=DEFAULT_DATE_FORMAT):
+        """
+        Resultado de date_check a partir de los cierres de los plazos abiertos.
+        """
+        closing = sorted(closing)
+        return {
+            'status': "YES" if closing else "NO",
+            'active_offers': len(closing),
+            'closing_dates': ', '.join(end.strftime(date_format) for end in closing),
+        }
+
+    def merge(self, plan, pages):
+        # Los plazos abiertos de todas las páginas (fechas de finalize), de nuevo
+        # del más próximo al más lejano
+        closing = [end for page in pages for end in page['_closing']]
+        return self.summarize(closing, plan.compiled['date_format'])
+
+
+@register('keyword_check')
+class KeywordCheckProcessor(Processor):
+    """
+    Comprueba si algún título de oferta contiene alguna keyword (p. ej. USC).
+    Selectores usados del bloque "selectors":
+    - container: contenedor principal de ofertas (opcional)
+    - jobs: cada oferta dentro del contenedor
+    - title: enlace con el título dentro de cada oferta
+
+    Se recorren todas las ofertas (no solo hasta la primera relevante):
+    las que contienen alguna keyword se devuelven en '_offers'.
+    """
+
+    def compile(self, config, selectors):
+        items = ' '.join(filter(None, (selectors.get('jobs'), selectors.get('title')))) or 'a'
+        return {
+            'container': selectors.get('container'),
+            'items': items,
+            'keywords': tuple(keyword.lower() for keyword in config.get('keywords') or ()),
+        }
+
+    def run(self, plan, soup):
+        compiled = plan.compiled
+        if not compiled['keywords']:
+            return {'error': 'No keywords configured'}
+
+        try:
+            # Buscar el contenedor principal de ofertas
+            container = soup
+            if compiled['container']:
+                container = soup.select_one(compiled['container'])
+                if not container:
+                    return {'status': "ERROR"}  # No se encontró el contenedor principal
+
+            # Revisar cada oferta buscando las palabras clave (case-insensitive)
+            offers = []
+            for link in container.select(compiled['items']):
+                title = link.text
+                if any(keyword in title.lower() for keyword in compiled['keywords']):
+                    offers.append(offer_record(plan, title, link))
+
+            # YES si hay al menos una oferta relevante
+            return {'status': "YES" if offers else "NO", '_offers': offers}
+
+        except Exception as e:
+            # Manejo de errores en el procesamiento
+            print(f"Error procesando {plan.name}: {e}")
+            return {'status': "ERROR"}
+
+    def merge(self, plan, pages):
+        # Basta con una oferta relevante en cualquier página
+        return {'status': "YES" if any(page['status'] == "YES" for page in pages) else "NO"}
+
+
+def parse_only_selectors(config):
+    """
+    Obtiene los selectores raíz del parseo parcial de una URL.
+    La clave "parse_only" puede nombrar entradas del bloque "selectors"
+    (p. ej. "container") o ser directamente selectores CSS.
+
+    Args:
+        config (dict): Configuración de la URL.
+
+    Returns:
+        tuple: Selectores raíz, o None si la URL se parsea completa.
+    """
+    parse_only = config.get('parse_only')
+    if not parse_only:
+        return None
+
+    names = [parse_only] if isinstance(parse_only, str) else parse_only
+    selectors = config.get('selectors') or {}
+    roots = []
+    for name in names:
+        roots.extend(split_selector_list(selectors.get(name, name)))
+    return tuple(roots)
+
+
+def compile_pagination(pagination):
+    """
+    Compila el bloque "pagination" de una URL:
+    - next: selector de los enlaces a otras páginas (obligatorio)
+    - max_pages: máximo de páginas, incluida la primera (PAGINATION_MAX_PAGES)
+    - stop_if_missing: selector que debe aparecer en una página para seguir
+      sus enlaces (p. ej. las filas de ofertas; opcional)
+
+    Args:
+        pagination (dict): Bloque "pagination" de la configuración (o None).
+
+    Returns:
+        MappingProxyType: Paginación compilada, o None si no hay.
+
+    Raises:
+        ValueError: Si falta "next" o max_pages no es un entero positivo.
+    """
+    if not pagination:
+        return None
+    if not isinstance(pagination, dict) or not isinstance(pagination.get('next'), str):
+        raise ValueError("'pagination' necesita un selector 'next'")
+    max_pages = int(pagination.get('max_pages', PAGINATION_MAX_PAGES))
+    if max_pages < 1:
+        raise ValueError("'pagination.max_pages' debe ser al menos 1")
+    return MappingProxyType({
+        'next': pagination['next'],
+        'max_pages': max_pages,
+        'stop_if_missing': pagination.get('stop_if_missing'),
+    })
+
+
+def compile_plan(config):
+    """
+    Compila una entrada de urls_config.json en un plan inmutable.
+
+    Args:
+        config (dict): Configuración de la URL.
+
+    Returns:
+        UrlPlan: Plan listo para ejecutarse sobre cada página.
+    """
+    processing_type = config.get('type', DEFAULT_TYPE)
+    processor = PROCESSORS.get(processing_type, PROCESSORS[DEFAULT_TYPE])
+    selectors = config.get('selectors') or {}
+    parse_only = parse_only_selectors(config)
+    pagination = compile_pagination(config.get('pagination'))
+    if pagination and parse_only:
+        # Los enlaces de paginación suelen estar fuera del contenedor: se conservan también
+        extra = split_selector_list(pagination['next'])
+        if pagination['stop_if_missing']:
+            extra += split_selector_list(pagination['stop_if_missing'])
+        parse_only = parse_only + tuple(selector for selector in extra if selector not in parse_only)
+    stop_roots = early_stop_roots(parse_only)
+
+    return UrlPlan(
+        name=config['name'],
+        url=config['url'],
+        type=processing_type,
+        processor=processor,
+        cfg_hash=config_hash(dict(config, _extraction=EXTRACTION_VERSION)),
+        parser=config.get('parser'),
+        parse_only=parse_only,
+        stop_roots=tuple(stop_roots) if stop_roots else None,
+        max_bytes=config.get('max_bytes', MAX_RESPONSE_BYTES),
+        pagination=pagination,
+        compiled=MappingProxyType(processor.compile(config, selectors)),
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_plan(config_key):
+    return compile_plan(json.loads(config_key))
+
+
+def get_plan(config):
+    """
+    Devuelve el plan de una configuración, compilándolo solo la primera vez
+    (también dentro de cada proceso worker de parseo).
+
+    Args:
+        config (dict): Configuración de la URL.
+
+    Returns:
+        UrlPlan: Plan compilado.
+    """
+    return _cached_plan(json.dumps(config, sort_keys=True, ensure_ascii=False))
+
+
+def parse_and_extract(config, html, metrics):
+    """
+    Parsea una página descargada y ejecuta su plan. Solo necesita el plan
+    compilado y el motor de parseo, sin sesión HTTP ni cachés: es lo que
+    usan tanto el scraper como los procesos worker de parseo (pipeline.py).
+
+    Args:
+        config (dict): Configuración de la URL.
+        html (str): Contenido HTML descargado.
+        metrics (RunMetrics): Donde se registran las etapas parse y extract.
+
+    Returns:
+        dict: Datos extraídos, o {'error': ...} si no se pudo parsear.
+    """
+    plan = get_plan(config)
+    try:
+        with metrics.stage('parse', plan.name) as fields:
+            soup = parsers.parse(html, plan.parser, plan.parse_only)
+            fields['nodes'] = parsers.count_nodes(soup)
+    except Exception as e:
+        # Cualquier error inesperado al parsear
+        print(f"Error inesperado en {plan.url}: {e}")
+        return {'error': 'Failed to fetch page'}
+
+    with metrics.stage('extract', plan.name):
+        data = plan.run(soup)
+        if plan.pagination:
+            # Enlaces a otras páginas (se quitan del resultado al agregar las páginas)
+            data['_links'] = plan.next_links(soup)
+        return data
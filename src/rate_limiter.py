@@ -0,0 +1,86 @@
+"""
+Rate limiting por host para las peticiones HTTP.
+Este módulo mantiene, para cada dominio, el instante a partir del cual
+se permite la siguiente petición. Así, varias descargas concurrentes
+respetan el retardo de cortesía con cada servidor sin bloquearse
+cuando apuntan a hosts distintos. Cada host puede tener su propio
+retardo (p. ej. el Crawl-delay de su robots.txt, ver set_delay).
+"""
+import threading  # Para proteger el estado compartido entre hilos
+import time  # Para medir el tiempo y dormir entre peticiones
+from urllib.parse import urlparse  # Para extraer el host de cada URL
+from config import RATE_LIMIT_DELAY  # Retardo por defecto entre peticiones al mismo host
+
+
+class HostRateLimiter:
+    def __init__(self, delay=RATE_LIMIT_DELAY):
+        """
+        Constructor de la clase HostRateLimiter.
+
+        Args:
+            delay (float): Segundos mínimos entre dos peticiones al mismo host.
+        """
+        self.delay = delay  # Retardo por defecto entre peticiones al mismo host
+        self._delays = {}  # host -> retardo propio del host (p. ej. Crawl-delay)
+        self._next_allowed = {}  # host -> instante (monotonic) de la siguiente petición permitida
+        self._lock = threading.Lock()  # Protege _next_allowed frente a accesos concurrentes
+
+    @staticmethod
+    def host_of(url):
+        """
+        Obtiene el host (dominio y puerto) de una URL.
+
+        Args:
+            url (str): URL completa.
+
+        Returns:
+            str: Host en minúsculas, o cadena vacía si la URL no tiene host.
+        """
+        return urlparse(url).netloc.lower()
+
+    def set_delay(self, url, delay):
+        """
+        Fija el retardo entre peticiones al host de una URL.
+
+        Args:
+            url (str): URL de cualquier página del host.
+            delay (float): Segundos entre peticiones. None = retardo por defecto.
+        """
+        host = self.host_of(url)
+        with self._lock:
+            if delay is None:
+                self._delays.pop(host, None)
+            else:
+                self._delays[host] = delay
+
+    def delay_for(self, url):
+        """
+        Devuelve el retardo entre peticiones al host de una URL.
+        """
+        return self._delays.get(self.host_of(url), self.delay)
+
+    def wait(self, url):
+        """
+        Bloquea hasta que se pueda hacer una petición al host de la URL.
+        Reserva el turno dentro del lock y duerme fuera de él, de modo que
+        los hilos que esperan a hosts distintos no se bloquean entre sí.
+
+        Args:
+            url (str): URL que se va a descargar.
+
+        Returns:
+            float: Segundos que se ha esperado.
+        """
+        host = self.host_of(url)
+
+        with self._lock:
+            now = time.monotonic()
+            # La petición sale ahora o cuando termine el turno ya reservado para el host
+            ready_at = max(now, self._next_allowed.get(host, now))
+            # Reserva el siguiente turno para este host
+            self._next_allowed[host] = ready_at + self._delays.get(host, self.delay)
+
+        waited = ready_at - now
+        if waited > 0:
+            time.sleep(waited)
+        return waited
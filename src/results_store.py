@@ -0,0 +1,310 @@
+"""
+Almacén de resultados en SQLite.
+Guarda cada resultado en formato largo (timestamp, name, metric, value):
+una fila por métrica (url, conteos de keywords, status, error...), con un
+índice único por (timestamp, name, metric). Así:
+- Añadir una ejecución cuesta lo mismo sea cual sea el historial
+- Las consultas históricas (p. ej. evolución de una keyword) usan índices
+  en lugar de abrir el Excel completo
+- El modo WAL permite leer mientras se escribe y serializa las escrituras
+  concurrentes sin corromper el archivo
+
+El Excel con el formato de siempre se genera bajo demanda con export_excel.
+La tabla offers guarda cada oferta nueva (ver seen_offers.py) con la
+ejecución en la que apareció por primera vez.
+
+Uso (desde la raíz del repositorio):
+    python src/results_store.py --import-excel   # Carga los Excel actuales (único y mensuales) en la base de datos
+    python src/results_store.py --export         # Regenera los Excel (por mes) desde la base de datos
+"""
+import os  # Para crear el directorio de la base de datos
+import sqlite3  # Base de datos embebida de la librería estándar
+from contextlib import contextmanager, nullcontext  # Para agrupar escrituras en una transacción
+from config import RESULTS_DB, RESULTS_BATCH_SIZE, EXCEL_FILE, EXCEL_ROTATION  # Rutas, tamaño de lote y rotación del Excel
+
+# Claves de cada resultado que identifican la fila (el resto son métricas)
+KEY_COLUMNS = ('timestamp', 'name')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    timestamp TEXT NOT NULL,
+    name TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_results_key ON results (timestamp, name, metric);
+CREATE INDEX IF NOT EXISTS idx_results_metric ON results (name, metric, timestamp);
+CREATE TABLE IF NOT EXISTS offers (
+    timestamp TEXT NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT,
+    link TEXT,
+    start TEXT,
+    "end" TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_offers_name ON offers (name, timestamp);
+"""
+
+
+class ResultsStore:
+    def __init__(self, filepath=RESULTS_DB):
+        """
+        Constructor de la clase ResultsStore. Abre (o crea) la base de datos.
+
+        Args:
+            filepath (str): Ruta del archivo SQLite.
+        """
+        self.filepath = filepath
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+
+        # timeout: espera a que otra ejecución termine de escribir en lugar de fallar
+        self.connection = sqlite3.connect(filepath, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(_SCHEMA)
+        self._in_transaction = False  # Dentro de transaction(): las escrituras no confirman
+
+    @contextmanager
+    def transaction(self):
+        """
+        Agrupa varias escrituras en una sola transacción: se confirman al
+        salir del bloque sin errores y se deshacen si hay una excepción.
+        Permite guardar los resultados solo si el resto del guardado de la
+        ejecución (Excel, estado) también termina.
+
+        Ejemplo:
+            with store.transaction():
+                store.insert_results(results)
+                store.insert_offers(offers)
+                guardar_estado()
+        """
+        self._in_transaction = True
+        try:
+            with self.connection:
+                yield self
+        finally:
+            self._in_transaction = False
+
+    def _writing(self):
+        """
+        Contexto de una escritura: su propia transacción, o ninguno si ya
+        está dentro de transaction().
+        """
+        return nullcontext() if self._in_transaction else self.connection
+
+    def insert_results(self, results, batch_size=RESULTS_BATCH_SIZE):
+        """
+        Inserta los resultados de una ejecución en una sola transacción,
+        en lotes de executemany. Si un (timestamp, name, metric) ya existe,
+        se sustituye su valor.
+
+        Args:
+            results (list): Lista de diccionarios devueltos por el scraper.
+            batch_size (int): Filas por llamada a executemany.
+
+        Returns:
+            int: Número de métricas guardadas.
+        """
+        rows = [
+            (result.get('timestamp'), result.get('name'), metric, value)
+            for result in results
+            for metric, value in sorted(result.items())
+            if metric not in KEY_COLUMNS and value is not None and value != ''
+        ]
+
+        with self._writing():  # Transacción: todo o nada
+            for start in range(0, len(rows), batch_size):
+                self.connection.executemany(
+                    'INSERT OR REPLACE INTO results (timestamp, name, metric, value) VALUES (?, ?, ?, ?)',
+                    rows[start:start + batch_size]
+                )
+        return len(rows)
+
+    def history(self, name, metric):
+        """
+        Devuelve la evolución de una métrica de una fuente.
+
+        Args:
+            name (str): Nombre de la fuente (clave "name" de urls_config.json).
+            metric (str): Métrica (p. ej. "psicolog" o "titulo_python").
+
+        Returns:
+            list: Lista de (timestamp, value) ordenada por fecha.
+        """
+        return self.connection.execute(
+            'SELECT timestamp, value FROM results WHERE name = ? AND metric = ? ORDER BY timestamp',
+            (name, metric)
+        ).fetchall()
+
+    def iter_runs(self):
+        """
+        Recorre las ejecuciones guardadas en orden, reconstruyendo los
+        diccionarios de resultados tal y como los devolvió el scraper.
+
+        Yields:
+            list: Resultados de una ejecución (mismo timestamp), en el orden en
+                  que se insertaron.
+        """
+        cursor = self.connection.execute(
+            'SELECT timestamp, name, metric, value FROM results ORDER BY timestamp, rowid'
+        )
+        current_timestamp = None
+        run = {}  # name -> resultado (los diccionarios conservan el orden de inserción)
+        for timestamp, name, metric, value in cursor:
+            if timestamp != current_timestamp:
+                if run:
+                    yield list(run.values())
+                current_timestamp = timestamp
+                run = {}
+            result = run.setdefault(name, {'timestamp': timestamp, 'name': name})
+            result[metric] = value
+        if run:
+            yield list(run.values())
+
+    def insert_offers(self, offers):
+        """
+        Guarda las ofertas nuevas de una ejecución (ver SeenOffersIndex.diff).
+
+        Args:
+            offers (list): Ofertas con timestamp, name, title, link, start y end.
+
+        Returns:
+            int: Número de ofertas guardadas.
+        """
+        with self._writing():
+            self.connection.executemany(
+                'INSERT INTO offers (timestamp, name, title, link, start, "end") VALUES (?, ?, ?, ?, ?, ?)',
+                [(offer['timestamp'], offer['name'], offer.get('title'), offer.get('link'),
+                  offer.get('start'), offer.get('end')) for offer in offers]
+            )
+        return len(offers)
+
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        self.connection.close()
+
+
+def save_results(results, filepath=RESULTS_DB, offers=None):
+    """
+    Función auxiliar que guarda los resultados de una ejecución en la base de datos.
+
+    Args:
+        results (list): Lista de diccionarios con los resultados a guardar.
+        filepath (str): Ruta del archivo SQLite.
+        offers (list): Ofertas nuevas de la ejecución (opcional).
+    """
+    store = ResultsStore(filepath)
+    try:
+        count = store.insert_results(results)
+        print(f"{count} métricas guardadas en {filepath}")
+        if offers:
+            print(f"{store.insert_offers(offers)} oferta(s) nueva(s) guardadas en {filepath}")
+    finally:
+        store.close()
+
+
+def export_excel(excel_path=None, filepath=RESULTS_DB, rotation=EXCEL_ROTATION):
+    """
+    Genera el Excel con el formato habitual (una fila por fuente y ejecución,
+    columnas en el orden en que fueron apareciendo) a partir de la base de datos.
+    Cada ejecución va al archivo que le corresponde según la rotación (ver
+    excel_path_for), igual que en una ejecución normal. Sustituye el
+    contenido de los archivos generados.
+
+    Args:
+        excel_path (str): Archivo Excel único a generar (None = según la rotación).
+        filepath (str): Ruta del archivo SQLite.
+        rotation (str): 'none' o 'monthly' (solo si excel_path es None).
+
+    Returns:
+        dict: Ejecuciones exportadas por archivo Excel.
+    """
+    from excel_handler import ExcelHandler, excel_path_for  # Import diferido: solo se necesita al exportar
+
+    store = ResultsStore(filepath)
+    handler = None
+    exported = {}
+    try:
+        # Las ejecuciones salen ordenadas por timestamp: las de cada mes van seguidas
+        for run in store.iter_runs():
+            target = excel_path or excel_path_for(run[0]['timestamp'], EXCEL_FILE, rotation)
+            if handler is None or handler.filepath != target:
+                if handler is not None:
+                    handler.save()
+                    handler.close()
+                handler = ExcelHandler(target)
+                handler.create()
+            # Misma lógica de columnas que una ejecución normal
+            handler.append_results(run)
+            exported[target] = exported.get(target, 0) + 1
+        if handler is not None:
+            handler.save()
+        for target, runs in exported.items():
+            print(f"{runs} ejecuciones exportadas a {target}")
+        return exported
+    finally:
+        if handler is not None:
+            handler.close()
+        store.close()
+
+
+def import_excel(excel_paths=None, filepath=RESULTS_DB):
+    """
+    Carga en la base de datos el historial de los Excel existentes
+    (para empezar a usar el almacén sin perder los datos anteriores).
+    Importar dos veces el mismo archivo no duplica filas.
+
+    Args:
+        excel_paths (list): Archivos Excel a importar (None = el archivo
+                            único y todos los mensuales que existan).
+        filepath (str): Ruta del archivo SQLite.
+
+    Returns:
+        int: Número de filas (fuente y ejecución) importadas.
+    """
+    import openpyxl  # Import diferido: solo se necesita al importar
+    from excel_handler import existing_excel_files
+
+    if excel_paths is None:
+        excel_paths = existing_excel_files(EXCEL_FILE)
+    if not excel_paths:
+        print(f"No hay archivos Excel que importar ({EXCEL_FILE} ni mensuales)")
+        return 0
+
+    results = []
+    for excel_path in excel_paths:
+        workbook = openpyxl.load_workbook(excel_path, read_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = next(rows, ())
+            results.extend(
+                {header: value for header, value in zip(headers, row) if header}
+                for row in rows
+            )
+        finally:
+            workbook.close()
+        print(f"Leído {excel_path}")
+
+    save_results(results, filepath)
+    return len(results)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Almacén de resultados en SQLite")
+    arg_parser.add_argument('--export', action='store_true',
+                            help="Regenera el Excel desde la base de datos (un archivo por mes con "
+                                 "la rotación mensual, ver SCRAPER_EXCEL_ROTATION)")
+    arg_parser.add_argument('--import-excel', action='store_true',
+                            help="Carga en la base de datos el Excel único y los mensuales que existan")
+    args = arg_parser.parse_args()
+
+    if args.import_excel:
+        import_excel()
+    if args.export:
+        export_excel()
+    if not (args.import_excel or args.export):
+        arg_parser.print_help()
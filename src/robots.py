@@ -0,0 +1,222 @@
+"""
+Reglas de robots.txt por host.
+Cada robots.txt se descarga una sola vez y se guarda (el texto, con su
+código HTTP y la fecha de descarga) en ROBOTS_CACHE_FILE; mientras no pase
+ROBOTS_TTL se reutiliza entre ejecuciones sin volver a pedirlo. Las reglas
+se interpretan con urllib.robotparser:
+
+- 200: se aplican las reglas del archivo (grupo de USER_AGENT o '*').
+- 401 / 403: se considera prohibido todo el sitio.
+- Otros 4xx (p. ej. 404): no hay restricciones.
+- 5xx o error de red: no hay restricciones, pero el resultado no se
+  guarda en disco y se vuelve a pedir en la siguiente ejecución (o a los
+  10 minutos en el modo residente).
+
+El Crawl-delay del host (o su Request-rate) sustituye al RATE_LIMIT_DELAY
+de ese host en HostRateLimiter, con un máximo de ROBOTS_MAX_DELAY.
+
+Uso (desde la raíz del repositorio):
+    python src/robots.py https://www.usc.gal/gl/emprego   # Reglas para una URL
+"""
+import json  # Para la caché en disco
+import os  # Para rutas y escrituras atómicas
+import threading  # Una descarga por host aunque varios hilos lo pidan a la vez
+import time  # Para la caducidad de la caché
+from urllib.parse import urlsplit  # Para obtener el origen de cada URL
+from urllib.robotparser import RobotFileParser  # Intérprete de robots.txt de la librería estándar
+from config import ROBOTS_CACHE_FILE, ROBOTS_TTL, ROBOTS_MAX_DELAY, USER_AGENT  # Caché, caducidad y agente
+
+# Segundos tras los que se vuelve a pedir un robots.txt que no respondió
+_UNREACHABLE_RETRY = 600
+
+
+def robots_url(url):
+    """
+    URL del robots.txt que corresponde a una URL (esquema y host de la URL).
+
+    Args:
+        url (str): URL de cualquier página del sitio.
+
+    Returns:
+        str: URL del robots.txt (p. ej. https://www.usc.gal/robots.txt).
+    """
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}/robots.txt"
+
+
+class RobotsCache:
+    def __init__(self, fetch, filepath=ROBOTS_CACHE_FILE, ttl=ROBOTS_TTL, user_agent=USER_AGENT):
+        """
+        Constructor de la clase RobotsCache.
+
+        Args:
+            fetch (callable): Descarga un robots.txt: fetch(url) -> (status, text).
+                              Debe lanzar una excepción si no hay respuesta.
+            filepath (str): Ruta del archivo JSON de la caché ('' = solo en memoria).
+            ttl (float): Segundos durante los que se reutiliza un robots.txt.
+            user_agent (str): Agente cuyas reglas se aplican.
+        """
+        self.fetch = fetch
+        self.filepath = filepath
+        self.ttl = ttl
+        self.user_agent = user_agent
+        self.fetched = 0  # robots.txt descargados en esta ejecución
+        self._parsers = {}  # URL del robots.txt -> RobotFileParser
+        self._host_locks = {}  # URL del robots.txt -> lock de su descarga
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        """
+        Carga la caché desde disco.
+
+        Returns:
+            dict: Entradas por URL del robots.txt. Vacío si no existe o está corrupta.
+        """
+        if not self.filepath or not os.path.exists(self.filepath):
+            return {}
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            # Una caché dañada no debe impedir la ejecución: se vuelven a descargar
+            print(f"Advertencia: caché de robots.txt ignorada ({e})")
+            return {}
+
+    @staticmethod
+    def _parse(entry):
+        """
+        Construye el intérprete de un robots.txt a partir de su entrada en la caché.
+        """
+        parser = RobotFileParser()
+        status = entry['status']
+        if status in (401, 403):
+            parser.disallow_all = True
+        elif 400 <= status < 500:
+            parser.allow_all = True
+        else:
+            parser.parse(entry['text'].splitlines())
+        parser.modified()  # Sin fecha de lectura, robotparser lo prohíbe todo
+        return parser
+
+    def rules(self, url):
+        """
+        Devuelve las reglas del host de una URL, descargando su robots.txt
+        si no está en la caché o ha caducado.
+
+        Args:
+            url (str): URL de cualquier página del sitio.
+
+        Returns:
+            RobotFileParser: Reglas del host.
+        """
+        key = robots_url(url)
+        with self._lock:
+            lock = self._host_locks.setdefault(key, threading.Lock())
+
+        # Un lock por host: el resto de hosts se resuelven en paralelo
+        with lock:
+            entry = self._entries.get(key)
+            ttl = _UNREACHABLE_RETRY if entry and entry.get('unreachable') else self.ttl
+            if entry is None or time.time() - entry['fetched'] >= ttl:
+                entry = self._download(key)
+                with self._lock:
+                    self._entries[key] = entry
+                self._parsers.pop(key, None)
+
+            parser = self._parsers.get(key)
+            if parser is None:
+                parser = self._parsers[key] = self._parse(entry)
+            return parser
+
+    def _download(self, key):
+        """
+        Descarga un robots.txt.
+
+        Returns:
+            dict: Entrada de la caché (status, text, fetched y, si no hubo
+                  respuesta válida, unreachable).
+        """
+        try:
+            status, text = self.fetch(key)
+        except Exception as e:
+            status, text = None, str(e)
+        self.fetched += 1
+
+        if status is None or status >= 500:
+            # Sin respuesta válida: no se restringe nada, pero tampoco se guarda
+            # en disco (se vuelve a pedir pasados unos minutos o en la próxima ejecución)
+            print(f"Advertencia: no se pudo leer {key} ({status or text}); se permite el acceso")
+            return {'status': 404, 'text': '', 'fetched': time.time(), 'unreachable': True}
+        return {'status': status, 'text': text, 'fetched': time.time()}
+
+    def allowed(self, url):
+        """
+        Indica si robots.txt permite descargar una URL.
+        """
+        return self.rules(url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url):
+        """
+        Retardo entre peticiones que pide el host de una URL: su Crawl-delay,
+        o si no lo tiene, el equivalente de su Request-rate.
+
+        Args:
+            url (str): URL de cualquier página del sitio.
+
+        Returns:
+            float: Segundos entre peticiones (como máximo ROBOTS_MAX_DELAY),
+                   o None si el host no indica ninguno.
+        """
+        parser = self.rules(url)
+        delay = parser.crawl_delay(self.user_agent)
+        if delay is None:
+            rate = parser.request_rate(self.user_agent)
+            if rate is not None and rate.requests > 0:
+                delay = rate.seconds / rate.requests
+        if delay is None:
+            return None
+        if delay > ROBOTS_MAX_DELAY:
+            print(f"Advertencia: {robots_url(url)} pide {delay} s entre peticiones; se usan {ROBOTS_MAX_DELAY} s")
+            return float(ROBOTS_MAX_DELAY)
+        return float(delay)
+
+    def save(self):
+        """
+        Guarda la caché en disco, sin las entradas caducadas.
+        La escritura es atómica para no dejar el archivo a medias.
+        """
+        if not self.filepath:
+            return
+        now = time.time()
+        with self._lock:
+            entries = {key: entry for key, entry in self._entries.items()
+                       if not entry.get('unreachable') and now - entry['fetched'] < self.ttl}
+
+        directory = os.path.dirname(self.filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.filepath}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.filepath)
+
+
+if __name__ == "__main__":
+    import sys
+    import urllib.request
+
+    def fetch(url):
+        # Descarga directa (sin la sesión del scraper) solo para la comprobación manual
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, response.read().decode('utf-8', errors='replace')
+        except urllib.error.HTTPError as e:
+            return e.code, ''
+
+    robots = RobotsCache(fetch, filepath='')
+    for url in sys.argv[1:]:
+        print(f"{url}: {'permitida' if robots.allowed(url) else 'prohibida'}"
+              f" (Crawl-delay: {robots.crawl_delay(url)})")
@@ -5,24 +5,51 @@ de las diferentes fuentes web configuradas.
 Implementa scraping genérico basado en configuración JSON con soporte para:
 - Conteo de palabras clave en áreas específicas del HTML
 - Búsqueda en todo el HTML si no se especifican áreas
-- Rate limiting para respetar robots.txt
+- robots.txt por host: las URLs prohibidas no se descargan y el
+  Crawl-delay de cada host fija su retardo entre peticiones
+- Rate limiting por host
+- Descarga concurrente de URLs manteniendo el orden de la configuración
+- Listados paginados: se siguen los enlaces de paginación (bloque
+  "pagination") y las páginas se agregan en un único resultado por fuente
 """
 
 # Importaciones necesarias
-import requests  # Para realizar peticiones HTTP
-from bs4 import BeautifulSoup  # Para parsear y analizar HTML
+# requests, BeautifulSoup y los workers de parseo se importan solo cuando se
+# usan (ver http, fetch_page, parsers.parse y scrape_all): así arrancar el
+# scraper no cuesta sus imports si ninguna página llega a descargarse o parsearse
+import threading  # Para las estadísticas de descarga compartidas entre hilos
+import time  # Para separar los tiempos de conexión del de la petición
 from datetime import datetime  # Para manejar fechas y timestamps
-import json  # Para procesamiento de JSON y lectura de configuración
-import time  # Para implementar delays entre peticiones (rate limiting)
-import os  # Para verificar existencia de archivos
-from config import REQUEST_TIMEOUT, USER_AGENT, URLS_CONFIG, RATE_LIMIT_DELAY  # Configuraciones globales
+from concurrent.futures import ThreadPoolExecutor  # Para descargar varias URLs en paralelo
+from config import (  # Configuraciones globales
+    REQUEST_TIMEOUT, USER_AGENT, MAX_WORKERS, HTTP_CACHE_ENABLED, MAX_RESPONSE_BYTES,
+    PARSE_WORKERS, PARSE_QUEUE_SIZE, SNAPSHOTS_ENABLED, PAGINATION_WORKERS, ROBOTS_ENABLED, ROBOTS_MAX_BYTES
+)
+from rate_limiter import HostRateLimiter  # Rate limiting por host
+from robots import RobotsCache  # Reglas y Crawl-delay de robots.txt por host
+from http_cache import ValidatorCache, body_hash  # Caché de peticiones condicionales
+import parsers  # Motores de parseo HTML intercambiables (html.parser, lxml, selectolax)
+from streaming import read_body  # Descarga por bloques con límite de bytes
+from processors import get_plan, parse_and_extract  # Planes compilados por URL, registro de procesadores y parseo
+from metrics import RunMetrics  # Tiempos y recursos por URL y etapa
+from snapshots import SnapshotArchive  # Archivo comprimido de las páginas descargadas
+from urls_config import load_urls_config  # urls_config.json validado (con copia por fecha de modificación)
+from frontier import CrawlFrontier  # Páginas pendientes y vistas de los listados paginados
+
+# Claves de un resultado que no son datos extraídos
+_RESULT_META = ('timestamp', 'url', 'name')
 
 
 class WebScraper:
-    def __init__(self):
+    def __init__(self, urls_config=None, metrics=None):
         """
         Constructor de la clase WebScraper.
         Inicializa las cabeceras HTTP, el timestamp de ejecución y carga la configuración.
+        
+        Args:
+            urls_config (list): Configuración de URLs a usar. Si es None se
+                                carga desde URLS_CONFIG.
+            metrics (RunMetrics): Métricas de la ejecución (None = se crean nuevas).
         """
         # Configura el User-Agent para las peticiones HTTP (simula un navegador real)
         self.headers = {'User-Agent': USER_AGENT}
@@ -30,284 +57,627 @@ class WebScraper:
         # Timestamp de ejecución en formato YYYY-MM-DD HH:MM:SS
         self.timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
-        # Carga la configuración de URLs desde el archivo JSON
-        self.urls_config = self._load_config()
+        # Carga la configuración de URLs desde el archivo JSON (si no se proporciona)
+        self.urls_config = self._load_config() if urls_config is None else urls_config
+        
+        # Controla el retardo entre peticiones a un mismo host (compartido entre hilos)
+        self.rate_limiter = HostRateLimiter()
+        
+        # Reglas de robots.txt por host (guardadas en disco con caducidad)
+        self.robots = RobotsCache(self._fetch_robots) if ROBOTS_ENABLED else None
+        
+        # Sesión HTTP compartida: reutiliza conexiones por host y reintenta fallos
+        # transitorios (se crea con la primera petición, ver la propiedad http)
+        self._http = None
+        
+        # Caché de validadores (ETag / Last-Modified) y resultados entre ejecuciones
+        self.cache = ValidatorCache() if HTTP_CACHE_ENABLED else None
+        
+        # Archivo de las páginas descargadas (para repetir la extracción sin red)
+        self.snapshots = SnapshotArchive() if SNAPSHOTS_ENABLED else None
+        
+        # Estadísticas de descarga por URL (bytes, corte por límite, parada temprana)
+        # Las páginas de un listado paginado se acumulan en su fuente
+        self.download_stats = {}
+        self._stats_lock = threading.Lock()
+        
+        # Tiempos por URL y etapa (espera, petición, descarga, parseo, extracción)
+        self.metrics = metrics if metrics is not None else RunMetrics(self.timestamp)
+    
+    @property
+    def http(self):
+        """
+        Sesión HTTP compartida (PooledSession). Se crea con la primera petición.
+        """
+        if self._http is None:
+            from http_session import PooledSession  # Import diferido: importa requests
+            self._http = PooledSession(headers=self.headers)
+        return self._http
     
     def _load_config(self):
         """
-        Carga la configuración de URLs desde el archivo JSON.
+        Carga la configuración de URLs desde el archivo JSON, validada
+        (ver urls_config.load_urls_config).
         
         Returns:
             list: Lista de diccionarios con la configuración de cada URL.
                   Retorna una lista vacía si el archivo no existe o hay error.
         """
         try:
-            # Verifica si el archivo de configuración existe
-            if not os.path.exists(URLS_CONFIG):
-                print(f"Advertencia: No se encontró el archivo {URLS_CONFIG}")
-                return []
-            
-            # Lee y parsea el archivo JSON
-            with open(URLS_CONFIG, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
+            config = load_urls_config()
             print(f"Configuración cargada: {len(config)} URL(s) encontradas")
             return config
             
-        except json.JSONDecodeError as e:
-            # Error al parsear el JSON (formato incorrecto)
-            print(f"Error al parsear {URLS_CONFIG}: {e}")
-            return []
         except Exception as e:
             # Cualquier otro error al cargar la configuración
             print(f"Error cargando configuración: {e}")
             return []
     
-    def count_keywords_in_area(self, soup, area_selector, keywords):
+    def fetch_page(self, url, extra_headers=None):
         """
-        Cuenta las ocurrencias de palabras clave en un área específica del HTML.
+        Descarga las cabeceras de una URL con la sesión compartida.
+        Usa conexiones keep-alive y reintenta con backoff los errores
+        transitorios (429, 5xx, conexión). El cuerpo no se lee todavía
+        (stream=True): se obtiene después con download_body.
         
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup con el HTML parseado.
-            area_selector (str): Selector CSS del área donde buscar (ej: "article", "h1, h2").
-            keywords (list): Lista de palabras clave a buscar.
+            url (str): URL del sitio a descargar.
+            extra_headers (dict): Cabeceras adicionales (p. ej. condicionales).
             
         Returns:
-            dict: Diccionario con el conteo de cada palabra clave en el área.
-                  Formato: {keyword: count}
+            requests.Response: Respuesta HTTP (200 o 304), o None si hay error.
         """
-        # Inicializa el diccionario de resultados con ceros
-        counts = {keyword: 0 for keyword in keywords}
-        
-        # Busca todos los elementos que coincidan con el selector
-        elements = soup.select(area_selector)
+        import requests  # Import diferido: solo si hay que descargar
         
-        # Combina el texto de todos los elementos encontrados
-        text = ' '.join([elem.get_text().lower() for elem in elements])
-        
-        # Cuenta cada palabra clave en el texto (búsqueda case-insensitive)
-        for keyword in keywords:
-            counts[keyword] = text.count(keyword.lower())
-        
-        return counts
+        try:
+            # Realizar la petición HTTP con la sesión compartida (headers ya configurados)
+            response = self.http.get(
+                url,  # URL a consultar
+                headers=extra_headers,  # Cabeceras condicionales (If-None-Match, ...)
+                timeout=REQUEST_TIMEOUT,  # Timeout de la petición en segundos
+                stream=True  # El cuerpo se lee por bloques en download_body
+            )
+            response.raise_for_status()  # Lanza excepción si hay error HTTP (4xx, 5xx)
+            return response
+            
+        except requests.exceptions.Timeout:
+            # Error específico de timeout
+            print(f"Timeout al acceder a {url}")
+            return None
+        except requests.exceptions.RequestException as e:
+            # Otros errores de petición HTTP
+            print(f"Error de petición HTTP en {url}: {e}")
+            return None
+        except Exception as e:
+            # Cualquier otro error inesperado
+            print(f"Error inesperado en {url}: {e}")
+            return None
     
-    def count_keywords_in_whole_page(self, soup, keywords):
+    def _fetch_robots(self, url):
         """
-        Cuenta las ocurrencias de palabras clave en todo el HTML de la página.
+        Descarga un robots.txt con la sesión compartida (ver RobotsCache),
+        respetando el retardo del host como cualquier otra petición.
         
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup con el HTML parseado.
-            keywords (list): Lista de palabras clave a buscar.
+            url (str): URL del robots.txt.
             
         Returns:
-            dict: Diccionario con el conteo de cada palabra clave.
-                  Formato: {keyword: count}
+            tuple: (status, text). text está vacío si status no es 200.
         """
-        # Inicializa el diccionario de resultados con ceros
-        counts = {keyword: 0 for keyword in keywords}
+        self.rate_limiter.wait(url)
+        response = self.http.get(url, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return response.status_code, ''
+        response.encoding = 'utf-8'  # robots.txt es UTF-8 aunque no lo indique la cabecera
+        return 200, read_body(response, ROBOTS_MAX_BYTES)['text']
+    
+    def _load_robots(self, workers):
+        """
+        Lee (de la caché o del servidor) el robots.txt de cada host de la
+        configuración, en paralelo, y aplica su Crawl-delay al rate limiter.
         
-        # Obtiene todo el texto de la página en minúsculas
-        text = soup.get_text().lower()
+        Args:
+            workers (int): Hilos para descargar los robots.txt.
+            
+        Returns:
+            list: Nombres de las URLs que robots.txt no permite descargar.
+        """
+        # Una URL por host (basta para leer su robots.txt)
+        hosts = {}
+        for config in self.urls_config:
+            hosts.setdefault(self.rate_limiter.host_of(config['url']), config['url'])
         
-        # Cuenta cada palabra clave en el texto completo
-        for keyword in keywords:
-            counts[keyword] = text.count(keyword.lower())
+        fetched = self.robots.fetched
+        with self.metrics.stage('robots') as fields:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(hosts)))) as executor:
+                delays = list(executor.map(self.robots.crawl_delay, hosts.values()))
+            for url, delay in zip(hosts.values(), delays):
+                self.rate_limiter.set_delay(url, delay)
+            fields['hosts'] = len(hosts)
+            fields['fetched'] = self.robots.fetched - fetched  # Los demás vienen de la caché
         
-        return counts
+        return [config['name'] for config in self.urls_config if not self.robots.allowed(config['url'])]
     
-    def check_uvigo_profesor(self, soup):
+    def download_body(self, url, response, max_bytes=MAX_RESPONSE_BYTES, stop_roots=None):
         """
-        Procesa la página de UVigo Profesor para buscar ofertas activas.
-        Método específico heredado de la implementación original.
+        Lee el cuerpo de una respuesta por bloques, con límite de bytes y
+        parada temprana opcional (ver streaming.read_body).
         
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup con el HTML parseado.
+            url (str): URL descargada (para los mensajes de error).
+            response (requests.Response): Respuesta obtenida con fetch_page.
+            max_bytes (int): Máximo de bytes a descargar.
+            stop_roots (list): Contenedores tras cuyo cierre se para la descarga.
             
         Returns:
-            str: "YES" si hay ofertas activas, "NO" si no hay, "ERROR" en caso de error.
+            dict: Cuerpo y estadísticas de la descarga, o None si hay error.
         """
+        import requests  # Import diferido: solo si hay que descargar
+        
         try:
-            # Buscar todos los elementos de oferta de empleo
-            rows = soup.select("div.row.uvigo-row-nopadding")
-            
-            # Itera sobre cada oferta encontrada
-            for row in rows:
-                # Encontrar el elemento que contiene el plazo
-                plazo_text = row.select_one("div.uvigo-card-summary strong:contains('Plazo:')")
-                if plazo_text:
-                    # Extraer el texto de las fechas (formato DD/MM/YYYY – DD/MM/YYYY)
-                    dates_text = plazo_text.find_next_sibling(string=True)
-                    if dates_text:
-                        # Convertir las fechas de texto a objetos datetime para comparación
-                        start_date, end_date = [
-                            datetime.strptime(d.strip(), '%d/%m/%Y')
-                            for d in dates_text.split('–')
-                        ]
-                        current_date = datetime.now()
-                        
-                        # Verificar si la fecha actual está dentro del rango del plazo
-                        if start_date <= current_date <= end_date:
-                            return "YES"  # Hay al menos una oferta activa
-            
-            return "NO"  # No se encontraron ofertas activas
-            
-        except Exception as e:
-            # Manejo de errores en el procesamiento
-            print(f"Error procesando UVigo: {e}")
-            return "ERROR"
+            body = read_body(response, max_bytes, stop_roots)
+        except requests.exceptions.RequestException as e:
+            # Errores de red durante la lectura del cuerpo
+            print(f"Error de petición HTTP en {url}: {e}")
+            return None
+        
+        if body['truncated']:
+            print(f"Advertencia: {url} supera {max_bytes} bytes; se procesa solo el inicio")
+        return body
     
-    def check_usc_emprego(self, soup):
+    def parse_html(self, html, backend=None, parse_only=None):
         """
-        Procesa la página de USC Emprego buscando ofertas de psicología.
-        Método específico heredado de la implementación original.
+        Parsea el HTML descargado con el motor configurado.
         
         Args:
-            soup (BeautifulSoup): Objeto BeautifulSoup con el HTML parseado.
+            html (str): Contenido HTML de la página.
+            backend (str): Motor de parseo ('html.parser', 'lxml', 'selectolax').
+                           None usa PARSER_BACKEND de config.
+            parse_only (tuple): Selectores raíz para parsear solo esos subárboles.
             
         Returns:
-            str: "YES" si hay ofertas con la palabra clave, "NO" si no hay, 
-                 "ERROR" si hay problemas al procesar.
+            BeautifulSoup: Objeto con el HTML parseado (o documento compatible).
         """
-        try:
-            # Buscar el contenedor principal de ofertas
-            container = soup.select_one("div#NHrsmAWmGreTiSMyIMnwjg-OkgfJwm")
-            if not container:
-                return "ERROR"  # No se encontró el contenedor principal
-            
-            # Buscar todos los enlaces de ofertas dentro del contenedor
-            job_links = container.select("div.ml-specs.is-job h2.at-title a")
-            
-            # Revisar cada oferta buscando la palabra clave
-            for link in job_links:
-                if "psicolog" in link.text.lower():  # Búsqueda case-insensitive
-                    return "YES"  # Se encontró al menos una oferta relevante
-            
-            return "NO"  # No se encontraron ofertas relevantes
+        return parsers.parse(html, backend, parse_only)
+    
+    def _parse_only_selectors(self, config):
+        """
+        Obtiene los selectores raíz del parseo parcial de una URL
+        (ver processors.parse_only_selectors).
+        
+        Args:
+            config (dict): Configuración de la URL.
             
-        except Exception as e:
-            # Manejo de errores en el procesamiento
-            print(f"Error procesando USC: {e}")
-            return "ERROR"
+        Returns:
+            tuple: Selectores raíz, o None si la URL se parsea completa.
+        """
+        return get_plan(config).parse_only
     
-    def scrape_site(self, url):
+    def scrape_site(self, url, backend=None):
         """
         Obtiene y parsea el contenido HTML de una URL.
-        Implementa rate limiting para respetar robots.txt.
         
         Args:
             url (str): URL del sitio a scrapear.
+            backend (str): Motor de parseo a usar (None = el de config).
             
         Returns:
             BeautifulSoup: Objeto con el HTML parseado, o None si hay error.
         """
-        try:
-            # Realizar la petición HTTP con los headers configurados
-            response = requests.get(
-                url,  # URL a consultar
-                headers=self.headers,  # Headers configurados (User-Agent)
-                timeout=REQUEST_TIMEOUT  # Timeout de la petición en segundos
-            )
-            response.raise_for_status()  # Lanza excepción si hay error HTTP (4xx, 5xx)
-            
-            # Parsear el HTML con BeautifulSoup usando el parser html.parser
-            return BeautifulSoup(response.text, 'html.parser')
-            
-        except requests.exceptions.Timeout:
-            # Error específico de timeout
-            print(f"Timeout al acceder a {url}")
+        response = self.fetch_page(url)
+        if response is None:
             return None
-        except requests.exceptions.RequestException as e:
-            # Otros errores de petición HTTP
-            print(f"Error de petición HTTP en {url}: {e}")
+        
+        body = self.download_body(url, response)
+        if body is None:
             return None
+        
+        try:
+            return self.parse_html(body['text'], backend)
         except Exception as e:
-            # Cualquier otro error inesperado
+            # Cualquier error inesperado al parsear
             print(f"Error inesperado en {url}: {e}")
             return None
     
-    def process_url_config(self, config):
+    def extract(self, config, soup):
         """
-        Procesa una URL según su configuración y extrae los datos solicitados.
-        Maneja diferentes tipos de scraping: keyword_check, date_check, o conteo genérico.
+        Extrae los datos solicitados de una página ya parseada.
+        El tipo de procesamiento (keyword_count, date_check, keyword_check...)
+        se resuelve con el registro de procesadores, usando el plan compilado
+        de la URL (ver processors.py).
         
         Args:
-            config (dict): Diccionario con la configuración de la URL:
-                - name: Nombre descriptivo
-                - url: URL a scrapear
-                - type: Tipo de procesamiento (opcional)
-                - keywords: Lista de palabras clave a buscar
-                - search_areas: Diccionario con áreas específicas donde buscar
+            config (dict): Configuración de la URL (ver process_url_config).
+            soup (BeautifulSoup): Objeto BeautifulSoup con el HTML parseado.
+            
+        Returns:
+            dict: Campos extraídos (status, conteos o error), sin timestamp, url ni name.
+        """
+        return get_plan(config).run(soup)
+    
+    def _download(self, config, url=None):
+        """
+        Etapa de red de process_url_config: petición (condicional si hay caché),
+        lectura del cuerpo y comprobación de la caché de resultados.
+        
+        Args:
+            config (dict): Configuración de la URL (ver process_url_config).
+            url (str): Página a descargar (otra página de un listado paginado).
+                       None = la URL de la configuración.
                 
         Returns:
-            dict: Diccionario con los resultados del scraping.
-                  Incluye timestamp, url, name y los conteos/resultados.
+            tuple: (result, job). result es el diccionario de resultados; si la
+                   página necesita parsearse, job contiene el HTML descargado
+                   ('html') y los datos para guardarla en caché. Si no, job es None
+                   y result ya está completo.
         """
+        # Plan compilado de la URL (se compila una sola vez por configuración)
+        plan = get_plan(config)
+        page_url = url  # Solo se anota en el archivo si no es la primera página
+        url = url or plan.url
+        
         # Inicializa el diccionario de resultados con información básica
         result = {
             'timestamp': self.timestamp,  # Fecha y hora de ejecución
-            'url': config['url'],  # URL scrapeada
-            'name': config['name']  # Nombre descriptivo de la fuente
+            'url': plan.url,  # URL scrapeada (la primera página en los listados paginados)
+            'name': plan.name  # Nombre descriptivo de la fuente
         }
+        # En el archivo de páginas, las páginas siguientes de un listado llevan su URL
+        page_meta = {'page_url': page_url} if page_url else {}
+        
+        # Busca el resultado anterior (solo válido si la configuración no ha cambiado)
+        cfg_hash = plan.cfg_hash
+        cached = self.cache.lookup(url, cfg_hash) if self.cache else None
         
-        # Obtiene el HTML de la página
-        soup = self.scrape_site(config['url'])
+        # Las páginas que robots.txt no permite no se piden (tampoco las de los listados)
+        if self.robots is not None and not self.robots.allowed(url):
+            result['error'] = 'Disallowed by robots.txt'
+            return result, None
         
-        if not soup:
+        # Implementa rate limiting: espera si el host se ha consultado hace poco
+        with self.metrics.stage('wait', plan.name):
+            self.rate_limiter.wait(url)
+        
+        # Descarga la página (petición condicional si hay validadores guardados)
+        start = time.perf_counter()
+        response = self.fetch_page(url, ValidatorCache.conditional_headers(cached))
+        elapsed = time.perf_counter() - start
+        
+        # Si se abrió una conexión nueva, DNS, conexión TCP y TLS son etapas
+        # propias, igual que las esperas entre reintentos (backoff y
+        # Retry-After); 'request' queda en el envío y la espera del primer byte
+        connection = self._http.connection_timings() if self._http is not None else {}
+        for phase in ('dns', 'connect', 'tls'):
+            if phase in connection:
+                self.metrics.add(phase, connection[phase], plan.name)
+        retries = getattr(getattr(response, 'raw', None), 'retries', None)
+        if 'backoff' in connection or (retries is not None and retries.history):
+            self.metrics.add('backoff', connection.get('backoff', 0.0), plan.name,
+                             retries=len(retries.history) if retries is not None else None)
+        self.metrics.add('request', max(elapsed - sum(connection.values()), 0.0), plan.name,
+                         status=response.status_code if response is not None else None)
+        
+        if response is None:
             # Si no se pudo obtener el HTML, marca como error
             result['error'] = 'Failed to fetch page'
-            return result
+            return result, None
+        
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        
+        if cached and response.status_code == 304:
+            # El servidor confirma que la página no ha cambiado
+            response.close()
+            if self.snapshots:
+                # La página es la ya archivada con ese hash (si se archivó)
+                self.snapshots.store(self.timestamp, config, cached.get('body_hash'), status=304, **page_meta)
+            self.cache.hit(url, etag, last_modified)
+            # Los datos guardados se evalúan de nuevo (p. ej. los plazos de date_check frente a hoy)
+            result.update(plan.finalize(cached['result']))
+            return result, None
         
-        # Implementa rate limiting: espera entre peticiones
-        time.sleep(RATE_LIMIT_DELAY)
+        # Lee el cuerpo por bloques: límite de bytes y parada al cerrarse los contenedores
+        with self.metrics.stage('download', plan.name) as fields:
+            body = self.download_body(url, response, plan.max_bytes, plan.stop_roots)
+            if body is not None:
+                fields.update((key, body[key]) for key in ('bytes', 'truncated', 'stopped_early'))
+        if body is None:
+            result['error'] = 'Failed to fetch page'
+            return result, None
+        with self._stats_lock:
+            stats = self.download_stats.setdefault(
+                plan.name, {'bytes': 0, 'truncated': False, 'stopped_early': False}
+            )
+            stats['bytes'] += body['bytes']
+            stats['truncated'] |= body['truncated']
+            stats['stopped_early'] |= body['stopped_early']
         
-        # Obtiene el tipo de procesamiento (por defecto: conteo de keywords)
-        processing_type = config.get('type', 'keyword_count')
+        content_hash = body_hash(body['content'])
+        if self.snapshots:
+            # Se archiva el cuerpo tal cual se descargó (una sola copia por contenido)
+            self.snapshots.store(
+                self.timestamp, config, content_hash, body['content'], body['encoding'],
+                status=response.status_code, truncated=body['truncated'], **page_meta
+            )
+        if cached and cached.get('body_hash') == content_hash:
+            # El servidor no soporta validadores, pero el contenido es idéntico
+            self.cache.hit(url, etag, last_modified)
+            result.update(plan.finalize(cached['result']))
+            return result, None
         
-        # ============ Procesamiento específico por tipo ============
+        job = {
+            'html': body['text'],
+            'url': url,
+            'cfg_hash': cfg_hash,
+            'content_hash': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+        return result, job
+    
+    def parse_and_extract(self, config, html):
+        """
+        Etapa de CPU de process_url_config: parsea el HTML y extrae los datos.
         
-        if processing_type == 'date_check':
-            # Tipo especial: verificación de fechas (UVigo)
-            result['status'] = self.check_uvigo_profesor(soup)
+        Args:
+            config (dict): Configuración de la URL.
+            html (str): Contenido HTML descargado.
             
-        elif processing_type == 'keyword_check':
-            # Tipo especial: verificación de presencia de keywords (USC)
-            result['status'] = self.check_usc_emprego(soup)
+        Returns:
+            dict: Datos extraídos, o {'error': ...} si no se pudo parsear.
+        """
+        return parse_and_extract(config, html, self.metrics)
+    
+    def _finish(self, config, result, job, data):
+        """
+        Completa el resultado con los datos extraídos y los guarda en caché.
+        En la caché se guardan los datos de run(), que no dependen de la fecha;
+        el resultado es su evaluación actual (ver UrlPlan.finalize).
+        
+        Args:
+            config (dict): Configuración de la URL.
+            result (dict): Resultado parcial devuelto por _download.
+            job (dict): Datos de la descarga devueltos por _download.
+            data (dict): Datos extraídos por parse_and_extract.
             
-        else:
-            # Procesamiento genérico: conteo de palabras clave
-            keywords = config.get('keywords', [])  # Lista de keywords a buscar
+        Returns:
+            dict: Resultado completo.
+        """
+        # Solo se guardan en caché las extracciones correctas (cada página con su URL)
+        if self.cache and 'error' not in data:
+            self.cache.store(
+                job['url'], job['cfg_hash'], job['content_hash'], data,
+                job['etag'], job['last_modified']
+            )
+        
+        result.update(get_plan(config).finalize(data))
+        return result
+    
+    def process_url_config(self, config):
+        """
+        Procesa una URL según su configuración y extrae los datos solicitados.
+        Si la caché de validación está activa, envía una petición condicional
+        y reutiliza el resultado anterior cuando la página no ha cambiado
+        (respuesta 304 o mismo hash del cuerpo), sin volver a parsear el HTML.
+        
+        Args:
+            config (dict): Diccionario con la configuración de la URL:
+                - name: Nombre descriptivo
+                - url: URL a scrapear
+                - type: Tipo de procesamiento (opcional)
+                - keywords: Lista de palabras clave a buscar
+                - search_areas: Diccionario con áreas específicas donde buscar
+                - whole_word / accent_insensitive: Opciones de coincidencia (opcionales)
+                - parser: Motor de parseo para esta URL (opcional)
+                - parse_only: Selectores raíz para el parseo parcial (opcional)
+                - max_bytes: Máximo de bytes a descargar (opcional)
+                - pagination: Enlaces a seguir en un listado paginado (opcional)
+                
+        Returns:
+            dict: Diccionario con los resultados del scraping.
+                  Incluye timestamp, url, name y los conteos/resultados.
+        """
+        result, job = self._download(config)
+        if job is not None:
+            data = self.parse_and_extract(config, job['html'])
+            result = self._finish(config, result, job, data)
+        
+        if get_plan(config).pagination:
+            # Resto de páginas del listado, agregadas en este mismo resultado
+            result = self._paginate(config, result)
+        return result
+    
+    def _fetch_page(self, config, url, pipeline=None):
+        """
+        Descarga, parsea y extrae una página siguiente de un listado paginado
+        (con la misma caché, límites y archivo que la primera).
+        
+        Args:
+            config (dict): Configuración de la fuente.
+            url (str): URL de la página.
+            pipeline (ParsePipeline): Workers de parseo (None = en este hilo).
             
-            if not keywords:
-                # Si no hay keywords configuradas, marca como error
-                result['error'] = 'No keywords configured'
-                return result
+        Returns:
+            dict: Datos extraídos de la página (con sus enlaces en '_links').
+        """
+        result, job = self._download(config, url)
+        if job is not None:
+            if pipeline is not None:
+                result = self._collect(config, result, job, pipeline.submit(config, job.pop('html')))
+            else:
+                result = self._finish(config, result, job, self.parse_and_extract(config, job['html']))
+        return {key: value for key, value in result.items() if key not in _RESULT_META}
+    
+    def _paginate(self, config, result, pipeline=None):
+        """
+        Recorre el resto de páginas de un listado paginado y agrega sus datos
+        a los de la primera en un único resultado.
+        Las páginas se descubren con el selector "next" y pasan por una
+        frontera que descarta las ya vistas (URLs normalizadas), las de otros
+        hosts y las que superan max_pages. Las páginas conocidas en cada
+        momento se descargan en paralelo (PAGINATION_WORKERS); el límite de
+        peticiones por host se sigue aplicando a cada una. El pool de cada
+        listado es propio, no el de descargas: el hilo que espera a sus
+        páginas no ocupa los hilos que las descargan.
+        
+        Args:
+            config (dict): Configuración de la fuente.
+            result (dict): Resultado de la primera página.
+            pipeline (ParsePipeline): Workers de parseo (None = en los hilos).
             
-            # Obtiene las áreas específicas donde buscar (opcional)
-            search_areas = config.get('search_areas', None)
+        Returns:
+            dict: Resultado con los datos de todas las páginas.
+        """
+        plan = get_plan(config)
+        links = result.pop('_links', [])
+        if 'error' in result or result.get('status') == "ERROR":
+            # Sin la primera página no hay listado que recorrer
+            return result
+        
+        with self.metrics.stage('paginate', plan.name) as fields:
+            frontier = CrawlFrontier(plan.url, plan.pagination['max_pages'])
+            pages = [{key: value for key, value in result.items() if key not in _RESULT_META}]
+            frontier.add_all(links, plan.url)
             
-            if search_areas:
-                # Si hay áreas específicas configuradas, cuenta en cada área
-                for area_name, area_selector in search_areas.items():
-                    # Cuenta keywords en el área específica
-                    counts = self.count_keywords_in_area(soup, area_selector, keywords)
-                    
-                    # Agrega los resultados con el prefijo del área
-                    for keyword, count in counts.items():
-                        result[f"{area_name}_{keyword}"] = count
-            else:
-                # Si no hay áreas específicas, busca en toda la página
-                counts = self.count_keywords_in_whole_page(soup, keywords)
+            while True:
+                batch = frontier.pop_all()
+                if not batch:
+                    break
+                with ThreadPoolExecutor(max_workers=max(1, min(PAGINATION_WORKERS, len(batch)))) as executor:
+                    fetched = list(executor.map(lambda url: self._fetch_page(config, url, pipeline), batch))
                 
-                # Agrega los resultados directamente
-                for keyword, count in counts.items():
-                    result[keyword] = count
+                for url, data in zip(batch, fetched):
+                    links = data.pop('_links', [])
+                    if 'error' in data or data.get('status') == "ERROR":
+                        # Una página que falla no invalida el resto del listado
+                        reason = f" ({data['error']})" if 'error' in data else ''
+                        print(f"Advertencia: {plan.name}: no se pudo procesar {url}{reason}")
+                        continue
+                    pages.append(data)
+                    frontier.add_all(links, url)
+            
+            fields['pages'] = len(pages)
         
+        # Las ofertas de todas las páginas se concatenan; el resto lo agrega el procesador
+        has_offers = '_offers' in pages[0]
+        offers = [offer for page in pages for offer in page.pop('_offers', None) or ()]
+        for key in list(result):
+            if key not in _RESULT_META:
+                del result[key]
+        result.update(plan.merge(pages))
+        if has_offers:
+            result['_offers'] = offers
         return result
     
-    def scrape_all(self):
+    def _download_and_submit(self, pipeline, config):
+        """
+        Tarea de los hilos de descarga cuando el parseo va en procesos aparte:
+        descarga la página y, si hay que parsearla, la envía a los workers
+        (esperando si la cola está llena).
+        
+        Returns:
+            tuple: (result, job, future). future es None si no hay que parsear.
+        """
+        result, job = self._download(config)
+        if get_plan(config).pagination:
+            # Los enlaces de cada página se necesitan antes de seguir: el listado
+            # se recorre en este hilo de descarga, esperando a los workers
+            if job is not None:
+                result = self._collect(config, result, job, pipeline.submit(config, job.pop('html')))
+            return self._paginate(config, result, pipeline), None, None
+        if job is None:
+            return result, None, None
+        # El HTML solo lo conserva la cola de parseo: así la memoria queda acotada por ella
+        return result, job, pipeline.submit(config, job.pop('html'))
+    
+    def _collect(self, config, result, job, future):
+        """
+        Espera a los datos extraídos por un worker y completa el resultado.
+        """
+        if future is None:
+            return result
+        try:
+            data, records = future.result()
+            # Tiempos de parseo y extracción medidos en el worker
+            self.metrics.extend(records)
+        except Exception as e:
+            # El worker falló o se canceló al cerrar el pipeline
+            print(f"Error inesperado al parsear {config['url']}: {e!r}")
+            data = {'error': 'Failed to fetch page'}
+        return self._finish(config, result, job, data)
+    
+    def _print_result(self, idx, total, config, result):
+        """
+        Muestra por consola el resultado del procesamiento de una URL.
+        
+        Args:
+            idx (int): Posición de la URL en la configuración (empezando en 1).
+            total (int): Número total de URLs configuradas.
+            config (dict): Configuración de la URL procesada.
+            result (dict): Resultado devuelto por process_url_config.
+        """
+        print(f"[{idx}/{total}] Procesando: {config['name']}")
+        print(f"  URL: {config['url']}")
+        
+        # Muestra el resultado
+        if 'error' in result:
+            print(f"  ❌ Error: {result['error']}")
+        elif 'status' in result:
+            print(f"  ✓ Status: {result['status']}")
+        else:
+            print(f"  ✓ Completado")
+        
+        print()  # Línea en blanco para separación
+    
+    def _print_download_stats(self):
+        """
+        Muestra los bytes descargados (y retenidos en memoria) por cada URL,
+        indicando si se cortó por el límite o se paró antes de tiempo.
+        """
+        if not self.download_stats:
+            return
+        
+        print("Descarga por URL:")
+        for name, stats in self.download_stats.items():
+            flags = []
+            if stats['stopped_early']:
+                flags.append('parada temprana')
+            if stats['truncated']:
+                flags.append('cortada por límite')
+            suffix = f" ({', '.join(flags)})" if flags else ''
+            print(f"  {name}: {stats['bytes'] / 1024:.1f} KB{suffix}")
+        total = sum(stats['bytes'] for stats in self.download_stats.values())
+        print(f"  Total: {total / 1024:.1f} KB")
+    
+    def _print_pool_stats(self):
+        """
+        Muestra cuántas peticiones reutilizaron una conexión abierta (hits)
+        y cuántas tuvieron que abrir una nueva (misses), por host.
+        """
+        if self._http is None:
+            return  # No se ha hecho ninguna petición
+        stats = self._http.pool_stats()
+        if not stats:
+            return
+        
+        print("Conexiones HTTP por host (reutilizadas / nuevas):")
+        for host, host_stats in sorted(stats.items()):
+            print(f"  {host}: {host_stats['hits']} / {host_stats['misses']}")
+    
+    def scrape_all(self, max_workers=MAX_WORKERS, parse_workers=PARSE_WORKERS):
         """
         Ejecuta el scraping de todas las URLs configuradas en urls_config.json.
-        Procesa cada URL según su configuración específica.
+        Procesa cada URL según su configuración específica, descargando
+        varias URLs en paralelo. El retardo de cortesía se aplica por host,
+        y los resultados se devuelven en el mismo orden que la configuración
+        para que las filas del Excel sean deterministas.
+        
+        Args:
+            max_workers (int): Número de hilos de descarga. Con 1 el
+                               procesamiento es secuencial.
+            parse_workers (int): Número de procesos de parseo. Con 0 se
+                                 parsea en los propios hilos de descarga.
         
         Returns:
             list: Lista de diccionarios con los resultados del scraping.
@@ -320,39 +690,125 @@ class WebScraper:
             print("No hay URLs configuradas para scrapear")
             return results
         
+        total = len(self.urls_config)
+        workers = max(1, min(max_workers, total))
+        
         print(f"\n{'='*60}")
-        print(f"Iniciando scraping de {len(self.urls_config)} URL(s)")
+        print(f"Iniciando scraping de {total} URL(s) con {workers} hilo(s)")
+        if parse_workers > 0:
+            print(f"Parseo en {parse_workers} proceso(s) (cola máx. {PARSE_QUEUE_SIZE} páginas)")
         print(f"{'='*60}\n")
         
-        # Procesa cada URL configurada
-        for idx, config in enumerate(self.urls_config, 1):
-            print(f"[{idx}/{len(self.urls_config)}] Procesando: {config['name']}")
-            print(f"  URL: {config['url']}")
-            
-            # Procesa la URL según su configuración
-            result = self.process_url_config(config)
-            
-            # Agrega el resultado a la lista
-            results.append(result)
-            
-            # Muestra el resultado
-            if 'error' in result:
-                print(f"  ❌ Error: {result['error']}")
-            elif 'status' in result:
-                print(f"  ✓ Status: {result['status']}")
-            else:
-                print(f"  ✓ Completado")
-            
-            print()  # Línea en blanco para separación
+        if self.robots is not None:
+            # robots.txt de cada host antes de empezar: las URLs prohibidas
+            # devuelven un error sin descargarse y cada host usa su Crawl-delay
+            blocked = self._load_robots(workers)
+            for name in blocked:
+                print(f"Advertencia: {name}: robots.txt no permite descargarla")
+        
+        if parse_workers > 0:
+            # Descarga en hilos y parseo en procesos: los hilos envían cada
+            # cuerpo a la cola de parseo y el hilo principal recoge los
+            # resultados en el orden de la configuración
+            from pipeline import ParsePipeline  # Import diferido: arranca multiprocessing
+            with ParsePipeline(parse_workers) as pipeline, \
+                    ThreadPoolExecutor(max_workers=workers) as executor:
+                downloads = executor.map(
+                    lambda config: self._download_and_submit(pipeline, config), self.urls_config
+                )
+                for idx, (config, (result, job, future)) in enumerate(zip(self.urls_config, downloads), 1):
+                    result = self._collect(config, result, job, future)
+                    results.append(result)
+                    self._print_result(idx, total, config, result)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # executor.map conserva el orden de entrada aunque las descargas
+                # terminen en otro orden, así que los resultados siguen la configuración
+                for idx, (config, result) in enumerate(
+                    zip(self.urls_config, executor.map(self.process_url_config, self.urls_config)), 1
+                ):
+                    # Agrega el resultado a la lista
+                    results.append(result)
+                    
+                    # Muestra el resultado
+                    self._print_result(idx, total, config, result)
         
         print(f"{'='*60}")
         print(f"Scraping completado: {len(results)} resultado(s)")
+        if self.cache:
+            print(f"Servidas desde caché (sin cambios): {self.cache.hits}")
+            self.cache.save()
+        if self.robots:
+            self.robots.save()
+        if self.snapshots:
+            self.snapshots.print_stats()
+        self._print_download_stats()
+        self._print_pool_stats()
         print(f"{'='*60}\n")
         
         return results
 
 
+class ReplayScraper(WebScraper):
+    """
+    Scraper que repite una ejecución archivada (ver snapshots.py): en lugar
+    de descargar cada URL, lee su página del archivo. El resto del proceso
+    (parseo, extracción, workers de parseo) es el mismo que en una ejecución
+    normal. No accede a la red ni usa la caché de validación.
+    """
+    
+    def __init__(self, archive, entries, config_source='current'):
+        """
+        Constructor de la clase ReplayScraper.
+        
+        Args:
+            archive (SnapshotArchive): Archivo de páginas.
+            entries (list): Entradas de la ejecución a repetir (ver SnapshotArchive.read_run).
+            config_source (str): 'current' usa la configuración actual de cada
+                                 fuente (por nombre) y 'archived' la guardada
+                                 con la página.
+        """
+        current = {}
+        if config_source == 'current':
+            current = {config['name']: config for config in self._load_config()}
+        # Una fuente por entrada de su primera página (las siguientes páginas
+        # de un listado paginado llevan 'page_url' y se cargan al recorrerlo)
+        super().__init__(urls_config=[
+            current.get(entry['name'], entry['config']) for entry in entries if not entry.get('page_url')
+        ])
+        
+        self.archive = archive
+        self.entries = {entry['name']: entry for entry in entries if not entry.get('page_url')}
+        self.page_entries = {(entry['name'], entry['page_url']): entry for entry in entries if entry.get('page_url')}
+        self.cache = None  # Cada página archivada se parsea de nuevo
+        self.robots = None  # No se accede a la red
+        self.snapshots = None  # No se vuelve a archivar lo que se repite
+        if entries:
+            # Los resultados llevan el timestamp de la ejecución original
+            self.timestamp = entries[0]['timestamp']
+    
+    def _download(self, config, url=None):
+        """
+        Sustituye la descarga por la lectura de la página archivada.
+        """
+        result = {'timestamp': self.timestamp, 'url': config['url'], 'name': config['name']}
+        
+        with self.metrics.stage('load', config['name']):
+            if url is None:
+                entry = self.entries.get(config['name'])
+            else:
+                entry = self.page_entries.get((config['name'], url))
+            html = self.archive.load(entry) if entry else None
+        if html is None:
+            result['error'] = 'Snapshot not found'
+            return result, None
+        
+        job = {'html': html, 'url': url or config['url'], 'cfg_hash': None, 'content_hash': None, 'etag': None, 'last_modified': None}
+        return result, job
+
+
 if __name__ == "__main__":
     scraper = WebScraper()
     results = scraper.scrape_all()
-    print(results)
\ No newline at end of file
+    print(results)
+    scraper.metrics.print_summary()
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Índice persistente de ofertas ya vistas.
+Los procesadores de ofertas (date_check, keyword_check) devuelven un
+registro por oferta relevante; aquí se comparan con las vistas en
+ejecuciones anteriores para que el guardado y las notificaciones traten
+solo las ofertas nuevas.
+
+El índice es una tabla SQLite con una fila por oferta: la clave es un
+hash de 64 bits de (fuente, enlace o título, fin del plazo) guardado como
+INTEGER PRIMARY KEY, de modo que cada consulta es una búsqueda por clave
+primaria y la tabla ocupa unos pocos bytes por oferta aunque el historial
+crezca. Las ofertas que no aparecen durante SEEN_OFFERS_TTL_DAYS días se
+olvidan (si vuelven a publicarse se consideran nuevas).
+
+Uso (desde la raíz del repositorio):
+    python src/seen_offers.py            # Número de ofertas en el índice
+    python src/seen_offers.py --expire   # Elimina las caducadas
+"""
+import hashlib  # Para la clave de cada oferta
+import os  # Para crear el directorio del índice
+import sqlite3  # Base de datos embebida de la librería estándar
+import time  # Para la fecha de última aparición
+from config import SEEN_OFFERS_DB, SEEN_OFFERS_TTL_DAYS  # Ruta del índice y caducidad
+
+# Ofertas por consulta IN (...) (por debajo del límite de variables de SQLite)
+_LOOKUP_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_offers (
+    key INTEGER PRIMARY KEY,
+    last_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_seen_offers_last_seen ON seen_offers (last_seen);
+"""
+
+
+def offer_key(name, offer):
+    """
+    Clave compacta de una oferta: hash de 64 bits (con signo, como los
+    INTEGER de SQLite) de la fuente, el enlace (o el título si no hay
+    enlace) y el fin del plazo. Una convocatoria que se reabre con otro
+    plazo cuenta como oferta nueva.
+
+    Args:
+        name (str): Nombre de la fuente.
+        offer (dict): Registro de la oferta (ver processors.offer_record).
+
+    Returns:
+        int: Clave de la oferta.
+    """
+    identity = offer.get('link') or ' '.join(offer.get('title', '').lower().split())
+    text = f"{name}\x1f{identity}\x1f{offer.get('end') or ''}"
+    return int.from_bytes(hashlib.sha1(text.encode('utf-8')).digest()[:8], 'big', signed=True)
+
+
+class SeenOffersIndex:
+    def __init__(self, filepath=SEEN_OFFERS_DB, ttl_days=SEEN_OFFERS_TTL_DAYS):
+        """
+        Constructor de la clase SeenOffersIndex. Abre (o crea) el índice.
+
+        Args:
+            filepath (str): Ruta del archivo SQLite.
+            ttl_days (float): Días sin aparecer tras los que se olvida una oferta.
+        """
+        self.filepath = filepath
+        self.ttl = ttl_days * 86400
+        self._pending = {}  # Claves vistas en esta ejecución (se guardan con save)
+        os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+
+        # timeout: espera a que otra ejecución termine de escribir en lugar de fallar
+        self.connection = sqlite3.connect(filepath, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(_SCHEMA)
+
+    def _known(self, keys, cutoff):
+        """
+        Devuelve las claves que ya están en el índice y no han caducado.
+        """
+        known = set()
+        keys = list(keys)
+        for start in range(0, len(keys), _LOOKUP_BATCH):
+            batch = keys[start:start + _LOOKUP_BATCH]
+            rows = self.connection.execute(
+                f"SELECT key FROM seen_offers WHERE last_seen >= ? AND key IN ({','.join('?' * len(batch))})",
+                [cutoff, *batch]
+            )
+            known.update(key for key, in rows)
+        return known
+
+    def diff(self, results, now=None):
+        """
+        Separa las ofertas nuevas. Retira de cada resultado la lista '_offers'
+        (no es una métrica que se guarde en el Excel) y anota todas las
+        ofertas vistas, que se registran en el índice al llamar a save()
+        (o se descartan con discard()).
+
+        Args:
+            results (list): Resultados del scraper.
+            now (float): Instante de la comprobación (por defecto, ahora).
+
+        Returns:
+            list: Ofertas nuevas, cada una con el nombre de su fuente ('name')
+                  y el timestamp de la ejecución.
+        """
+        now = int(now if now is not None else time.time())
+        candidates = {}
+        for result in results:
+            for offer in result.pop('_offers', None) or ():
+                key = offer_key(result['name'], offer)
+                # La misma oferta repetida (p. ej. en dos páginas) cuenta una vez
+                candidates.setdefault(key, {'timestamp': result.get('timestamp'), 'name': result['name'], **offer})
+
+        known = self._known(candidates, now - self.ttl)
+        for key in candidates:
+            self._pending[key] = now
+        return [offer for key, offer in candidates.items() if key not in known]
+
+    def save(self):
+        """
+        Registra las ofertas vistas en esta ejecución y elimina las caducadas,
+        en una sola transacción.
+
+        Returns:
+            int: Ofertas caducadas eliminadas.
+        """
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO seen_offers (key, last_seen) VALUES (?, ?)',
+                list(self._pending.items())
+            )
+            expired = self.expire()
+        self._pending = {}
+        return expired
+
+    def discard(self):
+        """
+        Descarta las ofertas anotadas por diff() sin registrarlas (p. ej. si
+        el lote falla antes de guardarse): en la próxima comparación siguen
+        contando como nuevas.
+        """
+        self._pending = {}
+
+    def expire(self, now=None):
+        """
+        Elimina las ofertas que no han aparecido durante el TTL.
+
+        Returns:
+            int: Número de ofertas eliminadas.
+        """
+        now = now if now is not None else time.time()
+        cursor = self.connection.execute('DELETE FROM seen_offers WHERE last_seen < ?', (int(now - self.ttl),))
+        return cursor.rowcount
+
+    def count(self):
+        """
+        Devuelve el número de ofertas en el índice.
+        """
+        return self.connection.execute('SELECT COUNT(*) FROM seen_offers').fetchone()[0]
+
+    def close(self):
+        """
+        Cierra la conexión con el índice.
+        """
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Índice de ofertas ya vistas")
+    arg_parser.add_argument('--expire', action='store_true', help="Elimina las ofertas caducadas")
+    args = arg_parser.parse_args()
+
+    index = SeenOffersIndex()
+    try:
+        if args.expire:
+            with index.connection:
+                print(f"{index.expire()} oferta(s) caducada(s) eliminada(s)")
+        print(f"{index.count()} oferta(s) en {index.filepath} (TTL {SEEN_OFFERS_TTL_DAYS:g} días)")
+    finally:
+        index.close()
@@ -0,0 +1,289 @@
+"""
+Ejecución repartida en varios procesos o runners (shards).
+Con --shard i/N cada proceso scrapea solo las URLs que le corresponden y
+guarda sus resultados en un archivo parcial; la fase de combinación
+(--merge) los une en el orden de urls_config.json, y a partir de ahí se
+guardan y notifican como en una ejecución normal (una sola notificación).
+
+Un shard que falla no notifica: deja el error en <shard>.error.json y la
+combinación, que no puede completarse sin él, envía un único aviso con
+los errores de todos los shards fallidos.
+
+Las URLs se asignan por rendezvous hashing (hash de nombre + shard; gana
+el shard con el valor más alto): la asignación no depende del resto de
+URLs, así que añadir o quitar URLs no mueve las demás, y al cambiar N
+solo se mueven las URLs imprescindibles.
+
+Uso (desde la raíz del repositorio):
+    python src/main.py --shard 1/4        # Uno de los shards (p. ej. en una matriz de GitHub Actions)
+    python src/main.py --merge            # Combina los parciales, guarda y notifica
+    python src/main.py --shards 4         # Los 4 shards como procesos locales y la combinación
+"""
+import hashlib  # Para el rendezvous hashing
+import json  # Para los archivos parciales
+import os  # Para rutas y escrituras atómicas
+import re  # Para interpretar i/N
+from config import SHARDS_DIR  # Directorio de los archivos parciales
+
+# Formato de --shard: índice (desde 1) / número de shards
+_SHARD = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+
+
+def parse_shard(value):
+    """
+    Interpreta un shard en formato 'i/N' (i desde 1).
+
+    Args:
+        value (str): Texto como '2/4'.
+
+    Returns:
+        tuple: (índice, número de shards).
+
+    Raises:
+        ValueError: Si el formato no es válido o i no está entre 1 y N.
+    """
+    match = _SHARD.match(str(value))
+    if not match:
+        raise ValueError(f"Shard no válido: {value!r} (usa i/N, p. ej. 1/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard no válido: {value!r} (i debe estar entre 1 y N)")
+    return index, count
+
+
+def shard_of(name, count):
+    """
+    Shard (desde 1) al que se asigna una URL: el de mayor hash(shard, nombre).
+
+    Args:
+        name (str): Nombre de la URL (clave de los resultados y del historial).
+        count (int): Número de shards.
+
+    Returns:
+        int: Índice del shard.
+    """
+    def weight(shard):
+        return hashlib.sha1(f"{shard}:{name}".encode('utf-8')).digest()
+    return max(range(1, count + 1), key=weight)
+
+
+def select_shard(configs, index, count):
+    """
+    Selecciona las URLs de un shard.
+
+    Args:
+        configs (list): Configuración completa de URLs.
+        index (int): Índice del shard (desde 1).
+        count (int): Número de shards.
+
+    Returns:
+        list: Pares (posición en la configuración completa, configuración).
+    """
+    return [(position, config) for position, config in enumerate(configs)
+            if shard_of(config['name'], count) == index]
+
+
+def config_signature(configs):
+    """
+    Huella de la lista de URLs: los parciales de una misma ejecución deben
+    coincidir (si no, se combinarían shards de configuraciones distintas).
+    """
+    names = json.dumps([config['name'] for config in configs], ensure_ascii=False)
+    return hashlib.sha1(names.encode('utf-8')).hexdigest()[:16]
+
+
+def shard_suffix(index, count):
+    """
+    Sufijo de los archivos propios de un shard (p. ej. 'shard-1-of-4').
+    """
+    return f"shard-{index}-of-{count}"
+
+
+def shard_file(filepath, index, count):
+    """
+    Variante de un archivo para un shard (data/.cache/http_cache.json ->
+    data/.cache/http_cache.shard-1-of-4.json), para que los shards no
+    sobrescriban el estado de los demás.
+    """
+    root, extension = os.path.splitext(filepath)
+    return f"{root}.{shard_suffix(index, count)}{extension}"
+
+
+def write_partial(index, count, timestamp, signature, positions, results, records, directory=SHARDS_DIR):
+    """
+    Guarda los resultados de un shard.
+
+    Args:
+        index (int): Índice del shard.
+        count (int): Número de shards.
+        timestamp (str): Timestamp de la ejecución del shard.
+        signature (str): Huella de la configuración completa (ver config_signature).
+        positions (list): Posición de cada resultado en la configuración completa.
+        results (list): Resultados del scraper, en el mismo orden que positions.
+        records (list): Registros de métricas del shard.
+        directory (str): Directorio de los parciales.
+
+    Returns:
+        str: Ruta del archivo parcial.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{shard_suffix(index, count)}.json")
+    partial = {
+        'shard': index,
+        'count': count,
+        'timestamp': timestamp,
+        'signature': signature,
+        'results': [{'position': position, 'result': result} for position, result in zip(positions, results)],
+        'metrics': records,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(partial, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_failure(index, count, timestamp, error, directory=SHARDS_DIR):
+    """
+    Guarda el error de un shard fallido para que lo notifique la combinación.
+
+    Args:
+        index (int): Índice del shard.
+        count (int): Número de shards.
+        timestamp (str): Timestamp de la ejecución del shard.
+        error (str): Descripción del error.
+        directory (str): Directorio de los parciales.
+
+    Returns:
+        str: Ruta del archivo de error.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{shard_suffix(index, count)}.error.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'shard': index, 'count': count, 'timestamp': timestamp, 'error': error}, f, ensure_ascii=False)
+    return path
+
+
+def read_failures(directory=SHARDS_DIR):
+    """
+    Lee los errores de los shards fallidos.
+
+    Args:
+        directory (str): Directorio de los parciales.
+
+    Returns:
+        dict: Índice del shard -> descripción del error.
+    """
+    failures = {}
+    if not os.path.isdir(directory):
+        return failures
+    for filename in sorted(os.listdir(directory)):
+        if filename.startswith('shard-') and filename.endswith('.error.json'):
+            with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+                failure = json.load(f)
+            failures[failure['shard']] = failure['error']
+    return failures
+
+
+def read_partials(directory=SHARDS_DIR):
+    """
+    Lee y combina los parciales de una ejecución. Comprueba que estén todos
+    los shards (1..N, una vez cada uno) y que usen la misma configuración.
+
+    Args:
+        directory (str): Directorio de los parciales.
+
+    Returns:
+        tuple: (timestamp, results, records, paths)
+            - timestamp (str): Timestamp de la ejecución (el del primer shard
+              que empezó); se asigna a todos los resultados
+            - results (list): Resultados en el orden de urls_config.json
+            - records (list): Registros de métricas de todos los shards
+            - paths (list): Archivos parciales leídos
+
+    Raises:
+        ValueError: Si algún shard ha fallado, faltan shards o no son de la
+                    misma ejecución.
+    """
+    paths = sorted(
+        os.path.join(directory, filename) for filename in os.listdir(directory)
+        if filename.startswith('shard-') and filename.endswith('.json') and not filename.endswith('.error.json')
+    ) if os.path.isdir(directory) else []
+    failures = read_failures(directory)
+    if failures:
+        # Los errores de todos los shards fallidos, en un único mensaje
+        raise ValueError("Han fallado los shards: " + '; '.join(
+            f"{index}: {error}" for index, error in sorted(failures.items())
+        ))
+    if not paths:
+        raise ValueError(f"No hay resultados parciales en {directory}")
+
+    partials = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            partials.append(json.load(f))
+
+    counts = {partial['count'] for partial in partials}
+    signatures = {partial['signature'] for partial in partials}
+    if len(counts) > 1 or len(signatures) > 1:
+        raise ValueError(f"Los parciales de {directory} son de ejecuciones distintas (N o configuración diferentes)")
+    count = counts.pop()
+    missing = sorted(set(range(1, count + 1)) - {partial['shard'] for partial in partials})
+    if missing:
+        raise ValueError(f"Faltan shards: {', '.join(f'{index}/{count}' for index in missing)}")
+
+    timestamp = min(partial['timestamp'] for partial in partials)
+    entries = sorted(
+        (entry for partial in partials for entry in partial['results']),
+        key=lambda entry: entry['position']
+    )
+    results = [dict(entry['result'], timestamp=timestamp) for entry in entries]
+    records = [
+        dict(record, shard=partial['shard'])
+        for partial in sorted(partials, key=lambda partial: partial['shard'])
+        for record in partial['metrics']
+    ]
+    return timestamp, results, records, paths
+
+
+def run_local(count, extra_args=(), directory=SHARDS_DIR):
+    """
+    Ejecuta los N shards como procesos locales en paralelo y espera a que
+    terminen. La salida de cada shard queda en <directory>/shard-i-of-N.log.
+    Los shards no notifican sus errores: los notifica una sola vez la
+    combinación (ver read_partials).
+
+    Args:
+        count (int): Número de shards.
+        extra_args (tuple): Argumentos adicionales para main.py (p. ej. --urls-config).
+        directory (str): Directorio de los parciales.
+
+    Returns:
+        list: Índices de los shards que han fallado.
+    """
+    import subprocess
+    import sys
+
+    os.makedirs(directory, exist_ok=True)
+    # Se eliminan los parciales (y errores) anteriores para no mezclar ejecuciones
+    for filename in os.listdir(directory):
+        if filename.startswith('shard-') and filename.endswith('.json'):
+            os.remove(os.path.join(directory, filename))
+
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    processes = []
+    for index in range(1, count + 1):
+        log = open(os.path.join(directory, f"{shard_suffix(index, count)}.log"), 'w', encoding='utf-8')
+        process = subprocess.Popen(
+            [sys.executable, main_path, '--shard', f"{index}/{count}", *extra_args],
+            stdout=log, stderr=subprocess.STDOUT
+        )
+        processes.append((index, process, log))
+
+    failed = []
+    for index, process, log in processes:
+        if process.wait() != 0:
+            failed.append(index)
+        log.close()
+        print(f"Shard {index}/{count}: {'ERROR' if index in failed else 'completado'}")
+    return failed
@@ -0,0 +1,305 @@
+"""
+Archivo de páginas descargadas y modo de repetición sin red.
+Con SCRAPER_SNAPSHOTS=1 cada cuerpo descargado se guarda comprimido (zstd o
+gzip) en SNAPSHOTS_DIR, direccionado por su hash SHA-256:
+
+    data/snapshots/objects/ab/abcdef...html.zst   # Una copia por contenido distinto
+    data/snapshots/runs/2025-01-15_20-00-00.jsonl # Páginas de cada ejecución
+
+Las páginas que no cambian entre ejecuciones no ocupan espacio de nuevo:
+la lista de la ejecución apunta al mismo objeto. Con el archivo se puede
+repetir la extracción de cualquier ejecución pasada (p. ej. para depurar un
+selector roto o probar un procesador nuevo sobre meses de historial) sin
+volver a acceder a los sitios web.
+
+Uso (desde la raíz del repositorio):
+    python src/snapshots.py --list
+    python src/snapshots.py --replay latest                   # Con la configuración actual
+    python src/snapshots.py --replay all --output replay.jsonl
+    python src/snapshots.py --replay 2025-01-15_20-00-00 --config archived
+"""
+import gzip  # Compresión por defecto (librería estándar)
+import importlib.util  # Para comprobar si zstandard está instalado
+import json  # Para las listas de cada ejecución
+import os  # Para rutas y escrituras atómicas
+import threading  # Los hilos de descarga archivan en paralelo
+from config import SNAPSHOTS_DIR, SNAPSHOTS_COMPRESSION  # Ubicación y compresión del archivo
+
+# Extensión de los objetos según la compresión
+_EXTENSIONS = {'zstd': '.html.zst', 'gzip': '.html.gz'}
+
+
+def resolve_compression(compression=SNAPSHOTS_COMPRESSION):
+    """
+    Resuelve la compresión a usar ('auto' = zstd si está instalado, si no gzip).
+
+    Args:
+        compression (str): 'auto', 'zstd' o 'gzip'.
+
+    Returns:
+        str: 'zstd' o 'gzip'.
+    """
+    compression = (compression or 'auto').lower()
+    if compression == 'auto':
+        return 'zstd' if importlib.util.find_spec('zstandard') else 'gzip'
+    if compression not in _EXTENSIONS:
+        raise ValueError(f"Compresión desconocida: {compression} (usa auto, zstd o gzip)")
+    return compression
+
+
+def compress(content, compression):
+    """
+    Comprime el cuerpo de una página.
+    """
+    if compression == 'zstd':
+        import zstandard  # Import diferido: dependencia opcional
+        return zstandard.ZstdCompressor(level=10).compress(content)
+    return gzip.compress(content, compresslevel=6)
+
+
+def decompress(data, compression):
+    """
+    Descomprime el cuerpo de una página.
+    """
+    if compression == 'zstd':
+        import zstandard  # Import diferido: dependencia opcional
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def run_id(timestamp):
+    """
+    Identificador (y nombre de archivo) de una ejecución a partir de su timestamp.
+
+    Args:
+        timestamp (str): Timestamp en formato YYYY-MM-DD HH:MM:SS.
+
+    Returns:
+        str: Identificador en formato YYYY-MM-DD_HH-MM-SS.
+    """
+    return timestamp.replace(' ', '_').replace(':', '-')
+
+
+class SnapshotArchive:
+    def __init__(self, directory=SNAPSHOTS_DIR, compression=SNAPSHOTS_COMPRESSION):
+        """
+        Constructor de la clase SnapshotArchive.
+
+        Args:
+            directory (str): Directorio raíz del archivo.
+            compression (str): Compresión de los objetos nuevos ('auto', 'zstd' o 'gzip').
+        """
+        self.directory = directory
+        self.compression = resolve_compression(compression)
+        self.stored = 0  # Páginas nuevas guardadas en esta ejecución
+        self.deduplicated = 0  # Páginas que ya estaban en el archivo
+        self.stored_bytes = 0  # Bytes comprimidos escritos
+        self._lock = threading.Lock()
+
+    def object_path(self, content_hash, compression):
+        """
+        Ruta del objeto de un contenido (repartido en subdirectorios por prefijo).
+        """
+        return os.path.join(self.directory, 'objects', content_hash[:2], content_hash + _EXTENSIONS[compression])
+
+    def find_object(self, content_hash):
+        """
+        Busca el objeto de un contenido con cualquiera de las compresiones.
+
+        Returns:
+            tuple: (ruta, compresión), o (None, None) si no está archivado.
+        """
+        for compression in _EXTENSIONS:
+            path = self.object_path(content_hash, compression)
+            if os.path.exists(path):
+                return path, compression
+        return None, None
+
+    def run_path(self, run):
+        """
+        Ruta de la lista de páginas de una ejecución.
+        """
+        return os.path.join(self.directory, 'runs', f"{run}.jsonl")
+
+    def store(self, timestamp, config, content_hash, content=None, encoding=None, **meta):
+        """
+        Archiva la página de una URL en la ejecución indicada. Si el contenido
+        ya está en el archivo (misma página en otra ejecución) no se vuelve a
+        escribir.
+
+        Args:
+            timestamp (str): Timestamp de la ejecución.
+            config (dict): Configuración de la URL (se guarda para repetirla).
+            content_hash (str): Hash SHA-256 del cuerpo (ver http_cache.body_hash).
+            content (bytes): Cuerpo descargado. None si no se descargó (respuesta
+                             304): solo se anota si el contenido ya está archivado.
+            encoding (str): Codificación con la que se decodificó el cuerpo.
+            **meta: Datos adicionales de la descarga (status, truncated...).
+
+        Returns:
+            bool: True si la página queda registrada en la ejecución.
+        """
+        path, _ = self.find_object(content_hash) if content_hash else (None, None)
+
+        if path is None:
+            if content is None:
+                return False  # No hay copia de la página (p. ej. 304 sin archivo previo)
+            path = self.object_path(content_hash, self.compression)
+            data = compress(content, self.compression)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Escritura atómica: un objeto nunca queda a medias
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self.stored += 1
+                self.stored_bytes += len(data)
+        else:
+            with self._lock:
+                self.deduplicated += 1
+
+        entry = {
+            'timestamp': timestamp,
+            'name': config['name'],
+            'url': config['url'],
+            'hash': content_hash,
+            'encoding': encoding,
+            **meta,
+            'config': config,
+        }
+        run_path = self.run_path(run_id(timestamp))
+        with self._lock:
+            os.makedirs(os.path.dirname(run_path), exist_ok=True)
+            with open(run_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return True
+
+    def load(self, entry):
+        """
+        Recupera el HTML archivado de una página.
+
+        Args:
+            entry (dict): Entrada de la lista de una ejecución.
+
+        Returns:
+            str: HTML decodificado, o None si el objeto no existe.
+        """
+        path, compression = self.find_object(entry['hash'])
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            content = decompress(f.read(), compression)
+
+        encoding = entry.get('encoding')
+        if not encoding:
+            # Páginas anotadas desde un 304: se detecta la codificación como en la descarga
+            from requests.compat import chardet  # La misma detección que en la descarga
+            encoding = chardet.detect(content)['encoding'] or 'utf-8'
+        return str(content, encoding, errors='replace')
+
+    def runs(self):
+        """
+        Devuelve los identificadores de las ejecuciones archivadas, de la más antigua a la más reciente.
+        """
+        runs_dir = os.path.join(self.directory, 'runs')
+        if not os.path.isdir(runs_dir):
+            return []
+        return sorted(filename[:-len('.jsonl')] for filename in os.listdir(runs_dir) if filename.endswith('.jsonl'))
+
+    def read_run(self, run):
+        """
+        Lee la lista de páginas de una ejecución.
+
+        Args:
+            run (str): Identificador de la ejecución (ver runs()).
+
+        Returns:
+            list: Entradas de la ejecución (una por URL).
+        """
+        with open(self.run_path(run), 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def print_stats(self):
+        """
+        Muestra las páginas archivadas en esta ejecución.
+        """
+        print(f"Archivo de páginas ({self.compression}): {self.stored} nueva(s), "
+              f"{self.deduplicated} ya archivada(s), {self.stored_bytes / 1024:.1f} KB escritos")
+
+
+def replay_run(archive, run, config_source='current', parse_workers=0):
+    """
+    Repite la extracción de una ejecución archivada sin acceder a la red.
+
+    Args:
+        archive (SnapshotArchive): Archivo de páginas.
+        run (str): Identificador de la ejecución.
+        config_source (str): 'current' usa la configuración actual de cada
+                             fuente (por nombre); 'archived' la que tenía
+                             en esa ejecución.
+        parse_workers (int): Procesos de parseo (0 = en el propio proceso).
+
+    Returns:
+        list: Resultados, con el mismo formato que WebScraper.scrape_all.
+    """
+    from scraper import ReplayScraper  # Import diferido: scraper importa este módulo
+
+    scraper = ReplayScraper(archive, archive.read_run(run), config_source)
+    return scraper.scrape_all(parse_workers=parse_workers)
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import io
+
+    arg_parser = argparse.ArgumentParser(description="Archivo de páginas descargadas y repetición sin red")
+    arg_parser.add_argument('--list', action='store_true', help="Lista las ejecuciones archivadas")
+    arg_parser.add_argument('--replay', metavar='RUN', help="Ejecución a repetir: identificador, 'latest' o 'all'")
+    arg_parser.add_argument('--config', choices=('current', 'archived'), default='current',
+                            help="Configuración a usar: la actual (por defecto) o la de la ejecución")
+    arg_parser.add_argument('--parse-workers', type=int, default=0, help="Procesos de parseo")
+    arg_parser.add_argument('--output', help="Archivo JSON lines donde guardar los resultados")
+    arg_parser.add_argument('--verbose', action='store_true', help="Muestra el detalle de cada URL")
+    args = arg_parser.parse_args()
+
+    archive = SnapshotArchive()
+    available = archive.runs()
+
+    if args.list:
+        for run in available:
+            print(f"{run}: {len(archive.read_run(run))} página(s)")
+        if not available:
+            print(f"No hay ejecuciones archivadas en {archive.directory}")
+
+    if args.replay:
+        if args.replay == 'all':
+            selected = available
+        elif args.replay == 'latest':
+            selected = available[-1:]
+        elif args.replay in available:
+            selected = [args.replay]
+        else:
+            raise SystemExit(f"Ejecución no archivada: {args.replay}")
+
+        output = open(args.output, 'w', encoding='utf-8') if args.output else None
+        try:
+            for run in selected:
+                if args.verbose:
+                    results = replay_run(archive, run, args.config, args.parse_workers)
+                else:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        results = replay_run(archive, run, args.config, args.parse_workers)
+                errors = sum(1 for result in results if 'error' in result)
+                print(f"{run}: {len(results)} resultado(s), {errors} error(es)")
+                if output:
+                    for result in results:
+                        output.write(json.dumps(result, ensure_ascii=False) + '\n')
+        finally:
+            if output:
+                output.close()
+                print(f"Resultados guardados en {args.output}")
+
+    if not (args.list or args.replay):
+        arg_parser.print_help()
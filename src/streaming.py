@@ -0,0 +1,157 @@
+"""
+Lectura en streaming del cuerpo de las respuestas HTTP.
+En lugar de cargar response.text completo en memoria, el cuerpo se lee
+por bloques y se decodifica de forma incremental, con:
+- Un límite de bytes por URL (protege frente a páginas enormes o respuestas infinitas)
+- Parada temprana: si los selectores raíz de parse_only son todos por id
+  (únicos en la página), un tokenizador HTML sigue la descarga y la corta
+  en cuanto se han cerrado todos esos contenedores
+- Estadísticas por URL (bytes descargados, corte por límite, parada temprana)
+"""
+import codecs  # Para decodificar el cuerpo de forma incremental
+from html.parser import HTMLParser  # Tokenizador HTML incremental de la librería estándar
+from config import STREAM_CHUNK_SIZE  # Tamaño de cada bloque leído
+from extraction import parse_simple_selector  # Descomposición de selectores simples
+
+
+class ContainerTracker(HTMLParser):
+    """
+    Tokenizador que detecta cuándo se han cerrado todos los contenedores
+    identificados por id. Cuenta la anidación de etiquetas con el mismo
+    nombre que el contenedor para saber cuándo se cierra.
+    """
+
+    def __init__(self, roots):
+        """
+        Args:
+            roots (list): Lista de (tag o None, clases, id) de los contenedores.
+        """
+        super().__init__(convert_charrefs=False)
+        self._pending = list(roots)  # Contenedores que aún no se han abierto
+        self._open = None  # (nombre de etiqueta, profundidad) del contenedor abierto
+        self.done = False  # True cuando todos los contenedores se han cerrado
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._open is not None:
+            name, depth = self._open
+            if tag == name:
+                self._open = (name, depth + 1)
+            return
+
+        attrs = dict(attrs)
+        element_id = attrs.get('id')
+        classes = frozenset((attrs.get('class') or '').split())
+        for root in self._pending:
+            root_tag, root_classes, root_id = root
+            if (root_id == element_id
+                    and (root_tag is None or root_tag == tag)
+                    and root_classes.issubset(classes)):
+                self._pending.remove(root)
+                self._open = (tag, 1)
+                return
+
+    def handle_endtag(self, tag):
+        if self.done or self._open is None:
+            return
+        name, depth = self._open
+        if tag != name:
+            return
+        if depth > 1:
+            self._open = (name, depth - 1)
+            return
+        # Se ha cerrado el contenedor
+        self._open = None
+        if not self._pending:
+            self.done = True
+
+
+def early_stop_roots(parse_only):
+    """
+    Devuelve los contenedores que permiten parar la descarga en cuanto se cierran.
+    Solo es posible si todos los selectores raíz identifican un elemento por id.
+
+    Args:
+        parse_only (tuple): Selectores raíz de la URL (o None).
+
+    Returns:
+        list: Lista de (tag, clases, id), o None si no se puede parar antes.
+    """
+    if not parse_only:
+        return None
+    roots = [parse_simple_selector(selector) for selector in parse_only]
+    if any(root is None or root[2] is None for root in roots):
+        return None
+    return roots
+
+
+def read_body(response, max_bytes, stop_roots=None):
+    """
+    Lee el cuerpo de una respuesta obtenida con stream=True.
+
+    Args:
+        response (requests.Response): Respuesta sin leer.
+        max_bytes (int): Máximo de bytes a descargar.
+        stop_roots (list): Contenedores para la parada temprana (ver early_stop_roots).
+
+    Returns:
+        dict: Cuerpo y estadísticas de la descarga:
+            - content (bytes): Bytes descargados
+            - text (str): Texto decodificado
+            - encoding (str): Codificación usada para decodificarlo
+            - bytes (int): Número de bytes descargados
+            - truncated (bool): True si se alcanzó max_bytes
+            - stopped_early (bool): True si se paró al cerrarse los contenedores
+    """
+    encoding = response.encoding
+    decoder = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    tracker = ContainerTracker(stop_roots) if stop_roots else None
+
+    chunks = []
+    text_parts = []
+    size = 0
+    truncated = False
+    stopped_early = False
+
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if not chunk:
+                continue
+            if size + len(chunk) > max_bytes:
+                chunk = chunk[:max_bytes - size]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+
+            text = decoder.decode(chunk)
+            text_parts.append(text)
+            if tracker is not None:
+                tracker.feed(text)
+                if tracker.done:
+                    stopped_early = True
+                    break
+            if truncated:
+                break
+        text_parts.append(decoder.decode(b'', final=True))
+    finally:
+        # Si no se ha leído todo, se cierra la conexión en lugar de devolverla al pool
+        response.close()
+
+    content = b''.join(chunks)
+    if encoding:
+        text = ''.join(text_parts)
+    else:
+        # Sin charset en las cabeceras: se detecta la codificación como haría requests
+        from requests.compat import chardet  # Detección de codificación (la misma que usa requests)
+        encoding = chardet.detect(content)['encoding'] or 'utf-8'
+        text = str(content, encoding, errors='replace')
+
+    return {
+        'content': content,
+        'text': text,
+        'encoding': encoding,
+        'bytes': size,
+        'truncated': truncated,
+        'stopped_early': stopped_early,
+    }
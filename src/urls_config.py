@@ -0,0 +1,196 @@
+"""
+Carga y validación de urls_config.json.
+Cada entrada se valida antes de usarla (name y url obligatorios, type,
+parser e interval conocidos, plan compilable...); las entradas que no se
+pueden procesar se descartan con un aviso en lugar de hacer fallar toda la
+ejecución.
+
+La validación solo se repite si el archivo cambia: el resultado se guarda
+en URLS_CONFIG_CACHE junto con la fecha de modificación y el tamaño del
+archivo, y las ejecuciones siguientes lo reutilizan directamente. La copia
+también se invalida si cambia el código que valida (este módulo y los que
+compilan los planes), sin tener que versionar las reglas a mano.
+"""
+import functools  # Para calcular la huella del validador una sola vez
+import json  # Para leer la configuración y la copia validada
+import os  # Para la fecha de modificación del archivo
+import re  # Para interpretar los intervalos ('30m', '6h'...)
+import zlib  # Huella del código del validador (crc32, sin cargar hashlib al arrancar)
+from config import URLS_CONFIG, URLS_CONFIG_CACHE, DAEMON_DEFAULT_INTERVAL  # Rutas e intervalo por defecto
+
+# Módulos cuyo código decide qué entradas son válidas: validate() y lo que
+# usa para comprobar tipos y motores y compilar los planes
+_VALIDATOR_MODULES = (
+    'urls_config.py', 'processors.py', 'parsers.py', 'extraction.py', 'keyword_matcher.py', 'streaming.py',
+)
+
+# Intervalo con unidad: número seguido de s, m, h o d
+_INTERVAL = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$', re.IGNORECASE)
+_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(value, default=DAEMON_DEFAULT_INTERVAL):
+    """
+    Convierte un intervalo a segundos.
+
+    Args:
+        value (int | float | str): Segundos, o texto como '30m', '6h' o '2d'.
+                                   None usa el intervalo por defecto.
+        default (int | float | str): Intervalo por defecto.
+
+    Returns:
+        float: Intervalo en segundos (mínimo 1).
+
+    Raises:
+        ValueError: Si el intervalo no es válido.
+    """
+    if value is None:
+        value = default
+    if isinstance(value, (int, float)):
+        return max(float(value), 1.0)
+    match = _INTERVAL.match(str(value))
+    if not match:
+        raise ValueError(f"Intervalo no válido: {value!r} (usa segundos o '30m', '6h', '2d'...)")
+    return max(float(match.group(1)) * _UNITS[match.group(2).lower()], 1.0)
+
+
+def validate(configs):
+    """
+    Valida las entradas de urls_config.json.
+
+    Args:
+        configs (list): Entradas leídas del archivo.
+
+    Returns:
+        tuple: (valid, warnings)
+            - valid (list): Entradas que se pueden procesar, en el mismo orden
+            - warnings (list): Avisos sobre las entradas descartadas o dudosas
+    """
+    # Imports diferidos: solo hacen falta cuando la configuración ha cambiado
+    from parsers import PARSER_BACKENDS
+    from processors import PROCESSORS, DEFAULT_TYPE, compile_plan
+
+    if not isinstance(configs, list):
+        return [], ["el archivo debe contener una lista de URLs"]
+
+    valid = []
+    warnings = []
+    names = set()
+    for position, config in enumerate(configs, 1):
+        label = f"entrada {position}"
+        if not isinstance(config, dict):
+            warnings.append(f"{label}: no es un objeto; se descarta")
+            continue
+        name = config.get('name')
+        url = config.get('url')
+        if not name or not isinstance(name, str):
+            warnings.append(f"{label}: falta 'name'; se descarta")
+            continue
+        label = f"{name}"
+        if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            warnings.append(f"{label}: 'url' debe empezar por http:// o https://; se descarta")
+            continue
+        if name in names:
+            warnings.append(f"{label}: nombre repetido (los cambios y el historial se agrupan por nombre)")
+        names.add(name)
+
+        page_type = config.get('type', DEFAULT_TYPE)
+        if page_type not in PROCESSORS:
+            warnings.append(f"{label}: tipo '{page_type}' desconocido; se procesa como {DEFAULT_TYPE}")
+        elif page_type == 'keyword_count' and not config.get('keywords'):
+            warnings.append(f"{label}: sin 'keywords'; el resultado será un error")
+        if config.get('parser') and config['parser'] not in PARSER_BACKENDS:
+            warnings.append(f"{label}: parser '{config['parser']}' desconocido")
+        try:
+            parse_interval(config.get('interval'))
+        except ValueError as e:
+            warnings.append(f"{label}: {e}")
+
+        try:
+            compile_plan(config)
+        except Exception as e:
+            # Selectores, keywords o fechas que no se pueden compilar
+            warnings.append(f"{label}: configuración no válida ({e}); se descarta")
+            continue
+        valid.append(config)
+
+    return valid, warnings
+
+
+@functools.lru_cache(maxsize=1)
+def _validator_hash():
+    """
+    Huella del código fuente del validador (ver _VALIDATOR_MODULES).
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    checksum = 0
+    for filename in _VALIDATOR_MODULES:
+        with open(os.path.join(directory, filename), 'rb') as f:
+            checksum = zlib.crc32(f.read(), checksum)
+    return f"{checksum:08x}"
+
+
+def _signature(filepath):
+    """
+    Identifica la versión del archivo (ruta, fecha de modificación y tamaño)
+    y la del código que lo valida.
+    """
+    stat = os.stat(filepath)
+    return [os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size, _validator_hash()]
+
+
+def load_urls_config(filepath=URLS_CONFIG, cache_path=URLS_CONFIG_CACHE):
+    """
+    Carga urls_config.json validado. Si el archivo no ha cambiado desde la
+    última validación, se usa directamente la copia guardada.
+
+    Args:
+        filepath (str): Archivo de configuración de URLs.
+        cache_path (str): Copia validada. Vacío = validar siempre.
+
+    Returns:
+        list: Entradas válidas. Lista vacía si el archivo no existe o no es JSON válido.
+    """
+    if not os.path.exists(filepath):
+        print(f"Advertencia: No se encontró el archivo {filepath}")
+        return []
+
+    signature = _signature(filepath)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('signature') == signature:
+                # Mismo archivo que en la última validación: sin volver a validar
+                for warning in cached['warnings']:
+                    print(f"Advertencia: {warning}")
+                return cached['config']
+        except (OSError, ValueError, KeyError):
+            pass  # Copia dañada: se valida de nuevo
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+    except json.JSONDecodeError as e:
+        # Error al parsear el JSON (formato incorrecto)
+        print(f"Error al parsear {filepath}: {e}")
+        return []
+
+    valid, warnings = validate(configs)
+    for warning in warnings:
+        print(f"Advertencia: {warning}")
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"  # Varios shards pueden validar a la vez
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'warnings': warnings, 'config': valid}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    return valid
+
+
+if __name__ == "__main__":
+    # Valida la configuración (sin usar la copia guardada) y muestra los avisos
+    urls = load_urls_config(cache_path='')
+    print(f"{len(urls)} URL(s) válidas en {URLS_CONFIG}")
@@ -0,0 +1,58 @@
+"""
+Configuración común de los tests (pytest).
+Los módulos del scraper se importan igual que desde src/ (imports de primer
+nivel), y los de benchmarks/ (p. ej. el servidor de fixtures) también.
+
+Uso (desde la raíz del repositorio):
+    python -m pytest -q
+"""
+import json  # Para leer la configuración de cada fixture
+import os  # Para localizar src, benchmarks y los fixtures
+import sys  # Para añadir src y benchmarks al path de importación
+from datetime import datetime  # Para fijar la fecha de referencia de date_check
+
+import pytest
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+FIXTURES_DIR = os.path.join(ROOT_DIR, 'data', 'fixtures')
+
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+
+def load_fixture(name):
+    """
+    Lee un fixture de data/fixtures: el HTML grabado y su configuración de URL.
+
+    Args:
+        name (str): Nombre del fixture sin extensión (p. ej. 'uvigo_profesor').
+
+    Returns:
+        tuple: (html, config)
+    """
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), 'r', encoding='utf-8') as f:
+        html = f.read()
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return html, config
+
+
+@pytest.fixture
+def freeze_today(monkeypatch):
+    """
+    Fija la fecha que date_check considera "hoy": freeze_today(2025, 1, 15).
+    """
+    import processors
+
+    def freeze(year, month, day):
+        frozen = datetime(year, month, day, 12, 0)
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return frozen
+
+        monkeypatch.setattr(processors, 'datetime', FrozenDatetime)
+        return frozen
+
+    return freeze
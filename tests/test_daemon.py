@@ -0,0 +1,79 @@
+"""
+Modo residente: un lote cuyo guardado falla no debe dar por vistos sus
+cambios ni sus ofertas, que se vuelven a detectar (y guardar y notificar)
+en el lote siguiente, sin duplicar lo que ya hubiera llegado a SQLite.
+"""
+import pytest
+
+import daemon as daemon_module
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """
+    Daemon con todo su estado en un directorio temporal y un scraper que
+    devuelve resultados fijos (una oferta por fuente) sin acceder a la red.
+    """
+    monkeypatch.chdir(tmp_path)
+    instance = daemon_module.Daemon()
+    instance.configs = {name: {'name': name, 'url': f"https://{name}.org"} for name in ('a', 'b')}
+
+    def scrape_all():
+        return [
+            {'timestamp': instance.scraper.timestamp, 'name': config['name'], 'url': config['url'], 'status': 'YES',
+             '_offers': [{'title': 'Contrato predoctoral', 'link': f"{config['url']}/oferta/1", 'end': '2099-12-31'}]}
+            for config in instance.scraper.urls_config
+        ]
+
+    monkeypatch.setattr(instance.scraper, 'scrape_all', scrape_all)
+    yield instance
+    instance.close()
+
+
+def failing_save(results, timestamp):
+    raise OSError('disco lleno')
+
+
+def test_failed_batch_is_detected_again(daemon, monkeypatch):
+    saved = []
+    monkeypatch.setattr(daemon, '_save_excel', failing_save)
+    daemon.run_batch(['a'])
+    assert daemon.detector.state == {}
+
+    monkeypatch.setattr(daemon, '_save_excel', lambda results, timestamp: saved.extend(results))
+    daemon.run_batch(['a'])
+    assert [result['name'] for result in saved] == ['a']
+    assert 'a' in daemon.detector.state
+
+
+def test_failed_batch_keeps_offers_new(daemon, monkeypatch):
+    notified = []
+    monkeypatch.setattr(daemon.notifier, 'send_new_offers', lambda offers, timestamp: notified.extend(offers))
+
+    monkeypatch.setattr(daemon, '_save_excel', failing_save)
+    daemon.run_batch(['a'])
+    # Otro lote que sí se guarda no debe registrar las ofertas del lote fallido
+    monkeypatch.setattr(daemon, '_save_excel', lambda results, timestamp: None)
+    daemon.run_batch(['b'])
+    daemon.run_batch(['a'])
+
+    assert [offer['link'] for offer in notified] == ['https://b.org/oferta/1', 'https://a.org/oferta/1']
+
+
+def test_failed_batch_is_not_stored_twice(daemon, monkeypatch, tmp_path):
+    from results_store import ResultsStore
+
+    monkeypatch.setattr(daemon_module, 'RESULTS_STORE', 'both')
+    daemon.store = ResultsStore(str(tmp_path / 'results.db'))
+    monkeypatch.setattr(daemon, '_save_excel', failing_save)
+    daemon.run_batch(['a'])
+    # Las inserciones del lote fallido se deshacen
+    assert daemon.store.connection.execute('SELECT COUNT(*) FROM offers').fetchone()[0] == 0
+
+    monkeypatch.setattr(daemon, '_save_excel', lambda results, timestamp: None)
+    daemon.run_batch(['a'])
+    daemon.run_batch(['a'])
+
+    connection = daemon.store.connection
+    assert connection.execute('SELECT COUNT(*) FROM offers').fetchone()[0] == 1
+    assert connection.execute('SELECT COUNT(DISTINCT timestamp) FROM results').fetchone()[0] == 1
@@ -0,0 +1,95 @@
+"""
+Archivo Excel de resultados (excel_handler.py): rotación mensual, migración
+de un Excel único a archivos mensuales e índice de encabezados guardado en
+data/.cache/<nombre>.headers.json.
+"""
+import json
+import os
+
+import openpyxl
+import pytest
+
+from excel_handler import ExcelHandler, excel_path_for, split_by_month, update_excel_with_results
+
+EXCEL = 'data/scraper_estudios.xlsx'
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """
+    Rutas relativas del Excel y de su índice dentro de tmp_path.
+    """
+    monkeypatch.chdir(tmp_path)
+
+
+def read_rows(filepath):
+    """
+    Filas de un Excel como diccionarios encabezado -> valor.
+    """
+    workbook = openpyxl.load_workbook(filepath)
+    rows = list(workbook.active.iter_rows(values_only=True))
+    workbook.close()
+    return [dict(zip(rows[0], row)) for row in rows[1:]]
+
+
+def result(timestamp, **counts):
+    return {'timestamp': timestamp, 'name': 'UVigo', 'url': 'https://ejemplo.org', **counts}
+
+
+def test_excel_path_for_rotation():
+    assert excel_path_for('2025-01-15 20:00:00', EXCEL, 'monthly') == 'data/scraper_estudios_2025-01.xlsx'
+    assert excel_path_for('2025-01-15 20:00:00', EXCEL, 'none') == EXCEL
+
+
+def test_split_by_month():
+    update_excel_with_results([
+        result('2025-01-15 20:00:00', psicolog=1),
+        result('2025-01-20 20:00:00', psicolog=2),
+        result('2025-02-03 20:00:00', psicolog=3),
+    ], EXCEL)
+
+    written = split_by_month(EXCEL)
+    assert written == {'data/scraper_estudios_2025-01.xlsx': 2, 'data/scraper_estudios_2025-02.xlsx': 1}
+    assert [row['psicolog'] for row in read_rows('data/scraper_estudios_2025-02.xlsx')] == [3]
+    # Repetir la migración no duplica filas
+    assert split_by_month(EXCEL) == {}
+
+
+def test_header_index_is_saved_with_the_file():
+    update_excel_with_results([result('2025-01-15 20:00:00', psicolog=1)], EXCEL)
+    with open('data/.cache/scraper_estudios.headers.json', encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['headers'] == {'name': 1, 'psicolog': 2, 'timestamp': 3, 'url': 4}
+    stat = os.stat(EXCEL)
+    assert saved['signature'] == [stat.st_size, stat.st_mtime_ns]
+
+
+def test_header_index_invalidated_by_external_edit():
+    update_excel_with_results([result('2025-01-15 20:00:00', psicolog=1)], EXCEL)
+
+    # Alguien abre el Excel y añade una columna al principio
+    workbook = openpyxl.load_workbook(EXCEL)
+    workbook.active.insert_cols(1)
+    workbook.active.cell(1, 1, 'nota')
+    workbook.save(EXCEL)
+    workbook.close()
+
+    # El índice guardado ya no corresponde al archivo: se relee la fila 1
+    update_excel_with_results([result('2025-01-16 20:00:00', psicolog=2)], EXCEL)
+    rows = read_rows(EXCEL)
+    assert [(row['timestamp'], row['psicolog']) for row in rows] == [
+        ('2025-01-15 20:00:00', 1), ('2025-01-16 20:00:00', 2)
+    ]
+    assert rows[1]['nota'] is None
+
+
+def test_new_column_is_appended():
+    update_excel_with_results([result('2025-01-15 20:00:00', psicolog=1)], EXCEL)
+    update_excel_with_results([result('2025-01-16 20:00:00', psicolog=2, python=4)], EXCEL)
+
+    handler = ExcelHandler(EXCEL)
+    handler.load_or_create()
+    # El índice guardado corresponde al archivo y ya incluye la columna nueva, al final
+    assert handler.load_header_index() == {'name': 1, 'psicolog': 2, 'timestamp': 3, 'url': 4, 'python': 5}
+    handler.close()
+    assert [row['python'] for row in read_rows(EXCEL)] == [None, 4]
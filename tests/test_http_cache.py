@@ -0,0 +1,61 @@
+"""
+Reutilización de resultados de la caché HTTP (ValidatorCache): una página
+sin cambios no se vuelve a parsear, pero los resultados que dependen de la
+fecha (date_check) se evalúan de nuevo en cada ejecución.
+"""
+import pytest
+
+from conftest import load_fixture
+from fixture_server import FixtureServer
+from http_cache import ValidatorCache
+from scraper import WebScraper
+
+
+@pytest.fixture
+def uvigo_server(tmp_path, monkeypatch):
+    """
+    Servidor local con el fixture de UVigo y su configuración de URL.
+    Los archivos relativos del scraper (cachés) quedan en tmp_path.
+    """
+    monkeypatch.chdir(tmp_path)
+    _, config = load_fixture('uvigo_profesor')
+    with FixtureServer() as server:
+        yield server, dict(config, url=f"{server.base_url}/fixtures/uvigo_profesor.html")
+
+
+def scrape(config, cache_path):
+    """
+    Ejecución completa del scraper sobre una URL con la caché indicada.
+    """
+    scraper = WebScraper(urls_config=[config])
+    scraper.rate_limiter.delay = 0
+    scraper.cache = ValidatorCache(str(cache_path))
+    results = scraper.scrape_all(max_workers=1, parse_workers=0)
+    return scraper, results[0]
+
+
+def test_date_check_cached_result_is_reevaluated(uvigo_server, tmp_path, freeze_today):
+    server, config = uvigo_server
+    cache_path = tmp_path / 'http_cache.json'
+
+    # Primera ejecución: se parsea la página y se guarda en la caché
+    freeze_today(2019, 3, 10)
+    scraper, result = scrape(config, cache_path)
+    assert scraper.cache.hits == 0
+    assert (result['status'], result['closing_dates']) == ("YES", '15/03/2019')
+
+    # Días después, con la página sin cambios: se reutiliza la caché, pero
+    # el plazo de 2019 ya está cerrado
+    freeze_today(2020, 6, 1)
+    scraper, result = scrape(config, cache_path)
+    assert scraper.cache.hits == 1
+    assert (result['status'], result['active_offers'], result['closing_dates']) == ("NO", 0, '')
+    assert result['_offers'] == []
+
+    # Y cuando se abre el plazo siguiente, aparece aunque la página siga igual
+    freeze_today(2025, 1, 15)
+    scraper, result = scrape(config, cache_path)
+    assert scraper.cache.hits == 1
+    assert (result['status'], result['closing_dates']) == ("YES", '31/12/2099')
+    assert [offer['end'] for offer in result['_offers']] == ['2099-12-31']
+    assert '_windows' not in result
@@ -0,0 +1,50 @@
+"""
+Métricas de cada ejecución: tiempos de conexión y esperas entre reintentos
+separados de la petición y tamaño acotado de metrics.jsonl.
+"""
+import os
+
+from fixture_server import FixtureServer
+from http_session import PooledSession
+from metrics import RunMetrics
+
+
+def test_connection_phases_only_for_new_connections():
+    session = PooledSession()
+    with FixtureServer(robots='') as server:
+        session.get(f"{server.base_url}/robots.txt")
+        first = session.connection_timings()
+        session.get(f"{server.base_url}/robots.txt")
+        reused = session.connection_timings()
+    session.close()
+
+    assert set(first) == {'dns', 'connect'}  # HTTP: sin TLS
+    assert reused == {}  # Conexión keep-alive ya abierta
+
+
+def test_retry_backoff_is_a_phase_of_its_own():
+    session = PooledSession(retries=1)
+    with FixtureServer(error_rate=1.0) as server:
+        response = session.get(f"{server.base_url}/robots.txt")
+        timings = session.connection_timings()
+    session.close()
+
+    # Dos intentos con 503 y una espera entre ellos, que no se cuenta como petición
+    assert response.status_code == 503
+    assert len(response.raw.retries.history) == 1
+    assert 'backoff' in timings
+
+
+def test_metrics_file_is_rotated(tmp_path):
+    filepath = str(tmp_path / 'metrics.jsonl')
+    metrics = RunMetrics('2025-01-15 20:00:00')
+    for i in range(50):
+        metrics.add('request', 0.01, f"Fuente {i}")
+
+    for _ in range(4):
+        metrics.write(filepath, max_bytes=2000)
+
+    # Cada escritura por encima del límite rota el archivo: solo quedan dos generaciones
+    assert sorted(os.listdir(tmp_path)) == ['metrics.jsonl', 'metrics.jsonl.1']
+    with open(filepath, encoding='utf-8') as f:
+        assert len(f.readlines()) == 50
@@ -0,0 +1,135 @@
+"""
+Notificador de Telegram contra la API simulada de benchmarks/telegram_server.py:
+troceado a 4096 caracteres sin romper el HTML, respuesta a los 429
+(retry_after) y entrega de lo pendiente al cerrar.
+"""
+import re
+
+import pytest
+
+import notifier
+from notifier import TelegramNotifier, split_message
+from telegram_server import MAX_LENGTH, TelegramServer, html_error
+
+
+def offers_line(count):
+    """
+    Una sola línea muy larga con enlaces y formato, como una lista de ofertas sin saltos.
+    """
+    return ' '.join(
+        f'• <b>Fuente {i}</b>: <a href="https://ejemplo.org/oferta/{i}">Contrato &amp; beca <i>{i}</i></a>'
+        for i in range(count)
+    )
+
+
+def visible_text(chunks):
+    """
+    Texto sin etiquetas de una lista de trozos, sin tener en cuenta los espacios.
+    """
+    return ''.join(re.sub(r'<[^>]*>|\s+', '', chunk) for chunk in chunks)
+
+
+def test_split_keeps_lines_and_limit():
+    lines = [f"• <b>Fuente {i}</b>: 3 → 4 (+1)" for i in range(1000)]
+    chunks = split_message('\n'.join(lines))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= MAX_LENGTH for chunk in chunks)
+    # Las líneas cortas no se cortan: cada trozo es una secuencia de líneas completas
+    assert '\n'.join(chunks).split('\n') == lines
+
+
+@pytest.mark.parametrize('max_length', [MAX_LENGTH, 300, 60])
+def test_split_long_line_outside_tags(max_length):
+    line = offers_line(300)
+    chunks = split_message(f"📌 <b>Ofertas nuevas</b>\n{line}\nfin", max_length)
+    assert all(len(chunk) <= max_length for chunk in chunks)
+    # Cada trozo es HTML válido por sí solo y no se pierde texto
+    assert [html_error(chunk) for chunk in chunks] == [None] * len(chunks)
+    assert visible_text(chunks) == visible_text([f"📌 <b>Ofertas nuevas</b>\n{line}\nfin"])
+
+
+def test_split_word_longer_than_limit():
+    chunks = split_message(f"<b>{'x' * 250}</b>", 100)
+    assert all(len(chunk) <= 100 and html_error(chunk) is None for chunk in chunks)
+    assert visible_text(chunks) == 'x' * 250
+
+
+@pytest.fixture
+def telegram(monkeypatch):
+    """
+    API de Telegram simulada y un notificador que envía a ella, sin las
+    esperas reales entre mensajes.
+    """
+    monkeypatch.setattr(notifier, 'TELEGRAM_MIN_INTERVAL', 0)
+    monkeypatch.setattr(notifier, 'TELEGRAM_COALESCE_DELAY', 0.05)
+    with TelegramServer() as server:
+        yield server, TelegramNotifier('TOKEN', '42', base_url=server.base_url)
+
+
+def test_long_message_is_chunked_and_delivered(telegram):
+    server, bot = telegram
+    bot.send_message(f"📌 <b>Ofertas nuevas</b>\n{offers_line(200)}")
+    assert bot.close(timeout=30)
+
+    texts = [message['text'] for message in server.messages]
+    assert len(texts) > 1
+    assert all(len(text) <= MAX_LENGTH for text in texts)
+    # La API simulada rechaza el HTML mal formado, como la real
+    assert server.stats['rejected'] == 0
+    assert (bot.sent, bot.failed) == (len(texts), 0)
+    assert visible_text(texts) == visible_text([f"📌 <b>Ofertas nuevas</b>\n{offers_line(200)}"])
+
+
+def test_retry_after_is_respected(telegram):
+    server, bot = telegram
+    server.throttle = 1
+    server.retry_after = 1
+    bot.send_message('<b>Aviso</b>')
+    assert bot.close(timeout=30)
+
+    assert server.stats['throttled'] == 1
+    assert [message['text'] for message in server.messages] == ['<b>Aviso</b>']
+    assert (bot.sent, bot.failed) == (1, 0)
+
+
+def test_close_flushes_queue(telegram):
+    server, bot = telegram
+    for i in range(5):
+        bot.send_message(f"Aviso {i}")
+    # close() vuelve solo cuando se ha entregado todo lo encolado
+    assert bot.close(timeout=30)
+
+    delivered = '\n'.join(message['text'] for message in server.messages)
+    assert [f"Aviso {i}" in delivered for i in range(5)] == [True] * 5
+    assert bot.failed == 0
+
+
+def test_sender_restarts_after_failed_connection(telegram):
+    server, bot = telegram
+    server.fail_auth = 1
+    bot.send_message('Primero')
+    # El primer hilo no consigue conectar: descarta su mensaje y termina
+    bot._thread.join(timeout=30)
+    assert bot.failed == 1
+
+    # El siguiente envío arranca otro hilo, que conecta y entrega
+    bot.send_message('Segundo')
+    assert not bot.close(timeout=30)  # False: el primer mensaje no se entregó
+    assert [message['text'] for message in server.messages] == ['Segundo']
+    assert bot.sent == 1
+
+
+def test_close_reports_undelivered_messages(telegram):
+    server, bot = telegram
+    server.fail_auth = 10
+    bot.send_message('Aviso')
+    assert not bot.close(timeout=30)
+    assert server.messages == []
+
+
+def test_error_text_is_escaped(telegram):
+    server, bot = telegram
+    bot.send_error("'<' not supported between 'str' & 'int'", '2025-01-15 20:00:00')
+    assert bot.close(timeout=30)
+    assert server.stats['rejected'] == 0
+    assert "&lt;" in server.messages[0]['text']
@@ -0,0 +1,85 @@
+"""
+Listados paginados: la frontera (frontier.py) normaliza y deduplica las
+URLs, descarta otros hosts y respeta max_pages, y el scraper agrega las
+páginas descargadas en un único resultado.
+"""
+import pytest
+
+import scraper as scraper_module
+from fixture_server import FixtureServer, paged_config
+from frontier import CrawlFrontier, normalize_url
+from scraper import WebScraper
+
+
+def test_normalize_url_variants():
+    expected = 'https://ejemplo.org/ofertas?a=1&page=2'
+    assert normalize_url('HTTPS://Ejemplo.ORG:443/ofertas?page=2&a=1#listado') == expected
+    assert normalize_url('https://ejemplo.org/ofertas?a=1&page=2') == expected
+    # Ruta vacía y puerto que no es el de defecto
+    assert normalize_url('http://ejemplo.org') == 'http://ejemplo.org/'
+    assert normalize_url('http://ejemplo.org:8080/x') == 'http://ejemplo.org:8080/x'
+
+
+def test_frontier_same_host_dedup_and_limit():
+    frontier = CrawlFrontier('https://ejemplo.org/ofertas', max_pages=3)
+    base = 'https://ejemplo.org/ofertas'
+    assert frontier.add('?page=2#listado', base)
+    assert not frontier.add('https://EJEMPLO.org/ofertas?page=2', base)  # Ya vista
+    assert not frontier.add('https://otro-sitio.example/ofertas?page=3', base)  # Otro host
+    assert not frontier.add('mailto:rrhh@ejemplo.org', base)
+    assert not frontier.add('/ofertas', base)  # La primera página
+    assert frontier.add('?page=3', base)
+    assert not frontier.add('?page=4', base)  # max_pages incluye la primera
+    assert frontier.pop_all() == ['https://ejemplo.org/ofertas?page=2', 'https://ejemplo.org/ofertas?page=3']
+    assert frontier.pop_all() == []
+
+
+def scrape(urls_config, **kwargs):
+    """
+    Ejecución completa del scraper sin retardo entre peticiones ni caché.
+    """
+    scraper = WebScraper(urls_config=urls_config)
+    scraper.rate_limiter.delay = 0
+    scraper.cache = None
+    return scraper, scraper.scrape_all(**kwargs)
+
+
+def test_paged_listing_is_merged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with FixtureServer() as server:
+        # Cada página enlaza todas las demás (una de ellas con fragmento) y otro sitio
+        scraper, results = scrape(paged_config(server.base_url, 1, 3), max_workers=1, parse_workers=0)
+        stats = dict(server.stats)
+
+    # Cada página se descarga una vez; el enlace a otro host no se sigue
+    assert stats['ok'] == 3
+    assert [record['pages'] for record in scraper.metrics.records if record['stage'] == 'paginate'] == [3]
+    # Los conteos son la suma de las tres páginas (10 ofertas cada una) y
+    # los enlaces de cada página no llegan al resultado
+    result = results[0]
+    assert (result['psicología'], result['python']) == (90, 30)
+    assert '_links' not in result
+
+
+def test_paged_listing_respects_max_pages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with FixtureServer() as server:
+        config = paged_config(server.base_url, 1, 5)[0]
+        config['pagination'] = dict(config['pagination'], max_pages=2)
+        _, results = scrape([config], max_workers=1, parse_workers=0)
+        stats = dict(server.stats)
+
+    assert stats['ok'] == 2
+    assert results[0]['python'] == 20
+
+
+@pytest.mark.parametrize('parse_workers', [0, 1])
+def test_pagination_does_not_starve_download_pool(tmp_path, monkeypatch, parse_workers):
+    # Cada listado se recorre en su propio pool, dentro de un hilo del pool de
+    # descargas: con un único hilo de descarga todos los listados terminan
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(scraper_module, 'PAGINATION_WORKERS', 2)
+    with FixtureServer() as server:
+        _, results = scrape(paged_config(server.base_url, 3, 3), max_workers=1, parse_workers=parse_workers)
+
+    assert [result['python'] for result in results] == [30, 30, 30]
@@ -0,0 +1,90 @@
+"""
+Resultados de extracción de cada motor de parseo sobre los fixtures
+grabados, comparados con los valores esperados (y no solo entre motores,
+como hace python src/parsers.py).
+"""
+import pytest
+
+import parsers
+from processors import get_plan
+from conftest import load_fixture
+
+# Motores instalados, con y sin parseo parcial (selectolax no admite parse_only)
+BACKENDS = [
+    pytest.param(backend, partial, id=f"{backend}{'+parse_only' if partial else ''}")
+    for backend in parsers.available_backends()
+    for partial in (False, True)
+    if not (partial and backend == 'selectolax')
+]
+
+
+def extract(name, backend, partial):
+    """
+    Parsea un fixture con un motor, ejecuta su plan de extracción y
+    evalúa el resultado (ver UrlPlan.finalize).
+    """
+    html, config = load_fixture(name)
+    plan = get_plan(config)
+    soup = parsers.parse(html, backend, plan.parse_only if partial else None)
+    return plan.finalize(plan.run(soup))
+
+
+@pytest.mark.parametrize('backend, partial', BACKENDS)
+def test_whole_page_counts(backend, partial):
+    # El texto de <script> y <style> no cuenta
+    data = extract('whole_page', backend, partial)
+    assert data == {'psicología': 6, 'neurociencia': 4, 'python': 1, 'doctorado': 2, 'investigación': 3}
+
+
+@pytest.mark.parametrize('backend, partial', BACKENDS)
+def test_keyword_areas_counts(backend, partial):
+    data = extract('keyword_areas', backend, partial)
+    assert data == {
+        'titulo_psicología': 2, 'titulo_neurociencia': 1, 'titulo_python': 0, 'titulo_doctorado': 0,
+        'descripcion_psicología': 5, 'descripcion_neurociencia': 5, 'descripcion_python': 2,
+        'descripcion_doctorado': 3,
+        'requisitos_psicología': 2, 'requisitos_neurociencia': 1, 'requisitos_python': 0,
+        'requisitos_doctorado': 1,
+    }
+
+
+@pytest.mark.parametrize('backend, partial', BACKENDS)
+def test_keyword_check_offers(backend, partial):
+    data = extract('usc_emprego', backend, partial)
+    assert data['status'] == "YES"
+    assert data['_offers'] == [{
+        'title': 'Psicólogo/a clínico/a - Servizo de Psicología Aplicada',
+        'link': 'https://www.usc.gal/gl/emprego/oferta/103',
+        'start': None,
+        'end': None,
+    }]
+
+
+@pytest.mark.parametrize('backend, partial', BACKENDS)
+@pytest.mark.parametrize('today, expected', [
+    # Antes de cualquier plazo
+    ((2018, 6, 1), {'status': "NO", 'active_offers': 0, 'closing_dates': ''}),
+    # Dentro del plazo de 2019 (el rango del <script> no es una fila y no cuenta)
+    ((2019, 3, 15), {'status': "YES", 'active_offers': 1, 'closing_dates': '15/03/2019'}),
+    # Entre los dos plazos
+    ((2020, 6, 1), {'status': "NO", 'active_offers': 0, 'closing_dates': ''}),
+    # Dentro del plazo abierto hasta 2099
+    ((2025, 1, 15), {'status': "YES", 'active_offers': 1, 'closing_dates': '31/12/2099'}),
+])
+def test_date_check_windows(backend, partial, today, expected, freeze_today):
+    freeze_today(*today)
+    data = extract('uvigo_profesor', backend, partial)
+    assert {key: data[key] for key in expected} == expected
+
+
+def test_date_check_merge_of_paged_listing(freeze_today):
+    # Cada página de un listado conserva los cierres como fechas y solo el
+    # resultado agregado les da formato
+    freeze_today(2019, 3, 15)
+    html, config = load_fixture('uvigo_profesor')
+    plan = get_plan(dict(config, pagination={'next': 'a.next'}))
+    page = plan.finalize(plan.run(parsers.parse(html, 'html.parser')))
+    assert 'closing_dates' not in page
+
+    merged = plan.merge([page, page])
+    assert merged == {'status': "YES", 'active_offers': 2, 'closing_dates': '15/03/2019, 15/03/2019'}
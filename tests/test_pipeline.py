@@ -0,0 +1,24 @@
+"""
+Workers de parseo (pipeline.py): arrancan sin fork y devuelven lo mismo
+que el parseo en el propio proceso.
+"""
+import pipeline
+from metrics import RunMetrics
+from processors import parse_and_extract
+from conftest import load_fixture
+
+
+def test_start_method_never_forks():
+    # Los workers se crean con hilos de descarga en marcha
+    assert pipeline.start_method() in ('forkserver', 'spawn')
+
+
+def test_worker_matches_in_process_extraction():
+    html, config = load_fixture('whole_page')
+    expected = parse_and_extract(config, html, RunMetrics())
+
+    with pipeline.ParsePipeline(workers=1) as parse_pipeline:
+        data, records = parse_pipeline.submit(config, html).result(timeout=60)
+
+    assert data == expected
+    assert [record['stage'] for record in records] == ['parse', 'extract']
@@ -0,0 +1,80 @@
+"""
+Rate limiting por host (rate_limiter.py), con un reloj simulado y con hilos
+reales: las peticiones al mismo host se separan el retardo configurado y
+las de hosts distintos no se esperan entre sí.
+"""
+import threading
+import time
+
+import pytest
+
+import rate_limiter
+from rate_limiter import HostRateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Reloj simulado: time.sleep avanza time.monotonic sin esperar de verdad.
+    """
+    now = [100.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, 'sleep', sleep)
+    return now, sleeps
+
+
+def test_same_host_is_spaced(clock):
+    now, sleeps = clock
+    limiter = HostRateLimiter(delay=2)
+    assert limiter.wait('https://ejemplo.org/a') == 0
+    assert limiter.wait('https://EJEMPLO.org/b') == 2
+    now[0] += 5  # Pasado el retardo no se espera
+    assert limiter.wait('https://ejemplo.org/c') == 0
+    assert sleeps == [2]
+
+
+def test_different_hosts_do_not_wait(clock):
+    _, sleeps = clock
+    limiter = HostRateLimiter(delay=2)
+    assert [limiter.wait(f"https://sitio{i}.org/") for i in range(3)] == [0, 0, 0]
+    assert sleeps == []
+
+
+def test_host_delay_overrides_default(clock):
+    limiter = HostRateLimiter(delay=2)
+    limiter.set_delay('https://lento.org/', 10)
+    limiter.wait('https://lento.org/a')
+    limiter.wait('https://rapido.org/a')
+    assert limiter.wait('https://rapido.org/b') == 2
+    assert limiter.wait('https://lento.org/b') == 8  # 10 desde su petición anterior
+    limiter.set_delay('https://lento.org/', None)
+    assert limiter.delay_for('https://lento.org/') == 2
+
+
+def parallel_waits(limiter, urls):
+    """
+    Espera el turno de cada URL en su propio hilo, a la vez.
+
+    Returns:
+        float: Segundos hasta que todos los hilos han obtenido su turno.
+    """
+    threads = [threading.Thread(target=limiter.wait, args=(url,)) for url in urls]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.monotonic() - start
+
+
+def test_concurrent_waits_with_real_clock():
+    # Tres hilos contra el mismo host salen uno tras otro (dos retardos);
+    # contra tres hosts distintos salen a la vez
+    assert parallel_waits(HostRateLimiter(delay=0.2), ['https://ejemplo.org/'] * 3) >= 0.4
+    assert parallel_waits(HostRateLimiter(delay=0.2), [f"https://sitio{i}.org/" for i in range(3)]) < 0.2
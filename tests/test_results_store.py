@@ -0,0 +1,45 @@
+"""
+Almacén SQLite de resultados: ida y vuelta base de datos -> Excel (un
+archivo por mes) -> base de datos.
+"""
+import os
+
+import results_store
+from results_store import ResultsStore, export_excel, import_excel
+
+RUNS = [
+    [
+        {'timestamp': '2025-01-15 20:00:00', 'name': 'UVigo', 'url': 'https://uvigo.gal', 'status': 'NO'},
+        {'timestamp': '2025-01-15 20:00:00', 'name': 'Web', 'url': 'https://web.org', 'python': 2, 'psicología': 5},
+    ],
+    [
+        {'timestamp': '2025-02-04 20:00:00', 'name': 'UVigo', 'url': 'https://uvigo.gal', 'status': 'YES'},
+        {'timestamp': '2025-02-04 20:00:00', 'name': 'Web', 'url': 'https://web.org', 'error': 'Failed to fetch page'},
+    ],
+]
+
+
+def test_export_import_round_trip(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ResultsStore(str(tmp_path / 'original.db'))
+    for run in RUNS:
+        store.insert_results(run)
+    store.close()
+
+    exported = export_excel(filepath=str(tmp_path / 'original.db'), rotation='monthly')
+    assert sorted(exported.items()) == [
+        ('data/scraper_estudios_2025-01.xlsx', 1),
+        ('data/scraper_estudios_2025-02.xlsx', 1),
+    ]
+    assert not os.path.exists(results_store.EXCEL_FILE)
+
+    # Sin argumentos se importan todos los archivos mensuales; dos veces no duplica
+    assert import_excel(filepath=str(tmp_path / 'copy.db')) == 4
+    import_excel(filepath=str(tmp_path / 'copy.db'))
+
+    copy = ResultsStore(str(tmp_path / 'copy.db'))
+    try:
+        assert list(copy.iter_runs()) == RUNS
+        assert copy.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0] == 9
+    finally:
+        copy.close()
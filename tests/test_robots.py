@@ -0,0 +1,87 @@
+"""
+robots.txt (robots.py): códigos que prohíben todo el sitio, reintento de los
+hosts que no responden, Crawl-delay acotado y su paso al rate limiter del
+scraper.
+"""
+import pytest
+
+import robots
+from fixture_server import FixtureServer, synthetic_config
+from robots import RobotsCache
+from scraper import WebScraper
+
+
+def fake_fetch(status, text='', calls=None):
+    """
+    Función de descarga para RobotsCache que responde siempre lo mismo.
+    """
+    def fetch(url):
+        if calls is not None:
+            calls.append(url)
+        if status is None:
+            raise ConnectionError('sin respuesta')
+        return status, text
+    return fetch
+
+
+@pytest.mark.parametrize('status', [401, 403])
+def test_auth_errors_disallow_everything(status):
+    cache = RobotsCache(fake_fetch(status), filepath='')
+    assert not cache.allowed('https://ejemplo.org/')
+    assert not cache.allowed('https://ejemplo.org/ofertas?page=2')
+
+
+def test_not_found_allows_everything():
+    cache = RobotsCache(fake_fetch(404), filepath='')
+    assert cache.allowed('https://ejemplo.org/ofertas')
+    assert cache.crawl_delay('https://ejemplo.org/ofertas') is None
+
+
+def test_unreachable_host_is_retried_after_ten_minutes(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(robots.time, 'time', lambda: now[0])
+    calls = []
+    cache = RobotsCache(fake_fetch(None, calls=calls), filepath=str(tmp_path / 'robots.json'))
+
+    # Sin respuesta se permite el acceso, y no se vuelve a pedir enseguida
+    assert cache.allowed('https://ejemplo.org/ofertas')
+    now[0] += 599
+    assert cache.allowed('https://ejemplo.org/otra')
+    assert len(calls) == 1
+
+    now[0] += 1
+    cache.allowed('https://ejemplo.org/ofertas')
+    assert len(calls) == 2
+
+    # Tampoco se guarda en disco para la siguiente ejecución
+    cache.save()
+    assert RobotsCache(fake_fetch(200), filepath=str(tmp_path / 'robots.json'))._entries == {}
+
+
+def test_crawl_delay_is_capped(monkeypatch):
+    monkeypatch.setattr(robots, 'ROBOTS_MAX_DELAY', 5)
+    slow = RobotsCache(fake_fetch(200, 'User-agent: *\nCrawl-delay: 120\n'), filepath='')
+    assert slow.crawl_delay('https://ejemplo.org/') == 5.0
+
+    # Request-rate se convierte en segundos entre peticiones
+    rate = RobotsCache(fake_fetch(200, 'User-agent: *\nRequest-rate: 1/2\n'), filepath='')
+    assert rate.crawl_delay('https://ejemplo.org/') == 2.0
+
+
+def test_scraper_applies_disallow_and_crawl_delay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # La caché de robots.txt queda en tmp_path
+    rules = 'User-agent: *\nDisallow: /synthetic/4/1\nCrawl-delay: 1\n'
+    with FixtureServer(robots=rules) as server:
+        urls_config = synthetic_config(server.base_url, 2, 4)
+        scraper = WebScraper(urls_config=urls_config)
+        scraper.rate_limiter.delay = 0
+        scraper.cache = None
+        results = scraper.scrape_all(max_workers=2, parse_workers=0)
+        stats = dict(server.stats)
+
+    # La URL prohibida no se pide: solo robots.txt y la permitida
+    assert 'error' not in results[0]
+    assert results[1]['error'] == 'Disallowed by robots.txt'
+    assert stats['ok'] == 2
+    # El Crawl-delay sustituye al retardo por defecto para ese host
+    assert scraper.rate_limiter.delay_for(urls_config[0]['url']) == 1.0
@@ -0,0 +1,36 @@
+"""
+Ejecución repartida en shards: los shards fallidos no notifican por su
+cuenta; la combinación envía un único aviso con todos los errores.
+"""
+import json
+
+import pytest
+
+import main
+from notifier import TelegramNotifier
+from scraper import WebScraper
+
+
+def test_failed_shards_are_notified_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    urls_path = tmp_path / 'urls_config.json'
+    urls_path.write_text(json.dumps([
+        {'name': f"Fuente {i}", 'url': f"https://fuente{i}.org", 'keywords': ['python']} for i in range(4)
+    ]), encoding='utf-8')
+
+    errors = []
+    monkeypatch.setattr(TelegramNotifier, 'send_error', lambda self, message, timestamp: errors.append(message))
+
+    def scrape_all(self):
+        raise RuntimeError('sin red')
+
+    monkeypatch.setattr(WebScraper, 'scrape_all', scrape_all)
+
+    for index in (1, 2):
+        with pytest.raises(RuntimeError):
+            main.main(urls_config=str(urls_path), shard=(index, 2))
+    assert errors == []
+
+    with pytest.raises(ValueError):
+        main.main(merge=True)
+    assert errors == ['Han fallado los shards: 1: sin red; 2: sin red']
@@ -0,0 +1,94 @@
+"""
+Archivo de páginas (snapshots.py): un objeto por contenido distinto aunque
+aparezca en varias ejecuciones, páginas anotadas desde un 304 y repetición
+sin red con los mismos resultados que la ejecución en vivo.
+"""
+import os
+
+import pytest
+
+from fixture_server import FixtureServer, fixtures_config
+from scraper import WebScraper
+from snapshots import SnapshotArchive, replay_run
+
+CONFIG = {'name': 'UVigo', 'url': 'https://ejemplo.org/ofertas'}
+HTML = '<html><body><h1>Psicología</h1></body></html>'
+
+
+def objects(directory):
+    """
+    Archivos de objetos guardados en el archivo.
+    """
+    return [filename for _, _, filenames in os.walk(os.path.join(directory, 'objects')) for filename in filenames]
+
+
+@pytest.fixture
+def snapshots_dir(tmp_path, monkeypatch):
+    """
+    Directorio del archivo (SNAPSHOTS_DIR) y del resto de archivos relativos en tmp_path.
+    """
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / 'snapshots')
+
+
+def test_same_content_is_stored_once(snapshots_dir):
+    archive = SnapshotArchive(snapshots_dir, 'gzip')
+    content = HTML.encode('utf-8')
+    assert archive.store('2025-01-15 20:00:00', CONFIG, 'ab' * 32, content, 'utf-8', status=200)
+    assert archive.store('2025-01-16 20:00:00', CONFIG, 'ab' * 32, content, 'utf-8', status=200)
+
+    assert (archive.stored, archive.deduplicated) == (1, 1)
+    assert len(objects(snapshots_dir)) == 1
+    assert archive.runs() == ['2025-01-15_20-00-00', '2025-01-16_20-00-00']
+    entry, = archive.read_run('2025-01-16_20-00-00')
+    assert archive.load(entry) == HTML
+
+
+def test_not_modified_page_points_to_archived_content(snapshots_dir):
+    archive = SnapshotArchive(snapshots_dir, 'gzip')
+    archive.store('2025-01-15 20:00:00', CONFIG, 'cd' * 32, HTML.encode('utf-8'), 'utf-8', status=200)
+
+    # 304: sin cuerpo, se anota el objeto ya archivado con ese hash
+    assert archive.store('2025-01-16 20:00:00', CONFIG, 'cd' * 32, status=304)
+    entry, = archive.read_run('2025-01-16_20-00-00')
+    assert (entry['status'], entry['encoding']) == (304, None)
+    assert archive.load(entry) == HTML
+
+    # Si nunca se archivó esa página no hay nada que anotar
+    assert not archive.store('2025-01-17 20:00:00', CONFIG, 'ef' * 32, status=304)
+    assert '2025-01-17_20-00-00' not in archive.runs()
+
+
+def scrape(urls_config, archive, timestamp):
+    """
+    Ejecución completa del scraper que archiva las páginas descargadas.
+    """
+    scraper = WebScraper(urls_config=urls_config)
+    scraper.timestamp = timestamp
+    scraper.rate_limiter.delay = 0
+    scraper.robots = None
+    scraper.cache = None
+    scraper.snapshots = archive
+    return scraper.scrape_all(max_workers=2, parse_workers=0)
+
+
+def test_archive_and_replay_round_trip(snapshots_dir, freeze_today):
+    freeze_today(2025, 1, 15)
+    archive = SnapshotArchive(snapshots_dir, 'gzip')
+    with FixtureServer() as server:
+        urls_config = fixtures_config(server.base_url, 4)
+        live = scrape(urls_config, archive, '2025-01-15 20:00:00')
+        stored = archive.stored
+        # Segunda ejecución con las mismas páginas: se anotan sin escribir ningún objeto
+        scrape(urls_config, archive, '2025-01-16 20:00:00')
+
+    assert archive.stored == stored
+    assert len(objects(snapshots_dir)) == stored
+    assert archive.runs() == ['2025-01-15_20-00-00', '2025-01-16_20-00-00']
+
+    # La repetición sin red da los mismos resultados que la ejecución en vivo
+    # (en el orden en que se archivaron las páginas)
+    expected = {result['name']: result for result in live}
+    for run in archive.runs():
+        replayed = replay_run(archive, run, config_source='archived')
+        assert {result['name']: dict(result, timestamp='2025-01-15 20:00:00') for result in replayed} == expected
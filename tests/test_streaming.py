@@ -0,0 +1,74 @@
+"""
+Lectura del cuerpo por bloques (streaming.py): parada al cerrarse los
+contenedores por id, corte por max_bytes y decodificación incremental.
+"""
+from streaming import ContainerTracker, early_stop_roots, read_body
+
+
+class FakeResponse:
+    """
+    Respuesta con stream=True que entrega el cuerpo en los bloques indicados.
+    """
+
+    def __init__(self, chunks, encoding='utf-8'):
+        self.chunks = chunks
+        self.encoding = encoding
+        self.read = 0  # Bloques entregados
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+def test_stops_when_id_containers_close():
+    chunks = [b'<html><body><div id="ofertas"><div>Oferta 1</div>',
+              b'<div>Oferta 2</div></div>',
+              b'<footer>pie</footer>',
+              b'</body></html>']
+    response = FakeResponse(chunks)
+    body = read_body(response, max_bytes=10_000, stop_roots=early_stop_roots(('div#ofertas',)))
+
+    # El div anidado no cierra el contenedor: se para tras el segundo bloque
+    assert body['stopped_early'] and not body['truncated']
+    assert response.read == 2 and response.closed
+    assert body['text'].endswith('Oferta 2</div></div>')
+    assert body['bytes'] == len(chunks[0]) + len(chunks[1])
+
+
+def test_no_early_stop_without_id_selectors():
+    assert early_stop_roots(('div.ofertas',)) is None
+    assert early_stop_roots(('#ofertas', 'main')) is None
+    assert early_stop_roots(None) is None
+
+
+def test_tracker_waits_for_every_container():
+    tracker = ContainerTracker(early_stop_roots(('#a', 'section#b')))
+    tracker.feed('<div id="a"><p>uno</p></div>')
+    assert not tracker.done
+    tracker.feed('<div id="b">no es una section</div><section id="b"><section></section>')
+    assert not tracker.done
+    tracker.feed('</section>')
+    assert tracker.done
+
+
+def test_max_bytes_truncates():
+    response = FakeResponse([b'a' * 100, b'b' * 100, b'c' * 100])
+    body = read_body(response, max_bytes=150)
+
+    assert body['truncated'] and not body['stopped_early']
+    assert body['bytes'] == 150 and body['content'] == b'a' * 100 + b'b' * 50
+    assert response.read == 2 and response.closed
+
+
+def test_multibyte_character_split_across_chunks():
+    encoded = 'Psicología – año'.encode('utf-8')
+    split = encoded.index('í'.encode('utf-8')) + 1  # En medio de la í (2 bytes)
+    body = read_body(FakeResponse([encoded[:split], encoded[split:]]), max_bytes=10_000)
+
+    assert body['text'] == 'Psicología – año'
+    assert '�' not in body['text']
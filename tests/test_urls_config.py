@@ -0,0 +1,27 @@
+"""
+Copia validada de urls_config.json: se reutiliza mientras no cambien ni el
+archivo ni el código que lo valida.
+"""
+import json
+
+import urls_config
+
+
+def test_validated_copy_depends_on_validator_source(tmp_path, monkeypatch):
+    filepath = tmp_path / 'urls_config.json'
+    filepath.write_text(json.dumps([{'name': 'UVigo', 'url': 'https://ejemplo.org', 'keywords': ['python']}]))
+    cache_path = str(tmp_path / 'urls_config.checked.json')
+
+    calls = []
+    validate = urls_config.validate
+    monkeypatch.setattr(urls_config, 'validate', lambda configs: calls.append(1) or validate(configs))
+
+    first = urls_config.load_urls_config(str(filepath), cache_path)
+    assert urls_config.load_urls_config(str(filepath), cache_path) == first
+    assert len(calls) == 1  # La segunda carga usa la copia validada
+
+    # Otro código de validación (p. ej. tras editar validate): se valida de nuevo
+    monkeypatch.setattr(urls_config, '_validator_hash', lambda: 'otro')
+    assert urls_config.load_urls_config(str(filepath), cache_path) == first
+    assert len(calls) == 2
+